@@ -0,0 +1,160 @@
+# extractor/fixtures.py
+"""
+Record / replay of extractor HTTP traffic.
+
+A FixtureArchive is a gzip'd JSONL file of responses keyed by the same
+request_key() the HTTP cache uses (method, full URL, body). The pieces
+plug into HttpSession as httpx transports, below every extractor stage:
+
+    RecordingTransport  live requests, every response saved to the archive
+    ReplayTransport     answers from the archive, no network at all
+    RerouteTransport    sends requests to a local stand-in server
+                        (scripts.mock_endpoint) that serves an archive
+                        with latency, jitter and injected failures
+
+Only responses worth replaying are recorded: throttling (429/503) and
+other 5xx are transient and would make replays fail for no reason.
+"""
+from __future__ import annotations
+import base64
+import gzip
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .http_cache import request_key
+
+# headers kept with a recorded response; encodings are dropped since bodies are stored decoded
+KEEP_HEADERS = ("content-type", "retry-after")
+ORIGINAL_URL_HEADER = "X-Original-Url"
+
+
+class FixtureMiss(httpx.TransportError):
+    """Replay asked for a request that was never recorded"""
+
+
+def fixture_key(method: str, url: str, body: bytes = b"") -> str:
+    return request_key(url, method, body or None)
+
+
+class FixtureArchive:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, dict] = {}
+        self.added = 0
+        if self.path.exists():
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        e = json.loads(line)
+                        self.entries[e["key"]] = e
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def add(self, method: str, url: str, body: bytes, status: int,
+            headers: Dict[str, str], content: bytes) -> str:
+        key = fixture_key(method, url, body)
+        entry = {
+            "key": key,
+            "method": method,
+            "url": url,
+            "status": status,
+            "headers": {k: v for k, v in headers.items() if k.lower() in KEEP_HEADERS},
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(content).decode("ascii")
+        self.entries[key] = entry
+        self.added += 1
+        return key
+
+    def lookup(self, method: str, url: str, body: bytes = b"") -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """(status, headers, content) for a recorded request, or None"""
+        e = self.entries.get(fixture_key(method, url, body))
+        if e is None:
+            return None
+        content = e["body"].encode("utf-8") if "body" in e else base64.b64decode(e["body_b64"])
+        return e["status"], dict(e["headers"]), content
+
+    def save(self):
+        """Write atomically; entries sorted by key so re-recording diffs cleanly"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+                for key in sorted(self.entries):
+                    gz.write(json.dumps(self.entries[key], ensure_ascii=False,
+                                        separators=(",", ":")).encode("utf-8") + b"\n")
+            raw.flush()
+            os.fsync(raw.fileno())
+        tmp.replace(self.path)
+
+
+def _replayable(status: int) -> bool:
+    return status < 500 and status != 429
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, archive: FixtureArchive, inner: httpx.AsyncBaseTransport):
+        self.archive = archive
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        url = str(request.url)  # before any reroute below us rewrites it
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()  # decoded; the client reuses it
+        if _replayable(response.status_code):
+            self.archive.add(request.method, url, body,
+                             response.status_code, dict(response.headers), content)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, archive: FixtureArchive):
+        self.archive = archive
+        self.hits = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        found = self.archive.lookup(request.method, str(request.url), body)
+        if found is None:
+            self.misses += 1
+            raise FixtureMiss(f"not in {self.archive.path}: {request.method} {request.url}", request=request)
+        self.hits += 1
+        status, headers, content = found
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+
+class RerouteTransport(httpx.AsyncBaseTransport):
+    """
+    Send every request to `endpoint` (e.g. http://127.0.0.1:8765) instead of
+    its real host. The Host header is kept and the original URL travels in
+    X-Original-Url, so the stand-in can key its archive on it, while the
+    extractor code (rate limiter, cache keys) still sees the real hosts.
+    """
+
+    def __init__(self, endpoint: str, inner: httpx.AsyncBaseTransport):
+        self.endpoint = httpx.URL(endpoint)
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.headers[ORIGINAL_URL_HEADER] = str(request.url)
+        request.url = request.url.copy_with(scheme=self.endpoint.scheme, host=self.endpoint.host,
+                                            port=self.endpoint.port)
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self):
+        await self.inner.aclose()
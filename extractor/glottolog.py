@@ -1,20 +1,142 @@
 # extractor/glottolog.py
-import httpx, asyncio
+from __future__ import annotations
+import asyncio, time
+from typing import Callable, Dict, List, Optional
+
+import httpx
 from .orchestrator import fetch
+from .ratelimit import LIMITER
 
 BASE = "https://glottolog.org/resource/languoid/id/{code}.json"
+CONCURRENCY = 8      # requests in flight
+RATE = 10.0          # starting requests/second for the host's limiter
+
+
+def configure_limiter(rate: float = RATE, base: str = BASE):
+    """Set the Glottolog host's starting rate on the shared limiter (it adapts from there)"""
+    LIMITER.configure(httpx.URL(base.format(code="x")).host, rate, burst=rate, max_rate=rate * 5)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class GlottologFetcher:
+    """
+    Fetch languoids over one pooled client, at most `concurrency` at a time,
+    paced by the shared per-host limiter (adapting to 429/503; set its
+    starting rate with configure_limiter(), or pass throttle=False to skip
+    it). Cache hits skip both.
+    Per-code latencies are kept in `latencies` (code -> seconds); `requests`
+    counts network requests including 429/503 retries, `fetched` the codes
+    that needed the network and `cached` those served from the HTTP cache.
+
+        async with GlottologFetcher(concurrency=16) as gf:
+            out = await gf.fetch_all(codes)
+        print(gf.report())
+
+    `base` is a URL template with {code}, so the fetcher can be pointed at a
+    local stand-in server. `on_result(code, data)` is called for each
+    languoid as soon as it arrives (not for errors).
+    """
+
+    def __init__(self, *, base: str = BASE, concurrency: int = CONCURRENCY, throttle: bool = True,
+                 client: Optional[httpx.AsyncClient] = None, timeout: float = 30.0,
+                 on_result: Optional[Callable[[str, dict], None]] = None):
+        self.base = base
+        self.on_result = on_result
+        self.concurrency = max(1, concurrency)
+        self.throttle = throttle
+        self.host = httpx.URL(base.format(code="x")).host
+        self.timeout = timeout
+        self.latencies: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.requests = 0   # network requests, retries included
+        self.fetched = 0    # codes that needed at least one request
+        self.cached = 0     # codes answered by the HTTP cache
+        self._client = client
+        self._owns_client = client is None
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "GlottologFetcher":
+        # created here so it binds to the running loop on Python < 3.10
+        self._sem = asyncio.Semaphore(self.concurrency)
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency,
+                                    max_keepalive_connections=self.concurrency),
+            )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, code: str) -> dict:
+        async with self._sem:
+            started = [time.perf_counter()]
+            attempts = [0]
+
+            async def throttle():
+                # fetch() calls this before every real request, never on cache hits
+                attempts[0] += 1
+                self.requests += 1
+                if self.throttle:
+                    await LIMITER.acquire(self.host)
+                started[0] = time.perf_counter()  # latency excludes rate-limit waits
+
+            try:
+                data = await fetch(self._client, self.base.format(code=code), throttle=throttle)
+                if self.on_result is not None:
+                    self.on_result(code, data)
+                return data
+            except Exception as e:
+                self.errors[code] = type(e).__name__
+                return {}
+            finally:
+                self.latencies[code] = time.perf_counter() - started[0]
+                if attempts[0]:
+                    self.fetched += 1
+                else:
+                    self.cached += 1
+
+    async def fetch_all(self, codes: List[str]) -> Dict[str, dict]:
+        codes = list(dict.fromkeys(codes))
+        results = await asyncio.gather(*(self.get(gc) for gc in codes))
+        return dict(zip(codes, results))
+
+    def report(self) -> Dict[str, float]:
+        lat = list(self.latencies.values())
+        return {
+            "codes": len(lat),
+            "requests": self.requests,
+            "retries": self.requests - self.fetched,
+            "cached": self.cached,
+            "errors": len(self.errors),
+            "p50_s": _percentile(lat, 0.50),
+            "p95_s": _percentile(lat, 0.95),
+            "max_s": max(lat, default=0.0),
+        }
+
 
 async def get_glotto(code: str) -> dict:
-    url = BASE.format(code=code)
-    async with httpx.AsyncClient() as client:
-        try:
-            return await fetch(client, url, key=f"gl_{code}")
-        except Exception:
-            return {}
-
-async def for_glottocodes(codes: list[str]) -> dict:
-    out = {}
-    for gc in codes:
-        out[gc] = await get_glotto(gc)
-        await asyncio.sleep(0.05)
+    async with GlottologFetcher(concurrency=1) as gf:
+        return await gf.get(code)
+
+async def for_glottocodes(codes: list[str], *, concurrency: int = CONCURRENCY, throttle: bool = True,
+                         client: Optional[httpx.AsyncClient] = None,
+                         on_result: Optional[Callable[[str, dict], None]] = None) -> dict:
+    async with GlottologFetcher(concurrency=concurrency, throttle=throttle, client=client,
+                                on_result=on_result) as gf:
+        out = await gf.fetch_all(codes)
+    r = gf.report()
+    if r["codes"]:
+        print(f"  🗂️  Glottolog: {r['requests']} requests ({r['retries']} retries, {r['cached']} cached), "
+              f"{r['errors']} errors, latency p50 {r['p50_s']*1000:.0f}ms "
+              f"p95 {r['p95_s']*1000:.0f}ms max {r['max_s']*1000:.0f}ms")
     return out
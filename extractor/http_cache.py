@@ -0,0 +1,161 @@
+# extractor/http_cache.py
+"""
+Content-addressed cache for extractor HTTP responses.
+
+Entries are keyed by SHA-256 of (endpoint, method, body), so the key is
+stable across processes (unlike hash(), which is salted per run), and
+stored zlib-compressed in one SQLite file with a per-entry expiry.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+DAY = 86400.0
+DEFAULT_TTL = 30 * DAY
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key      TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    created  REAL NOT NULL,
+    expires  REAL,               -- NULL = never
+    size     INTEGER NOT NULL,   -- uncompressed bytes
+    body     BLOB NOT NULL
+)
+"""
+
+
+def request_key(endpoint: str, method: str = "GET", body: Any = None) -> str:
+    """
+    SHA-256 of a request. body may be bytes/str or a dict of query/form
+    params; dicts are serialized with sorted keys so ordering doesn't matter.
+    """
+    if body is None:
+        payload = b""
+    elif isinstance(body, bytes):
+        payload = body
+    elif isinstance(body, str):
+        payload = body.encode("utf-8")
+    else:
+        payload = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    h = hashlib.sha256()
+    for part in (method.upper().encode("ascii"), endpoint.encode("utf-8"), payload):
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class HttpCache:
+    """SQLite-backed response store: get/put by request key, stats, prune."""
+
+    def __init__(self, path: Path, default_ttl: Optional[float] = DEFAULT_TTL):
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(_SCHEMA)
+        return self._db
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached JSON value for key, or None if absent or expired"""
+        row = self.db.execute(
+            "SELECT body, size FROM entries WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.bytes_read += row[1]
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, data: Any, endpoint: str = "", ttl: Optional[float] = None):
+        """Store a JSON-serializable value; ttl=None uses the default"""
+        raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries (key, endpoint, created, expires, size, body) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, endpoint, now, now + ttl if ttl else None, len(raw), zlib.compress(raw, 6)),
+        )
+        self.bytes_written += len(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry counts and sizes, overall and per endpoint, plus session counters"""
+        now = time.time()
+        total, expired, size, stored = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(expires IS NOT NULL AND expires <= ?), 0), "
+            "COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM entries",
+            (now,),
+        ).fetchone()
+        endpoints = {
+            endpoint: {"entries": n, "bytes": b}
+            for endpoint, n, b in self.db.execute(
+                "SELECT endpoint, COUNT(*), SUM(LENGTH(body)) FROM entries GROUP BY endpoint ORDER BY 2 DESC"
+            )
+        }
+        return {
+            "path": str(self.path),
+            "entries": total,
+            "expired": expired,
+            "bytes_uncompressed": size,
+            "bytes_stored": stored,
+            "file_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "endpoints": endpoints,
+            "session": {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+            },
+        }
+
+    def prune(self, *, older_than: Optional[float] = None, endpoint: Optional[str] = None,
+              everything: bool = False) -> int:
+        """
+        Delete expired entries, plus entries matching every given filter
+        (created more than `older_than` seconds ago, fetched from
+        `endpoint`), or all entries. Returns rows removed.
+        """
+        now = time.time()
+        if everything:
+            cur = self.db.execute("DELETE FROM entries")
+        else:
+            where, params = "expires IS NOT NULL AND expires <= ?", [now]
+            filters, values = [], []
+            if older_than is not None:
+                filters.append("created <= ?")
+                values.append(now - older_than)
+            if endpoint is not None:
+                filters.append("endpoint = ?")
+                values.append(endpoint)
+            if filters:
+                where = f"({where}) OR ({' AND '.join(filters)})"
+                params += values
+            cur = self.db.execute(f"DELETE FROM entries WHERE {where}", params)
+        removed = cur.rowcount
+        if removed:
+            self.db.execute("VACUUM")
+        return removed
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -1,61 +1,174 @@
 # extractor/iso_cldr.py
-import pandas as pd
-import requests
+"""
+ISO 639-3 code tables without pandas.
+
+The two SIL .tab files are parsed into plain dicts of tuples and cached
+next to them as a marshal blob keyed by the SHA-256 of both sources, so a
+build start costs one hash and one load instead of importing pandas and
+re-parsing ~8k + ~9k rows.
+
+IMPORTANT: no value is ever coerced to NaN. 'nan' is a valid ISO 639-3
+code (Min Nan / Southern Min, nan_Latn) and 'NA'/'null' may appear as
+real names; only empty fields become None.
+"""
+from __future__ import annotations
+import hashlib
+import marshal
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 ISO_URLS = {
     "iso-639-3.tab": "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3.tab",
     "iso-639-3_Name_Index.tab": "https://iso639-3.sil.org/sites/iso639-3/files/downloads/iso-639-3_Name_Index.tab"
 }
+CORE_FILE = "iso-639-3.tab"
+NAMES_FILE = "iso-639-3_Name_Index.tab"
+CACHE_FILE = ".iso-639-3.cache"
+CACHE_VERSION = 1
+
+# Scope / Language_Type letters used by the code table
+SCOPES = {"I": "individual", "M": "macrolanguage", "S": "special"}
+TYPES = {"A": "ancient", "C": "constructed", "E": "extinct", "H": "historical",
+         "L": "living", "S": "special"}
+
+Row = Tuple[Optional[str], ...]
+
 
 def download_if_missing(path: Path):
     path.mkdir(parents=True, exist_ok=True)
     for fname, url in ISO_URLS.items():
         fpath = path / fname
         if not fpath.exists():
+            import requests  # only needed on first run
             print(f"⬇️  Downloading {fname} from SIL…")
             r = requests.get(url)
             r.raise_for_status()
             fpath.write_bytes(r.content)
             print(f"✅ Saved to {fpath}")
 
-def load_iso_tables(path: Path):
+
+def _read_tab(data: bytes) -> Tuple[Tuple[str, ...], list]:
+    """Header + rows of a SIL .tab file; empty fields are None, nothing else is touched"""
+    lines = data.decode("utf-8-sig").splitlines()
+    header = tuple(lines[0].rstrip("\r").split("\t"))
+    width = len(header)
+    rows = []
+    for line in lines[1:]:
+        if not line.strip():
+            continue
+        cells = line.rstrip("\r").split("\t")
+        cells += [""] * (width - len(cells))
+        rows.append(tuple(c if c != "" else None for c in cells[:width]))
+    return header, rows
+
+
+def _parse(core: bytes, names: bytes) -> dict:
+    columns, rows = _read_tab(core)
+    id_col = columns.index("Id")
+    table = {r[id_col]: r for r in rows if r[id_col]}
+
+    name_cols, name_rows = _read_tab(names)
+    nid, nprint = name_cols.index("Id"), name_cols.index("Print_Name")
+    alt: Dict[str, list] = {}
+    for r in name_rows:
+        if r[nid] and r[nprint]:
+            alt.setdefault(r[nid], []).append(r[nprint])
+    return {
+        "version": CACHE_VERSION,
+        "columns": columns,
+        "core": table,
+        "names": {k: tuple(v) for k, v in alt.items()},
+    }
+
+
+class IsoTables:
+    """Read-only ISO 639-3 lookups: code -> row tuple, code -> alternate names"""
+
+    def __init__(self, columns: Tuple[str, ...], core: Dict[str, Row],
+                 names: Dict[str, Tuple[str, ...]]):
+        self.columns = columns
+        self.core = core
+        self.names = names
+        self._col = {c: i for i, c in enumerate(columns)}
+        self._ref, self._scope, self._type = (
+            self._col["Ref_Name"], self._col["Scope"], self._col["Language_Type"])
+
+    def __contains__(self, iso3: str) -> bool:
+        return iso3 in self.core
+
+    def __len__(self) -> int:
+        return len(self.core)
+
+    def row(self, iso3: str) -> Dict[str, Optional[str]]:
+        """Full row as a column -> value dict (KeyError if unknown)"""
+        return dict(zip(self.columns, self.core[iso3]))
+
+    def get(self, iso3: str, column: str) -> Optional[str]:
+        """One field (KeyError if the code is unknown)"""
+        return self.core[iso3][self._col[column]]
+
+    def ref_name(self, iso3: str) -> Optional[str]:
+        """Reference name (KeyError if the code is unknown)"""
+        return self.core[iso3][self._ref]
+
+    def scope(self, iso3: str) -> Optional[str]:
+        """Scope letter: I(ndividual), M(acrolanguage) or S(pecial)"""
+        return self.core[iso3][self._scope]
+
+    def language_type(self, iso3: str) -> Optional[str]:
+        """Type letter: A, C, E, H, L or S (see TYPES)"""
+        return self.core[iso3][self._type]
+
+    def alt_names(self, iso3: str) -> Tuple[str, ...]:
+        """Name_Index print names (includes the reference name), () if none"""
+        return self.names.get(iso3, ())
+
+
+def _source_digest(core: bytes, names: bytes) -> bytes:
+    h = hashlib.sha256()
+    for data in (core, names):
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.digest()
+
+
+def load_iso_tables(path: Path, use_cache: bool = True) -> IsoTables:
     """
     Load ISO 639-3 data; auto-download if missing.
-    
-    IMPORTANT: keep_default_na=False prevents 'nan' from being interpreted as NaN
-    (nan_Latn is a valid language code for Min Nan / Southern Min!)
-    
-    Why this matters:
-    - ISO 639-3 code 'nan' = Min Nan language (spoken in Taiwan, Fujian)
-    - Pandas by default converts 'nan', 'NA', 'null' strings to NaN
-    - This breaks our code when processing nan_Latn
-    
-    Solution: keep_default_na=False, na_values=[''] (only empty strings are NaN)
+
+    The parsed tables are cached in `path/.iso-639-3.cache` as
+    <32-byte source digest><marshal payload>. Any change to either .tab
+    file (or to CACHE_VERSION) invalidates it.
     """
+    path = Path(path)
     download_if_missing(path)
-    
-    # Read with explicit NaN handling
-    iso = pd.read_csv(
-        path / "iso-639-3.tab", 
-        sep="\t",
-        keep_default_na=False,  # Don't auto-convert 'nan' to NaN
-        na_values=[''],         # Only empty strings are NaN
-        dtype=str               # Keep everything as strings
-    )
-    
-    names = pd.read_csv(
-        path / "iso-639-3_Name_Index.tab", 
-        sep="\t",
-        keep_default_na=False,
-        na_values=[''],
-        dtype=str
-    )
-    
-    iso = iso.set_index("Id")
-    return {"core": iso, "names": names}
+    core = (path / CORE_FILE).read_bytes()
+    names = (path / NAMES_FILE).read_bytes()
+    digest = _source_digest(core, names)
+
+    cache = path / CACHE_FILE
+    data = None
+    if use_cache and cache.exists():
+        blob = cache.read_bytes()
+        if blob[:32] == digest:
+            try:
+                data = marshal.loads(blob[32:])
+            except (EOFError, ValueError, TypeError):
+                data = None
+            if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+                data = None
+
+    if data is None:
+        data = _parse(core, names)
+        if use_cache:
+            tmp = cache.with_suffix(".tmp")
+            tmp.write_bytes(digest + marshal.dumps(data))
+            tmp.replace(cache)
+
+    return IsoTables(data["columns"], data["core"], data["names"])
+
 
 def cldr_script_name(script_code: str, cldr_root: Path) -> str:
     # simple static map fallback if needed
     # (CLDR JSON lookups can be added here)
-    return script_code
\ No newline at end of file
+    return script_code
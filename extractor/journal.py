@@ -0,0 +1,112 @@
+# extractor/journal.py
+"""
+Append-only build journal.
+
+Each finished batch is one compact JSON line ({"batch", "ts", "records"}),
+flushed and fsync'd before the next, so a crash loses at most the batch
+being written. A torn final line is detected and cut off on open. The
+journal is folded into languages.json once by compact(), instead of
+rewriting the whole database after every batch.
+"""
+from __future__ import annotations
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+
+def write_json_atomic(path: Path, payload: dict, indent: Optional[int] = 2):
+    """Write JSON via tmp file + fsync + rename"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+
+
+class BuildJournal:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.batches = 0      # complete entries currently in the journal
+        self.torn_bytes = 0   # bytes cut off a torn tail on open
+        self._repair()
+
+    def _repair(self):
+        """Drop a partial last line left by a crash mid-append"""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            good = data.rfind(b"\n") + 1
+            # the last newline-terminated line can still be garbage if the
+            # crash hit between write and fsync on some filesystems
+            while good:
+                prev = data.rfind(b"\n", 0, good - 1) + 1
+                try:
+                    json.loads(data[prev:good])
+                    break
+                except ValueError:
+                    good = prev
+            if good < len(data):
+                self.torn_bytes = len(data) - good
+                f.truncate(good)
+                f.flush()
+                os.fsync(f.fileno())
+        self.batches = sum(1 for _ in self.entries())
+
+    def entries(self) -> Iterator[dict]:
+        """Journal entries in append order"""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def records(self) -> Dict[str, dict]:
+        """All journaled records; later batches win"""
+        out: Dict[str, dict] = {}
+        for entry in self.entries():
+            out.update(entry["records"])
+        return out
+
+    def append(self, records: Dict[str, dict], batch: Optional[int] = None):
+        """Durably append one batch of records"""
+        line = json.dumps({"batch": batch, "ts": int(time.time()), "records": records},
+                          ensure_ascii=False, separators=(",", ":"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.batches += 1
+
+    def compact(self, out_path: Path, base: Optional[Dict[str, dict]] = None,
+                finalize: Optional[Callable[[Dict[str, dict]], None]] = None,
+                folded: bool = False) -> Dict[str, dict]:
+        """
+        Fold the journal into out_path (on top of `base`, default: out_path's
+        current contents), then empty the journal. `finalize` may adjust the
+        merged records in place before they are written. With `folded`, `base`
+        already holds every journaled record (a build kept it up to date) and
+        is written as is, without re-reading the journal. Safe to interrupt:
+        until the journal is truncated, replaying it again is idempotent.
+        """
+        out_path = Path(out_path)
+        if base is None:
+            base = json.loads(out_path.read_text()) if out_path.exists() else {}
+        merged = dict(base)
+        if not folded:
+            merged.update(self.records())
+        if finalize is not None:
+            finalize(merged)
+        write_json_atomic(out_path, merged)
+        if self.path.exists():
+            with open(self.path, "r+b") as f:
+                f.truncate(0)
+                os.fsync(f.fileno())
+        self.batches = 0
+        return merged
@@ -13,26 +13,6 @@ def _data_source_heuristic(iso3: str) -> str:
     high = {'hin','ben','tel','mar','tam','urd','guj','kan','mal','pan','ory','asm','nep'}
     return "both" if iso3 in high else "community"
 
-def _related_by_family_geo_selfscript(this_code: str, all_langs: Dict[str, dict]) -> list[str]:
-    me = all_langs[this_code]
-    fam = (me.get("language_family") or {}).get("value")
-    script = (me.get("script_name") or {}).get("value")
-    countries = set(me.get("primary_countries") or [])
-    # rank: same family + same script + shares any country, then by speakers desc
-    scored = []
-    for code, L in all_langs.items():
-        if code == this_code: continue
-        fam2 = (L.get("language_family") or {}).get("value")
-        script2 = (L.get("script_name") or {}).get("value")
-        if not fam2 or fam2 != fam: continue
-        if script2 != script: continue
-        if not countries.intersection(set(L.get("primary_countries") or [])): continue
-        spk = (L.get("speaker_count") or {}).get("value") or 0
-        scored.append(( -int(spk), code ))
-    scored.sort()
-    return [c for _, c in scored[:5]]
-
-
 def _family_from_glottolog(gl: dict) -> str | None:
     """
     Walk Glottolog classification top→bottom and choose the most specific
@@ -80,7 +60,7 @@ def merge_language(iso3, script_code, iso_tables, wd, glotto, cldr_map, geo=None
         "code": f"{iso3}_{script_code}",
         "iso_639_3": iso3,
         "script_code": script_code,
-        "english_name": val(iso_tables["core"].loc[iso3]["Ref_Name"], "iso639-3", 1.0),
+        "english_name": val(iso_tables.ref_name(iso3), "iso639-3", 1.0),
         "autonym": val(wdrow.get("autonym"), "wikidata", 0.8) if wdrow.get("autonym") else None,
         "script_name": val(cldr_map.get(script_code, script_code), "cldr", 1.0),
         "writing_direction": val(("rtl" if script_code=="Arab" else "ltr"), "rule", 0.8),
@@ -89,7 +69,7 @@ def merge_language(iso3, script_code, iso_tables, wd, glotto, cldr_map, geo=None
         "primary_countries": countries_iso2 if countries_iso2 else [],
         "regions": regions,
         "coordinates": {"lat": gl.get("latitude"), "lon": gl.get("longitude")} if gl else None,
-        "related_languages": [],  # filled below
+        "related_languages": [],  # filled by extractor.related after merge
         "wikipedia_code": val(wdrow.get("wikipedia"), "wikidata", 0.9) if wdrow.get("wikipedia") else None,
         "glottolog_code": val(gl_code, "wikidata", 0.9) if gl_code else None,
         "resource_level": None,  # filled below
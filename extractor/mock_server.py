@@ -0,0 +1,183 @@
+# extractor/mock_server.py
+"""
+Local asyncio stand-in for Wikidata / Glottolog.
+
+Serves a FixtureArchive (or a `handler` for requests not in it) over
+plain HTTP/1.1 keep-alive, with simulated latency + jitter and randomly
+injected failures, so concurrency and retry changes can be measured
+reproducibly without network. Point a build at it with RerouteTransport
+(build_incremental --endpoint http://127.0.0.1:PORT).
+
+    async with MockServer(archive, latency=0.2, jitter=0.1, p429=0.05) as srv:
+        ...  # srv.url
+    print(srv.stats())
+"""
+from __future__ import annotations
+import asyncio
+import gzip
+import json
+import random
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from .fixtures import ORIGINAL_URL_HEADER, FixtureArchive
+
+Reply = Tuple[int, Dict[str, str], bytes]
+Handler = Callable[[str, str, bytes], Optional[Reply]]
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error",
+            502: "Bad Gateway", 503: "Service Unavailable", 504: "Gateway Timeout"}
+
+
+class MockServer:
+    """
+    latency/jitter: seconds added to every response (latency + U(0, jitter))
+    p429:      chance of 429 with Retry-After: `retry_after`
+    p5xx:      chance of a 502/503/504
+    ptimeout:  chance of holding the request for `hang` seconds, then dropping the connection
+    seed:      makes the fault sequence reproducible
+    """
+
+    def __init__(self, archive: Optional[FixtureArchive] = None, *, handler: Optional[Handler] = None,
+                 host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 p429: float = 0.0, p5xx: float = 0.0, ptimeout: float = 0.0,
+                 retry_after: float = 1.0, hang: float = 300.0, seed: Optional[int] = None):
+        self.archive = archive
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.p429, self.p5xx, self.ptimeout = p429, p5xx, ptimeout
+        self.retry_after = retry_after
+        self.hang = hang
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self.statuses: Dict[int, int] = {}
+        self.injected: Dict[str, int] = {"429": 0, "5xx": 0, "timeout": 0}
+        self.misses = 0
+        self.bytes_sent = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> "MockServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._tasks):  # hung or idle keep-alive connections
+                task.cancel()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    # ---------- request handling ----------
+
+    def _fault(self) -> Optional[str]:
+        r = self.rng.random()
+        if r < self.ptimeout:
+            return "timeout"
+        r -= self.ptimeout
+        if r < self.p429:
+            return "429"
+        r -= self.p429
+        if r < self.p5xx:
+            return "5xx"
+        return None
+
+    def _lookup(self, method: str, url: str, body: bytes) -> Reply:
+        found = self.archive.lookup(method, url, body) if self.archive is not None else None
+        if found is None and self.handler is not None:
+            found = self.handler(method, url, body)
+        if found is None:
+            self.misses += 1
+            return 404, {"Content-Type": "application/json"}, json.dumps({"error": "not recorded", "url": url}).encode()
+        return found
+
+    async def respond(self, method: str, url: str, body: bytes) -> Optional[Reply]:
+        """Reply for one request, or None to simulate a hung request"""
+        self.requests += 1
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        fault = self._fault()
+        if fault is not None:
+            self.injected[fault] += 1
+        if fault == "timeout":
+            await asyncio.sleep(self.hang)
+            return None
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if fault == "429":
+            return 429, {"Retry-After": f"{self.retry_after:g}"}, b"rate limited"
+        if fault == "5xx":
+            return self.rng.choice((502, 503, 504)), {}, b"upstream error"
+        return self._lookup(method, url, body)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                url = headers.get(ORIGINAL_URL_HEADER.lower()) or f"http://{headers.get('host', self.host)}{target}"
+
+                reply = await self.respond(method, url, body)
+                if reply is None:
+                    break  # drop the connection after hanging
+                status, rheaders, content = reply
+                rheaders = dict(rheaders)
+                if "gzip" in headers.get("accept-encoding", "") and len(content) > 256:
+                    content = gzip.compress(content, 1)
+                    rheaders["Content-Encoding"] = "gzip"
+                rheaders["Content-Length"] = str(len(content))
+                head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n" + "".join(
+                    f"{k}: {v}\r\n" for k, v in rheaders.items()) + "\r\n"
+                writer.write(head.encode("latin-1") + content)
+                await writer.drain()
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                self.bytes_sent += len(head) + len(content)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, asyncio.CancelledError):
+            pass  # client went away, garbage request, or stop()
+        finally:
+            self._tasks.discard(task)
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "statuses": dict(sorted(self.statuses.items())),
+            "injected": dict(self.injected),
+            "misses": self.misses,
+            "bytes_sent": self.bytes_sent,
+        }
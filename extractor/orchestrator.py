@@ -1,22 +1,146 @@
 # extractor/orchestrator.py
-import asyncio, json
+from __future__ import annotations
+import asyncio
 from pathlib import Path
 import httpx
 
+from .fixtures import FixtureArchive, RecordingTransport, ReplayTransport, RerouteTransport
+from .http_cache import HttpCache, request_key
+from .ratelimit import LIMITER, THROTTLE_STATUSES
+
 BATCH = 50
 CACHE = Path("cache"); CACHE.mkdir(exist_ok=True)
+HTTP_CACHE = HttpCache(CACHE / "http.sqlite")
 
 def cache_get(key: str):
-    p = CACHE / f"{key}.json"
-    return json.loads(p.read_text()) if p.exists() else None
+    return HTTP_CACHE.get(key) if HTTP_CACHE is not None else None
+
+def cache_put(key: str, data, endpoint: str = "", ttl=None):
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.put(key, data, endpoint=endpoint, ttl=ttl)
+
+def set_http_cache(cache: HttpCache | None):
+    """Swap the process-wide response cache (None disables caching)"""
+    global HTTP_CACHE
+    HTTP_CACHE = cache
+
+class HttpSession:
+    """
+    Build-scoped pooled client shared by every extractor stage, so SPARQL
+    and Glottolog requests reuse warm connections instead of paying
+    TCP+TLS setup per request. Counts requests vs new connections
+    (trace events) and wire vs decoded bytes (responses are gzip'd).
+
+        session = await HttpSession(http2=True).open()
+        data = await fetch_batch(codes, client=session.client)
+        print(session.stats()); await session.aclose()
+
+    For reproducible runs the transport can be swapped (extractor.fixtures):
+    `record` saves every response to an archive on close, `replay` serves
+    only from one, and `endpoint` sends all requests to a local stand-in.
+    """
+
+    def __init__(self, *, http2: bool = False, max_connections: int = 16, timeout: float = 150.0,
+                 record: FixtureArchive | None = None, replay: FixtureArchive | None = None,
+                 endpoint: str | None = None):
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.record = record
+        self.replay = replay
+        self.endpoint = endpoint
+        self.client: httpx.AsyncClient | None = None
+        self.requests = 0
+        self.connections = 0
+        self.bytes_wire = 0
+        self.bytes_decoded = 0
+        self.http_versions: dict = {}
+
+    def _transport(self) -> httpx.AsyncBaseTransport:
+        if self.replay is not None:
+            return ReplayTransport(self.replay)
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections,
+                              keepalive_expiry=60.0)
+        if self.http2:
+            try:
+                import h2  # noqa: F401  (httpx only checks this when it builds its own transport)
+            except ImportError:
+                print("  ⚠️  HTTP/2 needs the 'h2' package (pip install httpx[http2]); using HTTP/1.1")
+                self.http2 = False
+        transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=limits)
+        if self.endpoint:
+            transport = RerouteTransport(self.endpoint, transport)
+        if self.record is not None:
+            transport = RecordingTransport(self.record, transport)
+        return transport
+
+    async def open(self) -> "HttpSession":
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            headers={"Accept-Encoding": "gzip"},
+            transport=self._transport(),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]},
+        )
+        return self
+
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.record is not None and self.record.added:
+            self.record.save()
+
+    async def __aenter__(self) -> "HttpSession":
+        return await self.open()
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def _trace(self, event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            self.connections += 1
+
+    async def _on_request(self, request: httpx.Request):
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _on_response(self, response: httpx.Response):
+        await response.aread()
+        self.bytes_wire += response.num_bytes_downloaded
+        self.bytes_decoded += len(response.content)
+        self.http_versions[response.http_version] = self.http_versions.get(response.http_version, 0) + 1
+
+    def stats(self) -> dict:
+        reused = max(0, self.requests - self.connections)
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": reused,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            "bytes_wire": self.bytes_wire,
+            "bytes_decoded": self.bytes_decoded,
+            "http_versions": dict(self.http_versions),
+        }
 
-def cache_put(key: str, data: dict):
-    (CACHE / f"{key}.json").write_text(json.dumps(data, ensure_ascii=False, indent=2))
 
-async def fetch(client: httpx.AsyncClient, url: str, params=None, key=None):
-    if key and (hit := cache_get(key)):
+async def fetch(client: httpx.AsyncClient, url: str, params=None, cache: bool = True,
+                throttle=None, retries: int = 3):
+    """
+    GET JSON through the HTTP cache and the host's rate limiter. `throttle`
+    replaces the limiter wait before each real request (not on cache hits).
+    429/503 are retried once the limiter lets the host through again.
+    """
+    key = request_key(url, "GET", params) if cache else None
+    if key and (hit := cache_get(key)) is not None:
         return hit
-    r = await client.get(url, params=params, timeout=30.0)
+    host = httpx.URL(url).host
+    for attempt in range(retries + 1):
+        await (throttle() if throttle is not None else LIMITER.acquire(host))
+        r = await client.get(url, params=params, timeout=30.0)
+        LIMITER.feedback(host, r.status_code, r.headers)
+        if r.status_code not in THROTTLE_STATUSES or attempt == retries:
+            break
     try:
         r.raise_for_status()
     except httpx.HTTPStatusError as e:
@@ -24,8 +148,7 @@ async def fetch(client: httpx.AsyncClient, url: str, params=None, key=None):
         text = getattr(r, "text", "")
         raise RuntimeError(f"{e}\n--- Response body ---\n{text[:1000]}") from e
     data = r.json()
-    if key: cache_put(key, data)
-    await asyncio.sleep(0.1)
+    if key: cache_put(key, data, endpoint=host)
     return data
 
 async def run_batches(codes, fn, label: str):
@@ -0,0 +1,270 @@
+# extractor/profiler.py
+"""
+Lightweight span profiler for the build pipeline.
+
+    with time_block("fetch_geo_data", num_iso3=12):
+        ...
+    checkpoint("geo_data_complete", results=12)
+    print_summary(top_n=30)
+    export_json("data/profiling.json")
+    export_chrome_trace("data/profiling.trace.json")   # open in Perfetto / chrome://tracing
+
+Spans nest through a contextvar, so a span opened inside an asyncio task
+is parented to whatever span was open when the task was created, and
+overlapping batches don't corrupt each other's nesting. Every span lands
+in a per-name histogram (count, total, p50/p95/max); the first
+`max_spans` are also kept individually for the trace export, with one
+lane per asyncio task so stage overlap is visible.
+
+Disable with OMNIFINDER_PROFILE=0 (or get_profiler().disable()):
+time_block() then returns a shared no-op context manager.
+"""
+from __future__ import annotations
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+MAX_SPANS = 200_000
+_NULL = nullcontext()
+_CURRENT: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("profiler_span", default=None)
+
+
+def _percentile(values: List[int], q: float) -> int:
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Span:
+    __slots__ = ("profiler", "name", "attrs", "id", "parent", "depth", "lane", "start", "end", "_token")
+
+    def __init__(self, profiler: "Profiler", name: str, attrs: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.attrs = attrs
+        self.id = 0
+        self.parent: Optional[Span] = None
+        self.depth = 0
+        self.lane = 0
+        self.start = self.end = 0
+        self._token = None
+
+    def __enter__(self) -> "Span":
+        self.parent = _CURRENT.get()
+        self.depth = self.parent.depth + 1 if self.parent is not None else 0
+        self._token = _CURRENT.set(self)
+        self.id = next(self.profiler._ids)
+        self.lane = self.profiler._lane()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end = time.perf_counter_ns()
+        try:
+            _CURRENT.reset(self._token)
+        except ValueError:  # exited from another context (e.g. a generator resumed elsewhere)
+            _CURRENT.set(self.parent)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.profiler._record(self)
+        return False
+
+    @property
+    def seconds(self) -> float:
+        return (self.end - self.start) / 1e9
+
+
+class Profiler:
+    def __init__(self, enabled: bool = True, max_spans: int = MAX_SPANS):
+        self.enabled = enabled
+        self.max_spans = max_spans
+        self.reset()
+
+    def reset(self):
+        self.origin = time.perf_counter_ns()
+        self.wall_origin = time.time()
+        self.durations: Dict[str, List[int]] = {}    # name -> span durations (ns)
+        self.spans: List[tuple] = []                  # (id, parent_id, name, start, end, lane, depth, attrs)
+        self.checkpoints: List[tuple] = []            # (name, ts, lane, enclosing span name, attrs)
+        self.checkpoint_counts: Dict[str, int] = {}
+        self.dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._lanes: "weakref.WeakKeyDictionary[object, int]" = weakref.WeakKeyDictionary()
+        self._thread_lanes: Dict[int, int] = {}
+        self._lane_names: Dict[int, str] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    # ---------- recording ----------
+
+    def _lane(self) -> int:
+        """Trace lane: one per asyncio task (or per thread outside the loop)"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            ident = threading.get_ident()
+            lane = self._thread_lanes.get(ident)
+            if lane is None:
+                with self._lock:
+                    lane = self._thread_lanes[ident] = len(self._lane_names) + 1
+                    self._lane_names[lane] = f"thread {threading.current_thread().name}"
+            return lane
+        lane = self._lanes.get(task)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes[task] = len(self._lane_names) + 1
+                self._lane_names[lane] = f"task {task.get_name()}"
+        return lane
+
+    def span(self, name: str, **attrs) -> Span:
+        return Span(self, name, attrs)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self.durations.setdefault(span.name, []).append(span.end - span.start)
+            if len(self.spans) < self.max_spans:
+                parent = span.parent.id if span.parent is not None else 0
+                self.spans.append((span.id, parent, span.name, span.start, span.end,
+                                   span.lane, span.depth, span.attrs))
+            else:
+                self.dropped += 1
+
+    def checkpoint(self, name: str, **attrs):
+        parent = _CURRENT.get()
+        ts, lane = time.perf_counter_ns(), self._lane()
+        with self._lock:
+            self.checkpoint_counts[name] = self.checkpoint_counts.get(name, 0) + 1
+            if len(self.checkpoints) < self.max_spans:
+                self.checkpoints.append((name, ts, lane, parent.name if parent is not None else None, attrs))
+
+    # ---------- reporting ----------
+
+    def histograms(self) -> Dict[str, Dict[str, float]]:
+        """name -> count/total/mean/p50/p95/max in seconds, by total time desc"""
+        out = {}
+        for name, values in self.durations.items():
+            values = sorted(values)
+            total = sum(values)
+            out[name] = {
+                "count": len(values),
+                "total_s": total / 1e9,
+                "mean_s": total / len(values) / 1e9,
+                "p50_s": _percentile(values, 0.50) / 1e9,
+                "p95_s": _percentile(values, 0.95) / 1e9,
+                "max_s": values[-1] / 1e9,
+            }
+        return dict(sorted(out.items(), key=lambda kv: -kv[1]["total_s"]))
+
+    def print_summary(self, top_n: int = 20):
+        if not self.enabled and not self.durations:
+            return
+        hist = self.histograms()
+        print(f"\n📊 Profile: top {min(top_n, len(hist))} of {len(hist)} spans by total time")
+        print(f"   {'span':40} {'count':>7} {'total':>9} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+        for name, h in list(hist.items())[:top_n]:
+            print(f"   {name[:40]:40} {h['count']:7d} {h['total_s']:8.2f}s "
+                  f"{h['mean_s']*1000:7.1f}ms {h['p50_s']*1000:7.1f}ms "
+                  f"{h['p95_s']*1000:7.1f}ms {h['max_s']*1000:7.1f}ms")
+        if self.checkpoint_counts:
+            top = sorted(self.checkpoint_counts.items(), key=lambda kv: -kv[1])[:10]
+            print("   checkpoints: " + ", ".join(f"{n}×{c}" for n, c in top))
+        if self.dropped:
+            print(f"   ({self.dropped} spans beyond max_spans kept only in histograms)")
+
+    def _us(self, ns: int) -> float:
+        return (ns - self.origin) / 1000
+
+    def export_json(self, path: Path):
+        """Histograms, checkpoint counts and the individual spans"""
+        payload = {
+            "started": self.wall_origin,
+            "histograms": self.histograms(),
+            "checkpoints": self.checkpoint_counts,
+            "dropped_spans": self.dropped,
+            "spans": [
+                {"id": sid, "parent": parent, "name": name, "start_us": round(self._us(start), 1),
+                 "duration_us": round((end - start) / 1000, 1), "lane": self._lane_names.get(lane, str(lane)),
+                 "depth": depth, "attrs": attrs}
+                for sid, parent, name, start, end, lane, depth, attrs in self.spans
+            ],
+        }
+        _write(path, payload)
+
+    def export_chrome_trace(self, path: Path):
+        """Chrome trace-event JSON: one thread lane per asyncio task"""
+        tids: Dict[int, int] = {}
+
+        def tid(lane: int) -> int:
+            return tids.setdefault(lane, len(tids) + 1)
+
+        events: List[dict] = []
+        for sid, parent, name, start, end, lane, depth, attrs in sorted(self.spans, key=lambda s: s[3]):
+            events.append({"name": name, "ph": "X", "ts": round(self._us(start), 3),
+                           "dur": round((end - start) / 1000, 3), "pid": 1, "tid": tid(lane),
+                           "args": _jsonable(attrs)})
+        for name, ts, lane, parent, attrs in self.checkpoints:
+            events.append({"name": name, "ph": "i", "s": "t", "ts": round(self._us(ts), 3),
+                           "pid": 1, "tid": tid(lane), "args": _jsonable({**attrs, "span": parent})})
+        for lane, t in tids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": t,
+                           "args": {"name": self._lane_names.get(lane, str(lane))}})
+        events.append({"name": "process_name", "ph": "M", "pid": 1, "tid": 0,
+                       "args": {"name": "omnifinder build"}})
+        _write(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+def _jsonable(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v if isinstance(v, (str, int, float, bool, type(None))) else str(v) for k, v in attrs.items()}
+
+
+def _write(path: Path, payload: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, default=str))
+
+
+_PROFILER = Profiler(enabled=os.environ.get("OMNIFINDER_PROFILE", "1") not in ("0", "false", "no", "off"))
+
+
+def get_profiler() -> Profiler:
+    return _PROFILER
+
+
+def time_block(name: str, **attrs):
+    """Context manager timing a (possibly nested) span; no-op while disabled"""
+    if not _PROFILER.enabled:
+        return _NULL
+    return Span(_PROFILER, name, attrs)
+
+
+def checkpoint(name: str, **attrs):
+    """Instant event, attached to the current span"""
+    if _PROFILER.enabled:
+        _PROFILER.checkpoint(name, **attrs)
+
+
+def print_summary(top_n: int = 20):
+    _PROFILER.print_summary(top_n=top_n)
+
+
+def export_json(path: Path):
+    _PROFILER.export_json(path)
+
+
+def export_chrome_trace(path: Path):
+    _PROFILER.export_chrome_trace(path)
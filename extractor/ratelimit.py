@@ -0,0 +1,167 @@
+# extractor/ratelimit.py
+"""
+Per-host token-bucket rate limiting shared by every extractor coroutine.
+
+Each host gets one bucket. A request takes a token (waiting if the bucket
+is empty). 429/503 responses halve the host's rate and block it for any
+Retry-After the server sent. Sustained success raises it again, 10% per
+~second of clean responses, up to a ceiling, so builds run near the
+provider's real limit instead of idling on fixed sleeps.
+"""
+from __future__ import annotations
+import asyncio
+import email.utils
+import time
+from typing import Awaitable, Callable, Dict, Mapping, Optional
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date), or None"""
+    value = headers.get("Retry-After") or headers.get("retry-after")
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+Clock = Callable[[], float]
+Sleep = Callable[[float], Awaitable[None]]
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket for one host. `clock` and `sleep` default to
+    time.monotonic and asyncio.sleep; tests pass a fake pair instead.
+    """
+
+    def __init__(self, rate: float, *, burst: Optional[float] = None,
+                 min_rate: Optional[float] = None, max_rate: Optional[float] = None,
+                 clock: Clock = time.monotonic, sleep: Sleep = asyncio.sleep):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.max_rate = max_rate if max_rate is not None else rate * 4
+        self.tokens = self.burst
+        self.blocked_until = 0.0
+        self.requests = 0
+        self.throttled = 0          # 429/503 seen
+        self.waited = 0.0           # seconds spent waiting for tokens
+        self.clock = clock
+        self.sleep = sleep
+        self._updated = clock()
+        self._streak = 0
+        self._last_decrease = float("-inf")  # the first push-back always halves
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        t0 = self.clock()
+        async with self._lock:  # waiters are served in FIFO order
+            while True:
+                now = self.clock()
+                if now < self.blocked_until:
+                    await self.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                await self.sleep((1 - self.tokens) / self.rate)
+        self.requests += 1
+        self.waited += self.clock() - t0
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """Server pushed back: halve the rate (once per second) and honor Retry-After"""
+        now = self.clock()
+        self.throttled += 1
+        self._streak = 0
+        if now - self._last_decrease >= 1.0:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._last_decrease = now
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+        self.tokens = min(self.tokens, 0.0)
+
+    def reward(self):
+        """Request succeeded: after ~1s worth of successes, raise the rate by 10%"""
+        self._streak += 1
+        if self._streak >= max(1, int(self.rate)):
+            self._streak = 0
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": round(self.rate, 3),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "waited_s": round(self.waited, 3),
+        }
+
+
+class RateLimiter:
+    """Host -> TokenBucket registry (new buckets get its clock and sleep)"""
+
+    def __init__(self, defaults: Optional[Dict[str, dict]] = None, fallback_rate: float = 5.0,
+                 *, clock: Clock = time.monotonic, sleep: Sleep = asyncio.sleep):
+        self.defaults = dict(defaults or {})
+        self.fallback_rate = fallback_rate
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        b = self._buckets.get(host)
+        if b is None:
+            conf = self.defaults.get(host, {"rate": self.fallback_rate})
+            b = self._buckets[host] = TokenBucket(**conf, clock=self.clock, sleep=self.sleep)
+        return b
+
+    def configure(self, host: str, rate: float, **kwargs):
+        """Set a host's starting rate (and optional burst/min_rate/max_rate)"""
+        conf = {"rate": rate, **kwargs}
+        if self.defaults.get(host) == conf:
+            return  # unchanged: keep the adapted bucket
+        self.defaults[host] = conf
+        self._buckets.pop(host, None)
+
+    def reset(self):
+        """Forget adapted rates and counters (buckets restart from their configured rate)"""
+        self._buckets.clear()
+
+    async def acquire(self, host: str):
+        await self.bucket(host).acquire()
+
+    def feedback(self, host: str, status: int, headers: Optional[Mapping[str, str]] = None):
+        """Report a response status so the host's rate adapts"""
+        b = self.bucket(host)
+        if status in THROTTLE_STATUSES:
+            b.penalize(retry_after_seconds(headers or {}))
+        elif status < 400:
+            b.reward()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {host: b.stats() for host, b in self._buckets.items()}
+
+
+# Starting points; buckets adapt from here
+LIMITER = RateLimiter({
+    "query.wikidata.org": {"rate": 2.0, "burst": 2, "max_rate": 10.0},
+    "glottolog.org": {"rate": 10.0, "burst": 10, "max_rate": 50.0},
+})
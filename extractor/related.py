@@ -0,0 +1,128 @@
+# extractor/related.py
+"""
+Related languages: same family, same script, sharing a country, ranked by
+speakers (desc) then code, top 5.
+
+Records are grouped by (family, script) and each group keeps an inverted
+country index whose postings are pre-sorted by rank, so a language's top
+k is a k-way merge over its countries' postings instead of a scan of
+every other language. Adding a batch only recomputes the groups it
+touched.
+"""
+from __future__ import annotations
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+
+LIMIT = 5
+
+GroupKey = Tuple[str, str]
+
+
+def _v(rec: dict, field: str):
+    return (rec.get(field) or {}).get("value")
+
+
+def _group(rec: dict) -> Optional[GroupKey]:
+    fam = _v(rec, "language_family")
+    if not fam:
+        return None
+    return fam, _v(rec, "script_name")
+
+
+def _rank(code: str, rec: dict) -> Tuple[int, str]:
+    return -int(_v(rec, "speaker_count") or 0), code
+
+
+class RelatedIndex:
+    def __init__(self, records: Optional[Dict[str, dict]] = None, limit: int = LIMIT):
+        self.limit = limit
+        self.records: Dict[str, dict] = {}
+        self._groups: Dict[GroupKey, Dict[str, List[Tuple[int, str]]]] = {}  # group -> country -> ranked codes
+        self._member_of: Dict[str, GroupKey] = {}
+        self._members: Dict[GroupKey, Set[str]] = {}
+        self._dirty: Set[GroupKey] = set()
+        self._orphans: Set[str] = set()  # added or moved outside every group since the last refresh
+        if records:
+            self.add(records)
+
+    def add(self, records: Dict[str, dict]) -> Set[GroupKey]:
+        """Add or replace records; returns the (family, script) groups touched"""
+        touched: Set[GroupKey] = set()
+        for code, rec in records.items():
+            old = self._member_of.pop(code, None)
+            if old is not None:
+                self._members[old].discard(code)
+                touched.add(old)
+            self.records[code] = rec
+            key = _group(rec)
+            if key is not None:
+                self._member_of[code] = key
+                self._members.setdefault(key, set()).add(code)
+                touched.add(key)
+            else:
+                self._orphans.add(code)  # no family: refresh() clears it
+        for key in touched:
+            self._rebuild_group(key)
+        self._dirty |= touched
+        return touched
+
+    def _rebuild_group(self, key: GroupKey):
+        countries: Dict[str, List[Tuple[int, str]]] = {}
+        for code in self._members.get(key, ()):
+            rec = self.records[code]
+            entry = _rank(code, rec)
+            for c in set(rec.get("primary_countries") or []):
+                countries.setdefault(c, []).append(entry)
+        for postings in countries.values():
+            postings.sort()
+        if countries:
+            self._groups[key] = countries
+        else:
+            self._groups.pop(key, None)
+
+    def related(self, code: str) -> List[str]:
+        """Top related codes for one language"""
+        key = self._member_of.get(code)
+        if key is None or key not in self._groups:
+            return []
+        index = self._groups[key]
+        countries = set(self.records[code].get("primary_countries") or [])
+        merged = heapq.merge(*(index[c] for c in countries if c in index))
+        seen = {code}
+        out = []
+        for _, other in merged:
+            if other not in seen:
+                seen.add(other)
+                out.append(other)
+                if len(out) == self.limit:
+                    break
+        return out
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """related() for every member of groups touched since the last refresh"""
+        dirty, self._dirty = self._dirty, set()
+        out: Dict[str, List[str]] = {code: [] for code in self._orphans}
+        self._orphans = set()
+        for key in dirty:
+            for code in self._members.get(key, ()):
+                out[code] = self.related(code)
+        return out
+
+    def apply(self, records: Dict[str, dict]) -> int:
+        """Write refreshed related_languages into `records`; returns how many changed"""
+        changed = 0
+        for code, rel in self.refresh().items():
+            rec = records.get(code)
+            if rec is not None and rec.get("related_languages") != rel:
+                rec["related_languages"] = rel
+                changed += 1
+        return changed
+
+
+def compute_related(records: Dict[str, dict], limit: int = LIMIT) -> Dict[str, List[str]]:
+    """Full pass: related languages for every record (empty list if none)"""
+    index = RelatedIndex(limit=limit)
+    index.add(records)
+    out = {code: [] for code in records}
+    out.update(index.refresh())
+    return out
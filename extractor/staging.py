@@ -0,0 +1,91 @@
+# extractor/staging.py
+"""
+Staging area for per-stage build results.
+
+Each stage commits what it finished as soon as it has it: Wikidata core
+rows and geo by ISO 639-3 code, Glottolog languoids by glottocode. A batch
+that times out half way can then still merge every language whose data is
+complete, and a retry only fetches the stages that are missing.
+
+Entries are appended to a JSONL file (one line per commit, flushed, not
+fsync'd: everything here can be refetched) so a killed build resumes with
+them too. clear() empties it once the build's records are compacted.
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STAGES = ("core", "geo", "glotto")
+EMPTY_GEO = {"countries_iso2": [], "countries_labels": [], "regions": []}
+
+
+class StagingArea:
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path is not None else None
+        self.data: Dict[str, Dict[str, dict]] = {stage: {} for stage in STAGES}
+        self.torn_bytes = 0  # bytes cut off a torn tail on open
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        """Read committed entries; cut off a torn tail so new commits start on a clean line"""
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            good = 0
+            for line in data.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break  # unterminated: the crash hit mid-write
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn tail from a crash; everything before it is good
+                self.data[entry["stage"]].update(entry["values"])
+                good += len(line)
+            if good < len(data):
+                self.torn_bytes = len(data) - good
+                f.truncate(good)
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.data.values())
+
+    def commit(self, stage: str, values: Dict[str, dict]):
+        """Record finished results for one stage (key -> value)"""
+        if not values:
+            return
+        self.data[stage].update(values)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"stage": stage, "values": values},
+                                   ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def get(self, stage: str, keys: Iterable[str]) -> Dict[str, dict]:
+        staged = self.data[stage]
+        return {k: staged[k] for k in keys if k in staged}
+
+    def missing(self, stage: str, keys: Iterable[str]) -> List[str]:
+        staged = self.data[stage]
+        return [k for k in keys if k not in staged]
+
+    def complete(self, iso3: str, need_geo: bool = True) -> bool:
+        """Core, geo (if wanted) and the languoid (if it has a glottocode) are all staged"""
+        row = self.data["core"].get(iso3)
+        if row is None:
+            return False
+        if need_geo and iso3 not in self.data["geo"]:
+            return False
+        gc = row.get("glottocode")
+        return not gc or gc in self.data["glotto"]
+
+    def inputs(self, iso3s: Iterable[str]) -> Tuple[Dict[str, dict], Dict[str, dict], Dict[str, dict]]:
+        """(wd, glotto, geo) for merge_language, from staged results only"""
+        iso3s = list(iso3s)
+        wd = self.get("core", iso3s)
+        gcs = [row["glottocode"] for row in wd.values() if row.get("glottocode")]
+        return wd, self.get("glotto", gcs), self.get("geo", iso3s)
+
+    def clear(self):
+        self.data = {stage: {} for stage in STAGES}
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
@@ -3,19 +3,30 @@ from __future__ import annotations
 import asyncio
 import json
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
 
 import httpx
 
+try:  # optional: English country names from ISO 3166 without asking Wikidata
+    import pycountry
+except ImportError:
+    pycountry = None
+
+from .http_cache import request_key
 from .orchestrator import cache_get, cache_put
+from .ratelimit import LIMITER, THROTTLE_STATUSES
 from .profiler import time_block, checkpoint
 
 ENDPOINT = "https://query.wikidata.org/sparql"
+WIKIDATA_HOST = "query.wikidata.org"
 HEADERS = {
     "User-Agent": "OmnilingualFinder/0.1 (+https://github.com/yourname/omnilingual-finder)",
     "Accept": "application/sparql-results+json",
 }
 
+AGG_SEP = "\t"  # GROUP_CONCAT separator; never part of a name, IRI or code
+
 _CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")  # control chars except \t\r\n (we keep those)
 
 
@@ -48,14 +59,52 @@ SELECT ?iso ?lang ?autonym ?speakers ?glotto ?script ?wp WHERE {{
 """
 
 
+def sparql_core_aggregated(codes: List[str]) -> str:
+    """
+    Same data as sparql_for_codes, one row per ISO code: multi-valued
+    properties are folded server-side instead of coming back as the cartesian
+    product of every OPTIONAL (scripts x autonyms x ... rows per language).
+    """
+    values = _values_block(codes)
+    return f"""
+PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+PREFIX schema: <http://schema.org/>
+
+SELECT ?iso (SAMPLE(?lang) AS ?item)
+       (GROUP_CONCAT(DISTINCT ?autonym; separator="\\t") AS ?autonyms)
+       (MAX(?speakers) AS ?maxSpeakers)
+       (SAMPLE(?glotto) AS ?glottocode)
+       (GROUP_CONCAT(DISTINCT ?script; separator="\\t") AS ?scripts)
+       (SAMPLE(?wp) AS ?article)
+WHERE {{
+  VALUES ?iso {{ {values} }}
+  ?lang wdt:P220 ?iso .
+  OPTIONAL {{ ?lang wdt:P1705 ?autonym . }}         # native name (autonym)
+  OPTIONAL {{ ?lang wdt:P1098 ?speakers . }}        # number of speakers
+  OPTIONAL {{ ?lang wdt:P1394 ?glotto . }}          # Glottolog code
+  OPTIONAL {{ ?lang wdt:P282 ?script . }}           # writing system
+  OPTIONAL {{
+    ?wpArticle schema:about ?lang ;
+               schema:isPartOf <https://en.wikipedia.org/> ;
+               schema:name ?wp .
+  }}
+}}
+GROUP BY ?iso
+"""
+
+
 def sparql_geo_for_codes(codes: List[str]) -> str:
+    """
+    IDs and ISO 3166 codes only: no label service, which is what made geo
+    queries slow enough to need tiny chunks. Names are resolved afterwards
+    (country_label / QidLabels).
+    """
     values = _values_block(codes)
     return f"""
 PREFIX wdt: <http://www.wikidata.org/prop/direct/>
 PREFIX wd: <http://www.wikidata.org/entity/>
-PREFIX schema: <http://schema.org/>
 
-SELECT ?iso ?country ?countryCode ?countryLabel ?adm1 ?adm1Label WHERE {{
+SELECT DISTINCT ?iso ?country ?countryCode ?adm1 WHERE {{
   VALUES ?iso {{ {values} }}
   ?lang wdt:P220 ?iso .
 
@@ -64,19 +113,32 @@ SELECT ?iso ?country ?countryCode ?countryLabel ?adm1 ?adm1Label WHERE {{
     VALUES ?p {{ wdt:P37 wdt:P2936 }}
     ?country ?p ?lang .
     OPTIONAL {{ ?country wdt:P297 ?countryCode . }}
-    SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
   }}
 
   # Admin-1/regions that 'use' the language (P2936)
   OPTIONAL {{
     ?adm1 wdt:P2936 ?lang .
     ?adm1 wdt:P31/wdt:P279* wd:Q56061 .    # administrative territorial entity
-    SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
   }}
 }}
 """
 
 
+def sparql_labels_for_qids(qids: List[str]) -> str:
+    """English rdfs:label of each item (plain triple lookup, no label service)"""
+    values = " ".join(f"wd:{q}" for q in qids)
+    return f"""
+PREFIX wd: <http://www.wikidata.org/entity/>
+PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+SELECT ?item ?label WHERE {{
+  VALUES ?item {{ {values} }}
+  ?item rdfs:label ?label .
+  FILTER(LANG(?label) = "en")
+}}
+"""
+
+
 # ---------- HTTP / parsing helpers ----------
 
 def _safe_json_parse(resp: httpx.Response) -> dict:
@@ -107,18 +169,26 @@ def _safe_json_parse(resp: httpx.Response) -> dict:
                 ) from e2
 
 
-async def _post_sparql(query: str, *, timeout: float = 150.0, max_retries: int = 5) -> Dict:
+async def _post_sparql(
+    query: str, *, client: Optional[httpx.AsyncClient] = None, timeout: float = 150.0, max_retries: int = 5
+) -> Dict:
     """
     POST a SPARQL query with retries (handles 429/5xx/timeouts) and robust JSON parsing.
-    Cached by the hash of the query string (only after successful parse).
+    Cached by SHA-256 of the request (only after successful parse).
+    Uses the build's shared `client` (orchestrator.HttpSession) when given;
+    otherwise one temporary client for all attempts.
     """
-    with time_block("wikidata_query", query_hash=hash(query), timeout=timeout, query_length=len(query)):
-        key = f"wd_{hash(query)}"
-        
+    if client is None:
+        async with httpx.AsyncClient() as own:
+            return await _post_sparql(query, client=own, timeout=timeout, max_retries=max_retries)
+
+    form = {"query": query, "format": "json"}
+    key = request_key(ENDPOINT, "POST", form)
+    with time_block("wikidata_query", query_hash=key[:16], timeout=timeout, query_length=len(query)):
         # Check cache first
         with time_block("cache_check"):
             hit = cache_get(key)
-            if hit:
+            if hit is not None:
                 checkpoint("cache_hit", key=key[:20])
                 return hit
 
@@ -133,33 +203,36 @@ async def _post_sparql(query: str, *, timeout: float = 150.0, max_retries: int =
                 attempt_timeout = timeout * (1 + attempt * 0.5)  # Increase timeout on retries
                 print(f"  🔄 Attempt {attempt+1}/{max_retries} (timeout: {attempt_timeout:.0f}s)...")
                 
+                with time_block("rate_limit_wait"):
+                    await LIMITER.acquire(WIKIDATA_HOST)
+                
                 with time_block(f"http_request_attempt_{attempt+1}", timeout=attempt_timeout):
-                    async with httpx.AsyncClient(timeout=attempt_timeout) as client:
-                        r = await client.post(
-                            ENDPOINT, headers=HEADERS, data={"query": query, "format": "json"}
+                    r = await client.post(
+                        ENDPOINT, headers=HEADERS, data=form, timeout=attempt_timeout
+                    )
+                    LIMITER.feedback(WIKIDATA_HOST, r.status_code, r.headers)
+                    
+                    print(f"  ✓ Response: {r.status_code} ({len(r.content)} bytes)")
+                    
+                    # retry on common server/rate-limit statuses
+                    if r.status_code in (429, 502, 503, 504):
+                        checkpoint("retry_needed", status=r.status_code, attempt=attempt+1)
+                        print(f"  ⚠️  Server error {r.status_code}, retrying...")
+                        raise httpx.HTTPStatusError(
+                            f"{r.status_code} from Wikidata", request=r.request, response=r
                         )
-                        
-                        print(f"  ✓ Response: {r.status_code} ({len(r.content)} bytes)")
-                        
-                        # retry on common server/rate-limit statuses
-                        if r.status_code in (429, 502, 503, 504):
-                            checkpoint("retry_needed", status=r.status_code, attempt=attempt+1)
-                            print(f"  ⚠️  Server error {r.status_code}, retrying...")
-                            raise httpx.HTTPStatusError(
-                                f"{r.status_code} from Wikidata", request=r.request, response=r
-                            )
-                        
-                        r.raise_for_status()
-                        data = _safe_json_parse(r)
-                        
-                        # Show results
-                        num_results = len(data.get("results", {}).get("bindings", []))
-                        print(f"  ✅ Got {num_results} results")
-                        
-                        with time_block("cache_write"):
-                            cache_put(key, data)  # cache only valid JSON
-                        
-                        return data
+                    
+                    r.raise_for_status()
+                    data = _safe_json_parse(r)
+                    
+                    # Show results
+                    num_results = len(data.get("results", {}).get("bindings", []))
+                    print(f"  ✅ Got {num_results} results")
+                    
+                    with time_block("cache_write"):
+                        cache_put(key, data, endpoint=WIKIDATA_HOST)  # cache only valid JSON
+                    
+                    return data
                         
             except httpx.TimeoutException as e:
                 print(f"  ⏰ Timeout after {attempt_timeout:.0f}s")
@@ -180,6 +253,13 @@ async def _post_sparql(query: str, *, timeout: float = 150.0, max_retries: int =
                     print(f"  ❌ Max retries exceeded - giving up")
                     raise
                 
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                if status in THROTTLE_STATUSES:
+                    # the limiter already slowed down (and honors Retry-After);
+                    # the next attempt just waits for its token
+                    checkpoint("retry_throttled", status=status, attempt=attempt+1)
+                    continue
+                
                 checkpoint("retry_wait", delay=delay, attempt=attempt+1, reason=type(e).__name__)
                 print(f"  😴 Waiting {delay:.1f}s before retry...")
                 await asyncio.sleep(delay)
@@ -189,163 +269,301 @@ async def _post_sparql(query: str, *, timeout: float = 150.0, max_retries: int =
 # ---------- Public fetchers ----------
 
 async def fetch_batch(
-    codes: List[str], *, timeout: float = 90.0, retries: int = 4
+    codes: List[str], *, client: Optional[httpx.AsyncClient] = None, timeout: float = 90.0, retries: int = 4,
+    aggregate: bool = True
 ) -> Dict[str, Dict]:
     """
     Fetch core language info by ISO 639-3 codes.
-    Returns: dict[iso] -> {autonym, speakers, glottocode, scripts[], wikipedia, _raw}
+    With `aggregate` (default) the query groups by ISO code, so the response
+    has one row per language; otherwise rows are the per-property product
+    and are folded here.
+    Returns: dict[iso] -> {autonym, autonyms[], speakers, glottocode, scripts[], wikipedia, _raw}
     """
-    with time_block("wikidata_fetch_batch", num_codes=len(codes), timeout=timeout):
+    with time_block("wikidata_fetch_batch", num_codes=len(codes), timeout=timeout, aggregate=aggregate):
         if not codes:
             return {}
         
         with time_block("build_query"):
-            query = sparql_for_codes(codes)
+            query = sparql_core_aggregated(codes) if aggregate else sparql_for_codes(codes)
         
         with time_block("execute_query"):
-            data = await _post_sparql(query, timeout=timeout, max_retries=retries)
+            data = await _post_sparql(query, client=client, timeout=timeout, max_retries=retries)
         
         with time_block("parse_results"):
             rows = data.get("results", {}).get("bindings", [])
             checkpoint("wikidata_results", num_rows=len(rows), num_codes=len(codes))
+            return _parse_core_rows(rows, aggregate)
 
-            out: Dict[str, Dict] = {}
-            for r in rows:
-                iso = r["iso"]["value"]
 
-                def _get(name):  # helper to safely extract values
-                    return r.get(name, {}).get("value")
+def _parse_core_rows(rows: List[dict], aggregate: bool) -> Dict[str, Dict]:
+    """Bindings -> dict[iso] -> record; several rows for one ISO are merged, never overwritten"""
+    out: Dict[str, Dict] = {}
+    for r in rows:
+        iso = r["iso"]["value"]
 
-                speakers_raw = _get("speakers")
-                try:
-                    speakers = int(float(speakers_raw)) if speakers_raw is not None else None
-                except Exception:
-                    speakers = None
+        def _get(name):  # helper to safely extract values
+            return r.get(name, {}).get("value")
 
-                script_value = _get("script")  # full IRI (we keep it; CLDR maps later)
+        def _all(name):  # GROUP_CONCAT'd values (empty string when unbound)
+            return [v for v in (_get(name) or "").split(AGG_SEP) if v]
 
-                out[iso] = {
-                    "autonym": _get("autonym"),
-                    "speakers": speakers,
-                    "glottocode": _get("glotto"),
-                    "scripts": [script_value] if script_value else [],
-                    "wikipedia": _get("wp"),
-                    "_raw": r,
-                }
-            
-            return out
+        if aggregate:
+            autonyms, scripts = _all("autonyms"), _all("scripts")  # script: full IRI (CLDR maps later)
+            speakers_raw, glotto, wp = _get("maxSpeakers"), _get("glottocode"), _get("article")
+        else:
+            autonyms = [_get("autonym")] if _get("autonym") else []
+            scripts = [_get("script")] if _get("script") else []
+            speakers_raw, glotto, wp = _get("speakers"), _get("glotto"), _get("wp")
 
+        try:
+            speakers = int(float(speakers_raw)) if speakers_raw is not None else None
+        except Exception:
+            speakers = None
+
+        rec = out.get(iso)
+        if rec is None:
+            rec = out[iso] = {"autonym": None, "autonyms": [], "speakers": None, "glottocode": None,
+                              "scripts": [], "wikipedia": None, "_raw": r}
+        rec["autonyms"] += [a for a in autonyms if a not in rec["autonyms"]]
+        rec["scripts"] += [sc for sc in scripts if sc not in rec["scripts"]]
+        if speakers is not None and (rec["speakers"] is None or speakers > rec["speakers"]):
+            rec["speakers"] = speakers
+        rec["glottocode"] = rec["glottocode"] or glotto
+        rec["wikipedia"] = rec["wikipedia"] or wp
+
+    for rec in out.values():
+        rec["autonyms"].sort()  # GROUP_CONCAT / row order is unspecified
+        rec["scripts"].sort()
+        rec["autonym"] = rec["autonyms"][0] if rec["autonyms"] else None
+    return out
+
+
+def _qid(iri: str) -> str:
+    return iri.rsplit("/", 1)[-1]
+
+
+def _parse_geo_rows(rows: List[dict]) -> Dict[str, Dict]:
+    """Bindings -> dict[iso] -> {country_codes, countries (QID -> ISO2 or None), regions (QIDs)}"""
+    tmp: Dict[str, Dict] = {}
+    for r in rows:
+        iso = r["iso"]["value"]
+        d = tmp.setdefault(iso, {"countries": {}, "regions": set()})
+        if "country" in r:
+            code = r.get("countryCode", {}).get("value") or None
+            qid = _qid(r["country"]["value"])
+            d["countries"][qid] = d["countries"].get(qid) or code
+        if "adm1" in r:
+            d["regions"].add(_qid(r["adm1"]["value"]))
+    return tmp
+
+
+@lru_cache(maxsize=None)
+def country_label(iso2: str) -> Optional[str]:
+    """
+    English short name from ISO 3166 (pycountry), in the form Wikidata uses:
+    common_name, else name or official_name unless comma-inverted ("Congo,
+    The Democratic Republic of the"). None without pycountry, for unknown
+    codes, or when only an inverted form exists (the QID label is used then).
+    """
+    if pycountry is None:
+        return None
+    c = pycountry.countries.get(alpha_2=iso2.upper())
+    if c is None:
+        return None
+    for attr in ("common_name", "name", "official_name"):
+        value = getattr(c, attr, None)
+        if value and ", " not in value:
+            return value
+    return None
+
+
+class QidLabels:
+    """
+    English labels by QID, shared by every geo query of the process: each
+    QID is looked up once (in batches of `batch_size`, through the HTTP
+    cache), and concurrent chunks asking for the same QIDs wait on the
+    same lookup. A failing batch is split until the bad QIDs are isolated;
+    those, and items without an English label, resolve to their QID, as
+    the label service did (failed ones are not cached, so they're retried
+    by the next lookup that needs them).
+    """
 
-async def _fetch_geo_single(iso: str, *, timeout: float, retries: int) -> Dict[str, Dict]:
+    def __init__(self, batch_size: int = 200):
+        self.batch_size = batch_size
+        self.labels: Dict[str, str] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def resolve(self, qids, *, client: Optional[httpx.AsyncClient] = None,
+                      timeout: float = 60.0, retries: int = 3) -> Dict[str, str]:
+        qids = set(qids)
+        tried = set()
+        # a second round picks up QIDs whose shared lookup was cancelled with another batch
+        for _ in range(2):
+            todo = sorted(q for q in qids - tried if q not in self.labels and q not in self._pending)
+            waiting = {self._pending[q] for q in qids if q in self._pending}
+            if todo:
+                tried.update(todo)
+                await self._lookup(todo, client=client, timeout=timeout, retries=retries)
+            if waiting:
+                await asyncio.wait(waiting)  # unlike gather, a cancelled waiter doesn't cancel the shared lookup
+            if not waiting or all(q in self.labels for q in qids - tried):
+                break
+        return {q: self.labels.get(q, q) for q in qids}
+
+    async def _lookup(self, qids: List[str], *, client, timeout: float, retries: int):
+        loop = asyncio.get_running_loop()
+        futures = {q: loop.create_future() for q in qids}
+        self._pending.update(futures)
+        try:
+            with time_block("qid_label_lookup", num_qids=len(qids)):
+                await asyncio.gather(*(
+                    self._fetch(qids[i:i + self.batch_size], client=client, timeout=timeout, retries=retries)
+                    for i in range(0, len(qids), self.batch_size)
+                ))
+            checkpoint("qid_labels_resolved", num_qids=len(qids), cached=len(self.labels))
+        finally:
+            for q, f in futures.items():
+                self._pending.pop(q, None)
+                if not f.done():
+                    f.set_result(None)
+
+    async def _fetch(self, qids: List[str], *, client, timeout: float, retries: int):
+        try:
+            # a multi-QID lookup fails fast: splitting is the retry
+            attempts = retries if len(qids) == 1 else min(retries, 2)
+            data = await _post_sparql(sparql_labels_for_qids(qids), client=client,
+                                      timeout=timeout, max_retries=attempts)
+        except Exception as e:
+            if len(qids) == 1:
+                checkpoint("qid_label_failed", qid=qids[0], error=type(e).__name__)
+                print(f"    ✗ label {qids[0]} ({type(e).__name__})")
+                return
+            left, right = _halves(qids)
+            checkpoint("qid_labels_bisected", qids=len(qids), error=type(e).__name__)
+            await asyncio.gather(self._fetch(left, client=client, timeout=timeout, retries=retries),
+                                 self._fetch(right, client=client, timeout=timeout, retries=retries))
+            return
+        found = {_qid(r["item"]["value"]): r["label"]["value"]
+                 for r in data.get("results", {}).get("bindings", []) if "label" in r}
+        for q in qids:
+            self.labels[q] = found.get(q, q)
+
+
+LABELS = QidLabels()
+
+
+async def _label_geo(parsed: Dict[str, Dict], client: Optional[httpx.AsyncClient]) -> Dict[str, Dict]:
+    """Parsed IDs -> dict[iso] -> {countries_iso2, countries_labels, regions}"""
+    local: Dict[str, str] = {}
+    lookup = set()
+    for d in parsed.values():
+        for qid, code in d["countries"].items():
+            name = country_label(code) if code else None
+            if name:
+                local[qid] = name
+            else:
+                lookup.add(qid)
+        lookup |= d["regions"]
+    labels = await LABELS.resolve(lookup, client=client) if lookup else {}
+    labels.update(local)
+    return {
+        iso: {
+            "countries_iso2": sorted({c for c in d["countries"].values() if c}),
+            "countries_labels": sorted({labels[q] for q in d["countries"]}),
+            "regions": sorted({labels[q] for q in d["regions"]}),
+        }
+        for iso, d in parsed.items()
+    }
+
+
+def _halves(codes: List[str]):
+    mid = len(codes) // 2
+    return codes[:mid], codes[mid:]
+
+
+async def _fetch_geo_bisect(
+    codes: List[str], result: Dict[str, Dict], *, client: Optional[httpx.AsyncClient],
+    timeout: float, retries: int, use_simple_query: bool, label: str,
+    on_result: Optional[Callable[[Dict[str, Dict]], None]] = None
+):
     """
-    Geo fallback for a single ISO code.
-    Returns: {iso: {countries, regions, country_codes}}
+    Query geo for `codes` into `result`. On ANY failure (timeout, HTTP, parse)
+    split in half and query both halves concurrently, recursively, so k bad
+    codes in a chunk of n cost O(k log n) extra queries instead of n serial
+    singles. A single code that still fails is left empty (can be filled
+    later by community overrides).
     """
-    with time_block("wikidata_geo_single", iso=iso):
-        q = sparql_geo_for_codes([iso])
-        data = await _post_sparql(q, timeout=timeout, max_retries=retries)
-        rows = data.get("results", {}).get("bindings", [])
-
-        out = {iso: {"countries": set(), "regions": set(), "country_codes": {}}}
-        for r in rows:
-            if "countryLabel" in r:
-                out[iso]["countries"].add(r["countryLabel"]["value"])
-            if "countryCode" in r and r["countryCode"].get("value"):
-                out[iso]["country_codes"][r["countryCode"]["value"]] = True
-            if "adm1Label" in r:
-                out[iso]["regions"].add(r["adm1Label"]["value"])
-        return out
+    with time_block("geo_query", label=label, size=len(codes)):
+        try:
+            with time_block("build_geo_query"):
+                q = _sparql_geo_simple(codes) if use_simple_query else sparql_geo_for_codes(codes)
+            # a multi-code query fails fast: splitting is the retry
+            attempts = retries if len(codes) == 1 else min(retries, 2)
+            with time_block("execute_geo_query"):
+                data = await _post_sparql(q, client=client, timeout=timeout, max_retries=attempts)
+            with time_block("parse_geo_results"):
+                parsed = _parse_geo_rows(data.get("results", {}).get("bindings", []))
+        except Exception as e:
+            error_type = type(e).__name__
+        else:
+            # label lookups retry/split on their own; splitting geo codes can't help them
+            with time_block("label_geo_results"):
+                parsed = await _label_geo(parsed, client)
+            result.update(parsed)
+            if on_result is not None:
+                # every code in a successful query is final, including those with no rows
+                on_result({c: parsed.get(c) or {"countries_iso2": [], "countries_labels": [], "regions": []}
+                           for c in codes})
+            checkpoint("geo_query_success", label=label, codes=len(codes))
+            return
+
+    if len(codes) == 1:
+        checkpoint("geo_code_failed", iso=codes[0], error=error_type)
+        print(f"    ✗ geo {codes[0]} ({error_type})")
+        result.setdefault(codes[0], {"countries_iso2": [], "countries_labels": [], "regions": []})
+        return
+    left, right = _halves(codes)
+    checkpoint("geo_query_bisected", label=label, codes=len(codes), error=error_type)
+    print(f"  ✂️  Geo {label} ({len(codes)} codes) failed ({error_type}), splitting {len(left)}+{len(right)}...")
+    await asyncio.gather(
+        _fetch_geo_bisect(left, result, client=client, timeout=timeout, retries=retries,
+                          use_simple_query=use_simple_query, label=f"{label}.1", on_result=on_result),
+        _fetch_geo_bisect(right, result, client=client, timeout=timeout, retries=retries,
+                          use_simple_query=use_simple_query, label=f"{label}.2", on_result=on_result),
+    )
 
 
 async def fetch_geo_batch(
     codes: List[str],
     *,
+    client: Optional[httpx.AsyncClient] = None,
     timeout: float = 150.0,   # generous: geo payloads can be big
     retries: int = 5,
-    chunk_size: int = 6,      # small chunks reduce payload issues
-    pause_between: float = 0.8,
-    use_simple_query: bool = False  # NEW: simplified query for problematic cases
+    chunk_size: int = 25,     # no label service in the query, so chunks can be large
+    use_simple_query: bool = False,  # NEW: simplified query for problematic cases
+    on_result: Optional[Callable[[Dict[str, Dict]], None]] = None,
 ) -> Dict[str, Dict]:
     """
-    Fetch geo info in chunks. On ANY failure (timeout, HTTP, parse), fallback to per-ISO.
+    Fetch geo info in chunks, concurrently (paced by the shared rate limiter).
+    A failing chunk is bisected until the bad codes are isolated.
+    `on_result` gets {iso: geo} for each query as soon as it succeeds, so
+    callers can keep finished work if the batch is cancelled.
     Returns dict[iso] -> {countries_iso2, countries_labels, regions}
     """
     with time_block("wikidata_geo_batch", num_codes=len(codes), chunk_size=chunk_size):
         result: Dict[str, Dict] = {}
-        num_chunks = (len(codes) + chunk_size - 1) // chunk_size
-        
-        checkpoint("geo_batch_start", num_codes=len(codes), num_chunks=num_chunks)
-
-        for i in range(0, len(codes), chunk_size):
-            chunk = codes[i:i + chunk_size]
-            chunk_num = i // chunk_size + 1
-            
-            with time_block(f"geo_chunk_{chunk_num}", chunk_size=len(chunk)):
-                # Try with shorter timeout first
-                chunk_timeout = min(timeout, 90.0)  # Cap at 90s for chunk queries
-                
-                try:
-                    with time_block("build_geo_query"):
-                        if use_simple_query:
-                            # Simplified query - just countries, no regions
-                            print(f"  📍 Using simplified geo query (countries only)")
-                            q = _sparql_geo_simple(chunk)
-                        else:
-                            q = sparql_geo_for_codes(chunk)
-                    
-                    with time_block("execute_geo_query"):
-                        data = await _post_sparql(q, timeout=chunk_timeout, max_retries=3)  # Fewer retries for chunks
-                    
-                    with time_block("parse_geo_results"):
-                        rows = data.get("results", {}).get("bindings", [])
-
-                        tmp: Dict[str, Dict] = {}
-                        for r in rows:
-                            iso = r["iso"]["value"]
-                            d = tmp.setdefault(iso, {"countries": set(), "regions": set(), "country_codes": {}})
-                            if "countryLabel" in r:
-                                d["countries"].add(r["countryLabel"]["value"])
-                            if "countryCode" in r and r["countryCode"].get("value"):
-                                d["country_codes"][r["countryCode"]["value"]] = True
-                            if "adm1Label" in r:
-                                d["regions"].add(r["adm1Label"]["value"])
-
-                        # normalize + merge
-                        for iso, v in tmp.items():
-                            iso2s = sorted(v["country_codes"].keys())
-                            result[iso] = {
-                                "countries_iso2": iso2s,
-                                "countries_labels": sorted(v["countries"]),
-                                "regions": sorted(v["regions"]),
-                            }
-                    
-                    checkpoint("geo_chunk_success", chunk_num=chunk_num, codes_in_chunk=len(chunk))
-
-                except Exception as e:
-                    # Fallback to single-ISO queries for this chunk on ANY failure
-                    error_type = type(e).__name__
-                    checkpoint("geo_chunk_failed", chunk_num=chunk_num, error=error_type, fallback_to_single=True)
-                    print(f"  ⚠️  Chunk {chunk_num} failed ({error_type}), trying individual queries...")
-                    
-                    with time_block("geo_fallback_to_single", chunk_size=len(chunk)):
-                        for j, iso in enumerate(chunk, 1):
-                            try:
-                                print(f"    📍 {j}/{len(chunk)}: {iso}", end=" ")
-                                single = await _fetch_geo_single(iso, timeout=60.0, retries=2)  # Shorter timeout for singles
-                                v = single.get(iso, {"countries": set(), "regions": set(), "country_codes": {}})
-                                iso2s = sorted(v["country_codes"].keys())
-                                result[iso] = {
-                                    "countries_iso2": iso2s,
-                                    "countries_labels": sorted(v["countries"]),
-                                    "regions": sorted(v["regions"]),
-                                }
-                                print("✓")
-                            except Exception as e2:
-                                # Leave empty; can be filled later by community overrides
-                                print(f"✗ ({type(e2).__name__})")
-                                result.setdefault(iso, {"countries_iso2": [], "countries_labels": [], "regions": []})
-
-                await asyncio.sleep(pause_between)  # be nice to Wikidata
+        chunks = [codes[i:i + chunk_size] for i in range(0, len(codes), chunk_size)]
+        checkpoint("geo_batch_start", num_codes=len(codes), num_chunks=len(chunks))
+        if use_simple_query:
+            # Simplified query - just countries, no regions
+            print(f"  📍 Using simplified geo query (countries only)")
+
+        chunk_timeout = min(timeout, 90.0)  # Cap at 90s for chunk queries
+        await asyncio.gather(*(
+            _fetch_geo_bisect(chunk, result, client=client, timeout=chunk_timeout, retries=retries,
+                              use_simple_query=use_simple_query, label=f"chunk {n}", on_result=on_result)
+            for n, chunk in enumerate(chunks, 1)
+        ))
 
         checkpoint("geo_batch_complete", total_codes=len(result))
         return result
@@ -358,7 +576,7 @@ def _sparql_geo_simple(codes: List[str]) -> str:
 PREFIX wdt: <http://www.wikidata.org/prop/direct/>
 PREFIX wd: <http://www.wikidata.org/entity/>
 
-SELECT ?iso ?countryCode ?countryLabel WHERE {{
+SELECT DISTINCT ?iso ?country ?countryCode WHERE {{
   VALUES ?iso {{ {values} }}
   ?lang wdt:P220 ?iso .
   
@@ -366,7 +584,6 @@ SELECT ?iso ?countryCode ?countryLabel WHERE {{
   OPTIONAL {{
     ?country wdt:P37 ?lang .
     OPTIONAL {{ ?country wdt:P297 ?countryCode . }}
-    SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
   }}
 }}
 """
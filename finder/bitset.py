@@ -0,0 +1,42 @@
+"""
+Bitset helpers: sets of dense language ids packed into Python ints
+"""
+from __future__ import annotations
+from typing import Iterable, List
+
+# set bit positions of every byte value, for fast unpacking
+_BYTE_BITS = [tuple(i for i in range(8) if b >> i & 1) for b in range(256)]
+
+
+def bits_from_ids(ids: Iterable[int]) -> int:
+    """Pack ids into a bitset"""
+    bits = 0
+    for i in ids:
+        bits |= 1 << i
+    return bits
+
+
+def ids_from_bits(bits: int) -> List[int]:
+    """Unpack a bitset into ascending ids"""
+    if not bits:
+        return []
+    ids = []
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for offset, byte in enumerate(raw):
+        if byte:
+            base = offset * 8
+            ids.extend(base + i for i in _BYTE_BITS[byte])
+    return ids
+
+
+def is_set(mask: bytes, i: int) -> bool:
+    """Membership test against a bitset unpacked with int.to_bytes(..., "little")"""
+    return bool(mask[i >> 3] >> (i & 7) & 1)
+
+
+if hasattr(int, "bit_count"):  # Python 3.10+
+    popcount = int.bit_count
+else:
+    def popcount(bits: int) -> int:
+        """Number of ids in a bitset"""
+        return bin(bits).count("1")
@@ -0,0 +1,63 @@
+"""
+Bounded LRU cache for LanguageFinder query results
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+
+class QueryCache:
+    """
+    LRU map from canonical query tuples to immutable result tuples.
+
+    Entries are tagged with the finder's data generation: the first
+    lookup after a reload sees a new generation and drops everything,
+    so stale results are never served.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Optional[Tuple]:
+        """Cached result for key, or None on a miss"""
+        if generation != self._generation:
+            self._entries.clear()
+            self._generation = generation
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Tuple, generation: int):
+        """Store a result computed against `generation`"""
+        if self.maxsize <= 0 or generation != self._generation:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "generation": self._generation,
+        }
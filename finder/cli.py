@@ -10,10 +10,12 @@ from typing import List
 
 try:
     from finder.core import LanguageFinder, Language
+    from finder.snapshot import Snapshot, SnapshotError
 except ImportError:
     # Fallback for direct script execution
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from finder.core import LanguageFinder, Language
+    from finder.snapshot import Snapshot, SnapshotError
 
 
 def format_language(lang: Language, verbose: bool = False) -> str:
@@ -54,7 +56,8 @@ def cmd_search(args, finder: LanguageFinder):
         resource_level=args.resource,
         min_speakers=args.min_speakers,
         limit=args.limit,
-        sort_by=args.sort
+        sort_by=args.sort,
+        fuzzy=args.fuzzy,
     )
     
     if not results:
@@ -226,6 +229,14 @@ def cmd_related(args, finder: LanguageFinder):
         print()
 
 
+def cmd_compile(args, finder: LanguageFinder):
+    """Handle compile command"""
+    path = finder.compile_snapshot(Path(args.output))
+    Snapshot(path, verify=True)
+    size = path.stat().st_size
+    print(f"✅ Compiled {len(finder._languages):,} languages to {path} ({size:,} bytes)")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="🌍 Omnilingual Language Finder - Discover ASR language codes",
@@ -249,6 +260,10 @@ Examples:
   
   # Show statistics
   omnilingual-finder stats
+  
+  # Compile a memory-mapped snapshot for fast startup
+  omnilingual-finder compile --output data/languages.snap
+  omnilingual-finder --snapshot data/languages.snap info hin_Deva
         """
     )
     
@@ -257,12 +272,18 @@ Examples:
         type=str,
         help="Path to languages.json (auto-discovers if not specified)"
     )
+    parser.add_argument(
+        "--snapshot",
+        type=str,
+        help="Load from a compiled snapshot instead of languages.json"
+    )
     
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
     
     # Search command
     search_parser = subparsers.add_parser("search", help="Search for languages")
     search_parser.add_argument("--name", help="Language name (fuzzy)")
+    search_parser.add_argument("--fuzzy", action="store_true", help="Tolerate typos in --name")
     search_parser.add_argument("--country", help="Country (ISO2 or name)")
     search_parser.add_argument("--region", help="Region/state name")
     search_parser.add_argument("--script", help="Script name or code")
@@ -296,6 +317,10 @@ Examples:
     related_parser.add_argument("code", help="Language code")
     related_parser.add_argument("--limit", type=int, default=5, help="Max results")
     
+    # Compile command
+    compile_parser = subparsers.add_parser("compile", help="Compile a binary snapshot for fast startup")
+    compile_parser.add_argument("--output", default="data/languages.snap", help="Snapshot path")
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -305,7 +330,13 @@ Examples:
     # Initialize finder
     try:
         data_path = Path(args.data_path) if args.data_path else None
-        finder = LanguageFinder(data_path)
+        snapshot = Path(args.snapshot) if args.snapshot else None
+        finder = LanguageFinder(data_path, snapshot=snapshot)
+    except SnapshotError as e:
+        print(f"❌ Error: {e}")
+        print("\n💡 Recompile it:")
+        print("   omnilingual-finder compile --output " + args.snapshot)
+        sys.exit(1)
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
         print("\n💡 Run this first:")
@@ -321,6 +352,7 @@ Examples:
         "stats": cmd_stats,
         "export": cmd_export,
         "related": cmd_related,
+        "compile": cmd_compile,
     }
     
     if args.command in commands:
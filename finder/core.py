@@ -4,12 +4,96 @@ Rich, intuitive API for discovering ASR language codes
 """
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set, Callable
+from typing import Any, List, Dict, Iterator, Optional, Callable, Sequence, Tuple
 from pathlib import Path
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import islice
+import hashlib
+import heapq
 import json
+import sys
 import unicodedata
 import re
 
+try:  # optional: full ISO 3166 names/codes for country lookups
+    import pycountry
+except ImportError:
+    pycountry = None
+
+from .cache import QueryCache
+from .bitset import bits_from_ids, ids_from_bits, is_set, popcount
+from .ngram import NgramIndex
+from .symspell import SymSpellIndex
+from .snapshot import Snapshot, SnapshotError, SnapshotIndex, SnapshotRecords, write_snapshot
+
+
+_RESOURCE_ORDER = {"high": 0, "medium": 1, "low": 2, "zero-shot": 3}
+
+# search(sort_by=...) orderings, precomputed once per load as permutations
+_SORT_KEYS: Dict[str, Callable[["Language"], tuple]] = {
+    "speakers": lambda x: (-x.speaker_count if x.speaker_count else -1, x.english_name),
+    "name": lambda x: (x.english_name,),
+    "resource": lambda x: (_RESOURCE_ORDER.get(x.resource_level, 99), -x.speaker_count if x.speaker_count else 0),
+    "family": lambda x: (x.language_family or "ZZZ", x.english_name),
+}
+
+# Country aliases people actually type, on top of ISO 3166 (via pycountry)
+_COUNTRY_ALIASES = {
+    "usa": "US", "america": "US", "united states": "US",
+    "uk": "GB", "britain": "GB", "great britain": "GB", "england": "GB",
+    "uae": "AE", "drc": "CD", "russia": "RU", "south korea": "KR",
+    "north korea": "KP", "vietnam": "VN", "iran": "IR", "syria": "SY",
+    "laos": "LA", "bolivia": "BO", "venezuela": "VE", "tanzania": "TZ",
+    "ivory coast": "CI", "burma": "MM", "czechia": "CZ", "holland": "NL",
+}
+
+# Postings with at least this many languages are precomputed as bitsets
+_DENSE_POSTING = 8
+
+# Ids per precomputed prefix bitset in the speaker-count column
+_SPEAKER_BLOCK = 64
+
+# Bump whenever the shape of LanguageFinder._indices changes, so stale
+# prebuilt finder_index.json files are rebuilt instead of trusted.
+INDEX_SCHEMA_VERSION = 4
+
+
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+
+
+def _json_record_offsets(blob: bytes) -> Dict[str, Tuple[int, int]]:
+    """
+    Byte span of each value of a top-level JSON object, so one record can
+    be read and parsed later without loading the others
+    """
+    text = blob.decode("utf-8")
+    decoder = json.JSONDecoder()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    pos = _JSON_WS.match(text, 0).end()
+    if text[pos:pos + 1] != "{":
+        raise ValueError("languages.json is not a JSON object")
+    pos = _JSON_WS.match(text, pos + 1).end()
+    chars = nbytes = 0  # running char -> byte offset (UTF-8)
+
+    def byte_offset(i: int) -> int:
+        nonlocal chars, nbytes
+        nbytes += len(text[chars:i].encode("utf-8"))
+        chars = i
+        return nbytes
+
+    while text[pos:pos + 1] != "}":
+        key, pos = decoder.raw_decode(text, pos)
+        pos = _JSON_WS.match(text, pos).end() + 1  # ':'
+        start = _JSON_WS.match(text, pos).end()
+        _, end = decoder.raw_decode(text, start)
+        offsets[key] = (byte_offset(start), byte_offset(end))
+        pos = _JSON_WS.match(text, end).end()
+        if text[pos:pos + 1] == ",":
+            pos = _JSON_WS.match(text, pos + 1).end()
+    return offsets
+
 
 def _norm(s: str) -> str:
     """Normalize string for fuzzy matching"""
@@ -18,7 +102,25 @@ def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", s.lower()).strip()
 
 
-@dataclass
+# __slots__ via dataclass needs Python 3.10+; older versions get a regular class
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=None)
+def _country_alias_table() -> Dict[str, str]:
+    """Normalized country names, ISO3 codes and aliases -> ISO2"""
+    table: Dict[str, str] = {}
+    if pycountry is not None:
+        for c in pycountry.countries:
+            for attr in ("alpha_3", "name", "official_name", "common_name"):
+                value = getattr(c, attr, None)
+                if value:
+                    table[_norm(value)] = c.alpha_2
+    table.update(_COUNTRY_ALIASES)
+    return table
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Language:
     """
     Rich language object with all metadata.
@@ -27,6 +129,9 @@ class Language:
     - Intuitive: dot notation for all properties
     - Complete: all metadata in one place
     - Printable: nice __repr__ for debugging
+    - Compact: slotted and immutable, so thousands of them (and cached
+      search results holding them) are cheap and safe to share. Use
+      dataclasses.replace() to derive a modified copy.
     """
     code: str
     iso_639_3: str
@@ -38,9 +143,9 @@ class Language:
     autonym: Optional[str] = None
     
     # Geographic
-    countries: List[str] = field(default_factory=list)  # ISO2 codes
-    country_names: List[str] = field(default_factory=list)  # Human-readable
-    regions: List[str] = field(default_factory=list)  # Sub-national
+    countries: Tuple[str, ...] = ()  # ISO2 codes
+    country_names: Tuple[str, ...] = ()  # Human-readable
+    regions: Tuple[str, ...] = ()  # Sub-national
     coordinates: Optional[Dict[str, float]] = None  # {lat, lon}
     
     # Linguistic
@@ -57,14 +162,17 @@ class Language:
     data_source: str = "community"  # public/community/both
     
     # Related
-    related_languages: List[str] = field(default_factory=list)
+    related_languages: Tuple[str, ...] = ()
     
     # External IDs
     wikipedia_code: Optional[str] = None
     glottolog_code: Optional[str] = None
     
-    # Internal
-    _raw: Dict = field(default_factory=dict, repr=False)
+    # Internal: fetches the full raw record on demand (see .raw)
+    _source: Optional[Callable[[str], Dict]] = field(default=None, repr=False, compare=False)
+    
+    def __hash__(self):
+        return hash(self.code)
     
     def __repr__(self):
         speakers = f"{self.speaker_count:,}" if self.speaker_count else "?"
@@ -78,6 +186,19 @@ class Language:
         """Best display name (native if available, else English)"""
         return self.native_name or self.autonym or self.english_name
     
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """
+        Full languages.json record, including provenance. Not kept in
+        memory by default: the first access indexes where each record sits
+        in the data file, then every access reads and parses just its own.
+        """
+        return self._source(self.code) if self._source else {}
+    
+    @property
+    def _raw(self) -> Dict[str, Any]:
+        return self.raw
+    
     @property
     def primary_country(self) -> Optional[str]:
         """First/primary country where spoken"""
@@ -101,9 +222,9 @@ class Language:
             "english_name": self.english_name,
             "native_name": self.native_name,
             "autonym": self.autonym,
-            "countries": self.countries,
-            "country_names": self.country_names,
-            "regions": self.regions,
+            "countries": list(self.countries),
+            "country_names": list(self.country_names),
+            "regions": list(self.regions),
             "coordinates": self.coordinates,
             "language_family": self.language_family,
             "script_name": self.script_name,
@@ -111,7 +232,7 @@ class Language:
             "speaker_count": self.speaker_count,
             "resource_level": self.resource_level,
             "data_source": self.data_source,
-            "related_languages": self.related_languages,
+            "related_languages": list(self.related_languages),
             "wikipedia_code": self.wikipedia_code,
             "glottolog_code": self.glottolog_code,
         }
@@ -140,21 +261,109 @@ class LanguageFinder:
         south_asia = finder.browse_region("South Asia")
     """
     
-    def __init__(self, data_path: Optional[Path] = None):
+    def __init__(
+        self,
+        data_path: Optional[Path] = None,
+        index_path: Optional[Path] = None,
+        fast_start: bool = True,
+        cache_size: int = 1024,
+        keep_raw: bool = False,
+        snapshot: Optional[Path] = None,
+    ):
         """
         Initialize finder.
         
         Args:
             data_path: Path to languages.json. Auto-discovers if None.
+            index_path: Path to a prebuilt finder_index.json. Defaults to
+                finder_index.json next to languages.json.
+            fast_start: Load the prebuilt index when its schema version and
+                checksum match languages.json; otherwise rebuild in memory.
+            cache_size: Max distinct search() queries to keep results for
+                (LRU). 0 disables the cache.
+            keep_raw: Keep every raw record in memory while loading, for
+                Language.raw, instead of reading it from the data file on
+                each access.
+            snapshot: Path to a binary snapshot (compile_snapshot()).
+                Memory-mapped instead of parsing languages.json: records
+                are decoded on first access, so startup stays flat as the
+                database grows. data_path/index_path are then only used
+                for Language.raw.
         """
-        self.data_path = self._discover_data_path(data_path)
+        self.snapshot_path = Path(snapshot) if snapshot else None
+        self._snapshot: Optional[Snapshot] = None
+        if self.snapshot_path:
+            self.data_path = Path(data_path) if data_path else None
+        else:
+            self.data_path = self._discover_data_path(data_path)
+        self.index_path = (
+            Path(index_path) if index_path
+            else self.data_path.parent / "finder_index.json" if self.data_path
+            else None
+        )
+        self.fast_start = fast_start
+        self.keep_raw = keep_raw
+        self._raw_records: Dict[str, Dict] = {}  # only with keep_raw
+        self._raw_offsets: Optional[Dict[str, Tuple[int, int]]] = None  # code -> byte span, for Language.raw
+        self._raw_stamp: Tuple[int, int] = (0, 0)  # (size, mtime_ns) the offsets were taken from
+        self._generation = 0  # bumped whenever loaded data changes
+        self._cache = QueryCache(cache_size)
+        self.source_checksum: str = ""
+        self._source_stamp: Optional[List[int]] = None  # [size, mtime_ns] of the data file loaded
+        self.index_source: str = "built"  # "prebuilt"/"snapshot" when loaded from disk
         self._languages: Dict[str, Language] = {}
         self._indices: Dict[str, Dict] = {}
+        self._by_id: List[Language] = []        # dense id -> Language
+        self._ids: Dict[str, int] = {}          # code -> dense id
+        self._bits: Dict[str, Dict[str, int]] = {}  # index -> key -> bitset of ids
+        self._all_bits = 0
+        self._columns: Dict[str, array] = {}        # categorical codes, by id
+        self._categories: Dict[str, List[str]] = {}  # column -> code -> value
+        self._speakers = array("q")                 # speaker counts, 0 where unknown
+        self._has_speakers = 0                      # null mask: ids with a count
+        self._speaker_order = array("I")            # ids with a count, ascending
+        self._speaker_sorted = array("q")           # their counts, ascending
+        self._speaker_blocks: List[int] = []        # bitset of the first k*BLOCK ids above
+        self._orders: Dict[str, array] = {}         # sort_by -> ids in sorted order
+        self._ranks: Dict[str, array] = {}          # sort_by -> position of each id
+        self._ngrams: Dict[str, NgramIndex] = {}
+        self._country_aliases: Dict[str, str] = {}  # normalized alias -> ISO2
+        self._spell: Optional[SymSpellIndex] = None
         
-        self._load_data()
-        self._build_indices()
+        self._load()
         self._build_regional_hierarchy()
     
+    def _load(self):
+        """Load languages.json and everything derived from it"""
+        self._languages = {}
+        self._raw_records = {}
+        self._raw_offsets = None
+        self._ngrams = {}
+        self._spell = None
+        self._speaker_blocks = []
+        if self.snapshot_path:
+            self._load_snapshot()
+            return
+        self._load_data()
+        if not (self.fast_start and self._load_prebuilt_indices()):
+            self._build_indices()
+        self._build_search_structures()
+    
+    def reload(self):
+        """
+        Re-read languages.json (and the prebuilt index or snapshot) from disk.
+        Cached search results from before the reload are discarded.
+        """
+        self._load()
+        self._generation += 1
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Query cache counters: hits, misses, evictions, size, maxsize, generation"""
+        return self._cache.info()
+    
+    # Indices searched by the typo-tolerant name lookup
+    _NAME_INDICES = ("by_name", "by_native", "by_alias")
+    
     def _discover_data_path(self, explicit: Optional[Path]) -> Path:
         """Smart path discovery"""
         if explicit and explicit.exists():
@@ -177,7 +386,23 @@ class LanguageFinder:
     
     def _load_data(self):
         """Load and parse language data into rich Language objects"""
-        raw = json.loads(self.data_path.read_text())
+        st = self.data_path.stat()
+        blob = self.data_path.read_bytes()
+        self.source_checksum = hashlib.sha256(blob).hexdigest()
+        self._source_stamp = [st.st_size, st.st_mtime_ns]
+        raw = json.loads(blob)
+        
+        # Repeated strings (scripts, families, country codes, regions) and
+        # list fields are interned so languages share one copy of each
+        intern = sys.intern
+        tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        
+        def _s(value):
+            return intern(value) if isinstance(value, str) else value
+        
+        def _t(values):
+            t = tuple(_s(v) for v in values or ())
+            return tuples.setdefault(t, t)
         
         for code, data in raw.items():
             # Extract values from {value, source, confidence} structure
@@ -195,44 +420,154 @@ class LanguageFinder:
                 else:
                     coords = None
             
+            geo = (data.get("provenance") or {}).get("geo") or {}
+            
             lang = Language(
                 code=code,
                 iso_639_3=data.get("iso_639_3", ""),
-                script_code=data.get("script_code", ""),
+                script_code=_s(data.get("script_code", "")),
                 english_name=_v("english_name", code),
                 native_name=_v("autonym"),
                 autonym=_v("autonym"),
-                countries=data.get("primary_countries", []),
-                country_names=data.get("provenance", {}).get("geo", {}).get("countries_labels", []),
-                regions=data.get("regions", []),
+                countries=_t(data.get("primary_countries")),
+                country_names=_t(geo.get("countries_labels")),
+                regions=_t(data.get("regions")),
                 coordinates=coords,
-                language_family=_v("language_family"),
-                script_name=_v("script_name", data.get("script_code", "")),
-                writing_direction=_v("writing_direction", "ltr"),
+                language_family=_s(_v("language_family")),
+                script_name=_s(_v("script_name", data.get("script_code", ""))),
+                writing_direction=_s(_v("writing_direction", "ltr")),
                 speaker_count=_v("speaker_count"),
                 speaker_count_source=_v("speaker_count") and "wikidata",
-                resource_level=_v("resource_level", "low"),
-                data_source=_v("data_source", "community"),
-                related_languages=data.get("related_languages", []),
+                resource_level=_s(_v("resource_level", "low")),
+                data_source=_s(_v("data_source", "community")),
+                related_languages=_t(data.get("related_languages")),
                 wikipedia_code=_v("wikipedia_code"),
                 glottolog_code=_v("glottolog_code"),
-                _raw=data
+                _source=self._raw_record,
             )
             
             self._languages[code] = lang
+            if self.keep_raw:
+                self._raw_records[code] = data
+    
+    def _raw_record(self, code: str) -> Dict:
+        """Raw languages.json record for a code (backs Language.raw)"""
+        if self.keep_raw and not self.snapshot_path:
+            return self._raw_records.get(code, {})
+        if self.data_path is None or not self.data_path.exists():
+            where = f"{self.data_path} doesn't exist" if self.data_path else "no data_path was given"
+            raise FileNotFoundError(
+                f"Language.raw needs languages.json, but {where} "
+                f"(pass data_path= along with snapshot=)"
+            )
+        # Only an offset per record is kept; each access parses just its record
+        st = self.data_path.stat()
+        if self._raw_offsets is None or self._raw_stamp != (st.st_size, st.st_mtime_ns):
+            self._raw_offsets = _json_record_offsets(self.data_path.read_bytes())
+            self._raw_stamp = (st.st_size, st.st_mtime_ns)
+        span = self._raw_offsets.get(code)
+        if span is None:
+            return {}
+        with open(self.data_path, "rb") as f:
+            f.seek(span[0])
+            return json.loads(f.read(span[1] - span[0]))
+    
+    def _load_snapshot(self):
+        """Map a compiled snapshot instead of parsing languages.json"""
+        snap = Snapshot(self.snapshot_path)
+        meta = snap.meta
+        if meta.get("schema_version") != INDEX_SCHEMA_VERSION:
+            raise SnapshotError(
+                f"{self.snapshot_path} was compiled with index schema "
+                f"{meta.get('schema_version')}, expected {INDEX_SCHEMA_VERSION}; recompile it"
+            )
+        
+        self._snapshot = snap
+        self.source_checksum = meta.get("source_sha256", "")
+        self._source_stamp = meta.get("source_stamp")
+        self.index_source = "snapshot"
+        if self.data_path is None and meta.get("data_path"):
+            self.data_path = Path(meta["data_path"])
+        self._check_snapshot_source()
+        
+        source = self._raw_record
+        records = SnapshotRecords(snap, lambda fields: Language(**fields, _source=source))
+        self._languages = records
+        self._by_id = records.by_id
+        self._ids = records.ids
+        self._all_bits = (1 << len(records)) - 1
+        self._indices = {name: snap.index(name) for name in meta["indices"]}
+        self._bits = {name: {} for name in self._indices}
+        
+        # Columns and sort permutations are used in place from the mapping
+        self._categories = meta["categories"]
+        self._columns = {attr: snap.array(f"column.{attr}") for attr in self._categories}
+        self._speakers = snap.array("speakers")
+        self._speaker_order = snap.array("speaker_order")
+        self._speaker_sorted = snap.array("speaker_sorted")
+        self._orders = {s: snap.array(f"order.{s}") for s in _SORT_KEYS}
+        self._ranks = {s: snap.array(f"rank.{s}") for s in _SORT_KEYS}
+        self._country_aliases = _country_alias_table()
+    
+    def _check_snapshot_source(self):
+        """
+        A snapshot must match the languages.json next to it (which backs
+        Language.raw): size+mtime first, the checksum only when they differ
+        """
+        if not self.source_checksum or self.data_path is None or not self.data_path.exists():
+            return
+        st = self.data_path.stat()
+        if self._source_stamp == [st.st_size, st.st_mtime_ns]:
+            return
+        if hashlib.sha256(self.data_path.read_bytes()).hexdigest() != self.source_checksum:
+            raise SnapshotError(
+                f"{self.snapshot_path} was compiled from a different version of "
+                f"{self.data_path}; recompile it"
+            )
+    
+    def compile_snapshot(self, path: Path) -> Path:
+        """
+        Write the loaded database and its indices as a binary snapshot
+        for LanguageFinder(snapshot=path).
+        """
+        indices = {
+            name: {key: list(self._posting_ids(name, key)) for key in index}
+            for name, index in self._indices.items()
+        }
+        arrays = {
+            "speakers": array("q", self._speakers),
+            "speaker_order": array("I", self._speaker_order),
+            "speaker_sorted": array("q", self._speaker_sorted),
+        }
+        for attr, column in self._columns.items():
+            arrays[f"column.{attr}"] = array("H", column)
+        for sort_by in _SORT_KEYS:
+            arrays[f"order.{sort_by}"] = array("I", self._orders[sort_by])
+            arrays[f"rank.{sort_by}"] = array("I", self._ranks[sort_by])
+        
+        return write_snapshot(path, self._by_id, indices, arrays, {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "source_sha256": self.source_checksum,
+            "data_path": str(self.data_path.resolve()) if self.data_path else None,
+            "source_stamp": self._source_stamp,
+            "categories": self._categories,
+        })
     
     def _build_indices(self):
         """Build fast lookup indices"""
         self._indices = {
             "by_name": {},        # english_name -> [codes]
             "by_native": {},      # native_name -> [codes]
+            "by_alias": {},       # wikipedia title -> [codes]
             "by_iso3": {},        # iso_639_3 -> [codes]
             "by_script": {},      # script_code -> [codes]
             "by_script_name": {}, # script_name -> [codes]
             "by_country": {},     # country ISO2 -> [codes]
+            "by_country_name": {},  # country name -> [codes]
             "by_region": {},      # region name -> [codes]
             "by_family": {},      # language_family -> [codes]
             "by_resource": {},    # resource_level -> [codes]
+            "by_data_source": {}, # data_source -> [codes]
         }
         
         for code, lang in self._languages.items():
@@ -242,6 +577,8 @@ class LanguageFinder:
                 self._index_add("by_native", _norm(lang.native_name), code)
             if lang.autonym and lang.autonym != lang.native_name:
                 self._index_add("by_native", _norm(lang.autonym), code)
+            if lang.wikipedia_code:
+                self._index_add("by_alias", _norm(lang.wikipedia_code), code)
             
             # IDs
             self._index_add("by_iso3", lang.iso_639_3, code)
@@ -254,6 +591,8 @@ class LanguageFinder:
             for country in lang.countries:
                 self._index_add("by_country", country, code)
                 self._index_add("by_country", country.lower(), code)
+            for cname in lang.country_names:
+                self._index_add("by_country_name", _norm(cname), code)
             
             for region in lang.regions:
                 self._index_add("by_region", _norm(region), code)
@@ -264,6 +603,208 @@ class LanguageFinder:
             
             # Metadata
             self._index_add("by_resource", lang.resource_level, code)
+            self._index_add("by_data_source", lang.data_source, code)
+    
+    def _load_prebuilt_indices(self) -> bool:
+        """
+        Load indices from a prebuilt finder_index.json (scripts/build_index.py).
+        
+        The prebuilt file is only trusted when its schema version matches
+        INDEX_SCHEMA_VERSION and it was built from byte-identical
+        languages.json. Returns False when the caller should rebuild.
+        """
+        if not self.index_path or not self.index_path.exists():
+            return False
+        try:
+            payload = json.loads(self.index_path.read_bytes())
+        except (OSError, ValueError):
+            return False
+        
+        meta = payload.get("meta") or {}
+        indices = payload.get("finder")
+        if meta.get("schema_version") != INDEX_SCHEMA_VERSION:
+            return False
+        if meta.get("source_sha256") != self.source_checksum:
+            return False
+        if not isinstance(indices, dict):
+            return False
+        
+        self._indices = indices
+        self.index_source = "prebuilt"
+        return True
+    
+    def index_payload(self) -> Dict:
+        """
+        Serializable copy of the runtime indices, stamped with the schema
+        version and source checksum that _load_prebuilt_indices() checks.
+        """
+        return {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "source_sha256": self.source_checksum,
+            "indices": self._indices,
+        }
+    
+    def _build_search_structures(self):
+        """Build derived lookup structures on top of the key indices"""
+        # Dense ids so filters combine as integer bitsets instead of sets of codes
+        self._by_id = list(self._languages.values())
+        self._ids = {lang.code: i for i, lang in enumerate(self._by_id)}
+        self._all_bits = (1 << len(self._by_id)) - 1
+        
+        # Only dense postings are kept as bitsets; a bitset costs n/8 bytes
+        # however few ids it holds, so sparse ones are packed on demand
+        self._bits = {}
+        for index_name, index in self._indices.items():
+            self._bits[index_name] = {
+                key: bits_from_ids(self._ids[c] for c in codes if c in self._ids)
+                for key, codes in index.items()
+                if len(codes) >= _DENSE_POSTING
+            }
+        
+        self._build_columns()
+        
+        # Country names: exact probes against names/aliases, n-grams for partials
+        self._country_aliases = _country_alias_table()
+    
+    def _ngram(self, name: str) -> NgramIndex:
+        """
+        Substring matching for name/region/country misses: candidate lookup
+        via character n-grams instead of scanning every key
+        """
+        index = self._ngrams.get(name)
+        if index is None:
+            if name == "country":
+                keys = list(self._indices["by_country_name"]) + list(self._country_aliases)
+            else:
+                keys = self._indices[name].keys()
+            index = self._ngrams[name] = NgramIndex(keys)
+        return index
+    
+    def _speller(self) -> SymSpellIndex:
+        """Typo tolerance: symmetric-delete dictionary over every name form"""
+        if self._spell is None:
+            self._spell = SymSpellIndex(
+                key
+                for name in self._NAME_INDICES
+                for key in self._indices[name]
+            )
+        return self._spell
+    
+    def _build_columns(self):
+        """
+        Columnar views of the per-language fields search() filters and
+        sorts on, kept parallel to the dense ids.
+        """
+        langs = self._by_id
+        
+        for attr in ("resource_level", "data_source", "language_family", "script_code"):
+            values: List[str] = []
+            codes: Dict[str, int] = {}
+            column = array("H")
+            for lang in langs:
+                value = getattr(lang, attr) or ""
+                if value not in codes:
+                    codes[value] = len(values)
+                    values.append(value)
+                column.append(codes[value])
+            self._columns[attr] = column
+            self._categories[attr] = values
+        
+        # Speaker counts with a null mask, plus the counted ids sorted by
+        # count so range filters become a bisect and a prefix bitset
+        self._speakers = array("q", (int(lang.speaker_count or 0) for lang in langs))
+        counted = [i for i, lang in enumerate(langs) if lang.speaker_count is not None]
+        counted.sort(key=self._speakers.__getitem__)
+        self._speaker_order = array("I", counted)
+        self._speaker_sorted = array("q", (self._speakers[i] for i in counted))
+        self._build_speaker_blocks()
+        
+        # Every sort_by ordering as a permutation of ids (ties by id)
+        for sort_by, key in _SORT_KEYS.items():
+            keys = [key(lang) for lang in langs]
+            order = sorted(range(len(langs)), key=keys.__getitem__)
+            ranks = array("I", bytes(4 * len(order)))
+            for rank, i in enumerate(order):
+                ranks[i] = rank
+            self._orders[sort_by] = array("I", order)
+            self._ranks[sort_by] = ranks
+    
+    def _build_speaker_blocks(self):
+        """Prefix bitsets over the speaker order, every _SPEAKER_BLOCK ids"""
+        order = self._speaker_order
+        self._speaker_blocks = [0]
+        for start in range(0, len(order), _SPEAKER_BLOCK):
+            block = bits_from_ids(order[start:start + _SPEAKER_BLOCK])
+            self._speaker_blocks.append(self._speaker_blocks[-1] | block)
+        self._has_speakers = self._speakers_below(len(order))
+    
+    def _speakers_below(self, position: int) -> int:
+        """Bitset of the first `position` ids in ascending speaker order"""
+        block, rest = divmod(position, _SPEAKER_BLOCK)
+        start = block * _SPEAKER_BLOCK
+        return self._speaker_blocks[block] | bits_from_ids(self._speaker_order[start:start + rest])
+    
+    def _speaker_range(self, min_speakers: Optional[int], max_speakers: Optional[int]) -> int:
+        """
+        Bitset of languages passing the speaker filters. min_speakers drops
+        unknown counts; max_speakers keeps them.
+        """
+        if not self._speaker_blocks:
+            self._build_speaker_blocks()
+        bits = self._all_bits
+        if min_speakers is not None:
+            below = self._speakers_below(bisect_left(self._speaker_sorted, min_speakers))
+            bits &= self._has_speakers & ~below
+        if max_speakers is not None:
+            at_most = self._speakers_below(bisect_right(self._speaker_sorted, max_speakers))
+            bits &= ~(self._has_speakers & ~at_most)
+        return bits
+    
+    def _iter_ids(self, bits: int, sort_by: str) -> Iterator[int]:
+        """Lazily yield ids in `bits` by walking the precomputed sort_by order"""
+        order = self._orders.get(sort_by, range(len(self._by_id)))
+        mask = bits.to_bytes((len(self._by_id) + 7) // 8, "little")
+        for i in order:
+            if is_set(mask, i):
+                yield i
+    
+    def _take(self, bits: int, sort_by: str, limit: Optional[int]) -> List[int]:
+        """Ids in `bits`, in sort_by order, at most `limit` of them"""
+        ranks = self._ranks.get(sort_by)
+        if ranks is None:
+            ids = ids_from_bits(bits)
+            return ids[:limit] if limit else ids
+        if not limit:
+            ids = ids_from_bits(bits)
+            ids.sort(key=ranks.__getitem__)
+            return ids
+        
+        # Top-k. Walking the order costs ~limit * n / matches steps before
+        # `limit` hits; a heap over the matches costs ~matches. Pick the cheaper.
+        matches = popcount(bits)
+        if matches * matches <= limit * len(self._by_id):
+            return heapq.nsmallest(limit, ids_from_bits(bits), key=ranks.__getitem__)
+        return list(islice(self._iter_ids(bits, sort_by), limit))
+    
+    def _posting(self, index_name: str, key: str) -> int:
+        """Bitset of languages under `key` in an index (0 if absent)"""
+        dense = self._bits.get(index_name, {})
+        bits = dense.get(key)
+        if bits is None:
+            ids = self._posting_ids(index_name, key)
+            bits = bits_from_ids(ids)
+            if len(ids) >= _DENSE_POSTING:
+                dense[key] = bits
+        return bits
+    
+    def _posting_ids(self, index_name: str, key: str) -> Sequence[int]:
+        """Dense ids of languages under `key` in an index"""
+        index = self._indices.get(index_name)
+        if index is None:
+            return ()
+        if isinstance(index, SnapshotIndex):
+            return index.ids(key)
+        return [self._ids[c] for c in index.get(key, ()) if c in self._ids]
     
     def _index_add(self, index_name: str, key: str, code: str):
         """Helper to add to index"""
@@ -315,12 +856,14 @@ class LanguageFinder:
     
     # ==================== Public API ====================
     
-    def find(self, query: str) -> Optional[Language]:
+    def find(self, query: str, fuzzy: bool = False, max_edits: int = 2) -> Optional[Language]:
         """
         Find a single language by name, code, or ISO.
         
         Args:
             query: Language name, code, or ISO 639-3
+            fuzzy: Fall back to typo-tolerant matching (see search())
+            max_edits: Max typos tolerated by the fuzzy fallback (0-2)
         
         Returns:
             Best matching Language or None
@@ -328,8 +871,10 @@ class LanguageFinder:
         Example:
             >>> finder.find("Hindi")
             Language(hin_Deva: Hindi, 341,000,000 speakers)
+            >>> finder.find("Bhojpri", fuzzy=True)
+            Language(bho_Deva: Bhojpuri, ...)
         """
-        results = self.search(name=query, limit=1)
+        results = self.search(name=query, limit=1, fuzzy=fuzzy, max_edits=max_edits)
         return results[0] if results else None
     
     def get(self, code: str) -> Optional[Language]:
@@ -357,6 +902,8 @@ class LanguageFinder:
         max_speakers: Optional[int] = None,
         limit: Optional[int] = None,
         sort_by: str = "speakers",  # speakers, name, resource
+        fuzzy: bool = False,
+        max_edits: int = 2,
     ) -> List[Language]:
         """
         Powerful multi-criteria search.
@@ -373,6 +920,11 @@ class LanguageFinder:
             max_speakers: Maximum speaker count
             limit: Max results to return
             sort_by: "speakers", "name", "resource", "family"
+            fuzzy: If the name has no exact, substring or ISO 639-3 match,
+                match names/autonyms/aliases within max_edits typos
+                (closest distance only)
+            max_edits: Max typos for fuzzy matching (0-2). Short names
+                tolerate fewer: one typo per three characters.
         
         Returns:
             List of matching Language objects
@@ -392,139 +944,201 @@ class LanguageFinder:
                     resource_level="high"
                 )
         """
-        # Start with all languages
-        candidates = set(self._languages.keys())
+        # Canonical cache key: spellings that filter identically share an entry
+        key = (
+            name or None, country or None, region or None, script or None,
+            family or None, resource_level or None, data_source or None,
+            min_speakers, max_speakers, limit or None, sort_by,
+            max_edits if fuzzy else None,
+        )
+        cached = self._cache.get(key, self._generation)
+        if cached is not None:
+            return list(cached)
+        
+        candidates = self._filter(
+            name, country, region, script, family, resource_level,
+            data_source, min_speakers, max_speakers, fuzzy, max_edits,
+        )
+        
+        # Materialize only the surviving ids, already in sort order
+        results = tuple(self._by_id[i] for i in self._take(candidates, sort_by, limit))
+        self._cache.put(key, results, self._generation)
+        return list(results)
+    
+    def iter_search(
+        self,
+        name: Optional[str] = None,
+        country: Optional[str] = None,
+        region: Optional[str] = None,
+        script: Optional[str] = None,
+        family: Optional[str] = None,
+        resource_level: Optional[str] = None,
+        data_source: Optional[str] = None,
+        min_speakers: Optional[int] = None,
+        max_speakers: Optional[int] = None,
+        sort_by: str = "speakers",
+        fuzzy: bool = False,
+        max_edits: int = 2,
+    ) -> Iterator[Language]:
+        """
+        Lazy search(): yields matches in sort order without building the
+        full result list. Takes the same filters as search(), minus limit.
+        
+        Example:
+            >>> for lang in finder.iter_search(country="IN"):
+            ...     if lang.resource_level == "high":
+            ...         break
+        """
+        candidates = self._filter(
+            name, country, region, script, family, resource_level,
+            data_source, min_speakers, max_speakers, fuzzy, max_edits,
+        )
+        for i in self._iter_ids(candidates, sort_by):
+            yield self._by_id[i]
+    
+    def _filter(
+        self,
+        name: Optional[str],
+        country: Optional[str],
+        region: Optional[str],
+        script: Optional[str],
+        family: Optional[str],
+        resource_level: Optional[str],
+        data_source: Optional[str],
+        min_speakers: Optional[int],
+        max_speakers: Optional[int],
+        fuzzy: bool,
+        max_edits: int,
+    ) -> int:
+        """Apply search() filters; returns the bitset of matching ids"""
+        # Start with all languages; every filter is a bitset over dense ids
+        candidates = self._all_bits
         
         # Apply filters progressively (AND logic)
         
         if name:
-            name_matches = self._search_by_name(name)
+            name_matches = self._search_by_name(name, fuzzy=fuzzy, max_edits=max_edits)
             if name_matches:
                 candidates &= name_matches
             else:
-                return []  # No name matches = no results
+                return 0  # No name matches = no results
         
         if country:
-            country_codes = self._search_by_country(country)
-            if country_codes:
-                candidates &= country_codes
+            country_bits = self._search_by_country(country)
+            if country_bits:
+                candidates &= country_bits
         
         if region:
-            region_codes = self._search_by_region(region)
-            if region_codes:
-                candidates &= region_codes
+            region_bits = self._search_by_region(region)
+            if region_bits:
+                candidates &= region_bits
         
         if script:
-            script_codes = self._search_by_script(script)
-            if script_codes:
-                candidates &= script_codes
+            script_bits = self._search_by_script(script)
+            if script_bits:
+                candidates &= script_bits
         
         if family:
-            fam_norm = _norm(family)
-            family_codes = set(self._indices["by_family"].get(fam_norm, []))
-            if family_codes:
-                candidates &= family_codes
+            family_bits = self._posting("by_family", _norm(family))
+            if family_bits:
+                candidates &= family_bits
         
         if resource_level:
-            res_codes = set(self._indices["by_resource"].get(resource_level, []))
-            if res_codes:
-                candidates &= res_codes
-        
-        # Convert to Language objects and apply numeric filters
-        results = []
-        for code in candidates:
-            lang = self._languages[code]
-            
-            if data_source and lang.data_source != data_source:
-                continue
-            
-            if min_speakers is not None:
-                if lang.speaker_count is None or lang.speaker_count < min_speakers:
-                    continue
-            
-            if max_speakers is not None:
-                if lang.speaker_count is not None and lang.speaker_count > max_speakers:
-                    continue
-            
-            results.append(lang)
+            res_bits = self._posting("by_resource", resource_level)
+            if res_bits:
+                candidates &= res_bits
         
-        # Sort
-        results = self._sort_results(results, sort_by)
+        if data_source:
+            candidates &= self._posting("by_data_source", data_source)
         
-        if limit:
-            results = results[:limit]
+        if min_speakers is not None or max_speakers is not None:
+            candidates &= self._speaker_range(min_speakers, max_speakers)
         
-        return results
+        return candidates
     
-    def _search_by_name(self, query: str) -> Set[str]:
+    def _search_by_name(self, query: str, fuzzy: bool = False, max_edits: int = 2) -> int:
         """Search by English or native name with fuzzy matching"""
         q_norm = _norm(query)
-        matches = set()
         
         # Exact matches
-        matches.update(self._indices["by_name"].get(q_norm, []))
-        matches.update(self._indices["by_native"].get(q_norm, []))
+        matches = self._posting("by_name", q_norm) | self._posting("by_native", q_norm)
         
-        # Fuzzy: check if query is substring of any name
+        # Fuzzy: query is a substring of a name, or a name of the query.
+        # Names inside the query must be substantial, or a short name like
+        # "Ho" or "E" matches nearly every misspelling before typo lookup runs
         if not matches:
-            for name, codes in self._indices["by_name"].items():
-                if q_norm in name or name in q_norm:
-                    matches.update(codes)
-            
-            for name, codes in self._indices["by_native"].items():
-                if q_norm in name or name in q_norm:
-                    matches.update(codes)
+            min_contained = max(4, len(q_norm) // 2)
+            for index_name in ("by_name", "by_native"):
+                for name in self._ngram(index_name).matching(q_norm, min_contained):
+                    matches |= self._posting(index_name, name)
         
         # ISO3 fallback
         if not matches and len(query) == 3:
-            matches.update(self._indices["by_iso3"].get(query.lower(), []))
+            matches = self._posting("by_iso3", query.lower())
+        
+        # Typo tolerance: closest names within the edit budget
+        if not matches and fuzzy:
+            spell = self._speller()
+            if not 0 <= max_edits <= spell.max_edits:
+                raise ValueError(f"max_edits must be between 0 and {spell.max_edits}")
+            # one edit per three chars, so "ab" doesn't match every short name
+            budget = min(max_edits, len(q_norm) // 3)
+            for term in spell.lookup(q_norm, budget):
+                for index_name in self._NAME_INDICES:
+                    matches |= self._posting(index_name, term)
         
         return matches
     
-    def _search_by_country(self, query: str) -> Set[str]:
+    def _search_by_country(self, query: str) -> int:
         """Search by country code or name"""
-        matches = set()
+        matches = 0
         
         # Try as ISO2
         if len(query) == 2:
-            matches.update(self._indices["by_country"].get(query.upper(), []))
-            matches.update(self._indices["by_country"].get(query.lower(), []))
+            matches |= self._posting("by_country", query.upper())
+            matches |= self._posting("by_country", query.lower())
         
-        # Try as country name (fuzzy)
+        # Try as ISO3, alias or exact country name
         q_norm = _norm(query)
-        for code in self._languages.values():
-            for cname in code.country_names:
-                if q_norm in _norm(cname) or _norm(cname) in q_norm:
-                    matches.add(code.code)
+        matches |= self._country_bits(q_norm)
+        
+        # Partial country names
+        if not matches:
+            for cname in self._ngram("country").matching(q_norm):
+                matches |= self._country_bits(cname)
         
         return matches
     
-    def _search_by_region(self, query: str) -> Set[str]:
+    def _country_bits(self, cname: str) -> int:
+        """Languages of a normalized country name, ISO3 code or alias"""
+        bits = self._posting("by_country_name", cname)
+        iso2 = self._country_aliases.get(cname)
+        if iso2:
+            bits |= self._posting("by_country", iso2)
+        return bits
+    
+    def _search_by_region(self, query: str) -> int:
         """Search by region/state name"""
         q_norm = _norm(query)
-        matches = set()
         
         # Exact
-        matches.update(self._indices["by_region"].get(q_norm, []))
+        matches = self._posting("by_region", q_norm)
         
         # Fuzzy
         if not matches:
-            for region, codes in self._indices["by_region"].items():
-                if q_norm in region or region in q_norm:
-                    matches.update(codes)
+            for region in self._ngram("by_region").matching(q_norm):
+                matches |= self._posting("by_region", region)
         
         return matches
     
-    def _search_by_script(self, query: str) -> Set[str]:
+    def _search_by_script(self, query: str) -> int:
         """Search by script code or name"""
-        matches = set()
-        
         # Try as code
-        matches.update(self._indices["by_script"].get(query, []))
+        matches = self._posting("by_script", query)
         
         # Try as name
         q_norm = _norm(query)
-        matches.update(self._indices["by_script_name"].get(q_norm, []))
+        matches |= self._posting("by_script_name", q_norm)
         
         # Common aliases
         aliases = {
@@ -537,30 +1151,10 @@ class LanguageFinder:
             "bangla": "Beng",
         }
         if q_norm in aliases:
-            matches.update(self._indices["by_script"].get(aliases[q_norm], []))
+            matches |= self._posting("by_script", aliases[q_norm])
         
         return matches
     
-    def _sort_results(self, results: List[Language], sort_by: str) -> List[Language]:
-        """Sort results by specified criteria"""
-        if sort_by == "speakers":
-            return sorted(
-                results,
-                key=lambda x: (-x.speaker_count if x.speaker_count else -1, x.english_name)
-            )
-        elif sort_by == "name":
-            return sorted(results, key=lambda x: x.english_name)
-        elif sort_by == "resource":
-            order = {"high": 0, "medium": 1, "low": 2, "zero-shot": 3}
-            return sorted(
-                results,
-                key=lambda x: (order.get(x.resource_level, 99), -x.speaker_count if x.speaker_count else 0)
-            )
-        elif sort_by == "family":
-            return sorted(results, key=lambda x: (x.language_family or "ZZZ", x.english_name))
-        else:
-            return results
-    
     def browse_region(self, region: str) -> Dict[str, List[Language]]:
         """
         Browse languages by geographic region with hierarchy.
@@ -663,10 +1257,16 @@ class LanguageFinder:
     def _count_by(self, attr: str, top: int = None) -> List[Dict]:
         """Helper for statistics"""
         counts = {}
-        for lang in self._languages.values():
-            val = getattr(lang, attr, None)
-            if val:
-                counts[val] = counts.get(val, 0) + 1
+        if attr in self._columns:
+            values = self._categories[attr]
+            for c in self._columns[attr]:
+                counts[c] = counts.get(c, 0) + 1
+            counts = {values[c]: n for c, n in counts.items() if values[c]}
+        else:
+            for lang in self._languages.values():
+                val = getattr(lang, attr, None)
+                if val:
+                    counts[val] = counts.get(val, 0) + 1
         
         items = [{"value": k, "count": v} for k, v in counts.items()]
         items.sort(key=lambda x: -x["count"])
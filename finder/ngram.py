@@ -0,0 +1,91 @@
+"""
+Character n-gram index for substring lookups over index keys
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class NgramIndex:
+    """
+    Answers "which keys contain the query, or are contained in it?"
+    without scanning every key.
+
+    Every key is indexed under all of its 1..n character grams, so:
+    - query in key: intersect the posting lists of the query's n-grams
+      (or look the query up directly when it's n chars or shorter),
+      then verify the few surviving candidates
+    - key in query: probe every substring of the query against the key
+      table; a query has O(len²) substrings no matter how many keys exist
+    """
+
+    def __init__(self, keys: Iterable[str], n: int = 3):
+        self.n = n
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._max_len = 0
+
+        postings: Dict[str, Set[int]] = {}
+        for key in keys:
+            if key in self._ids:
+                continue
+            kid = len(self._keys)
+            self._keys.append(key)
+            self._ids[key] = kid
+            self._max_len = max(self._max_len, len(key))
+            for size in range(1, n + 1):
+                for i in range(len(key) - size + 1):
+                    postings.setdefault(key[i:i + size], set()).add(kid)
+        # tuples are a fraction of the size of sets once building is done
+        self._postings: Dict[str, Tuple[int, ...]] = {
+            gram: tuple(ids) for gram, ids in postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def containing(self, query: str) -> List[str]:
+        """Keys that contain `query` as a substring"""
+        if not query:
+            return list(self._keys)
+        if len(query) <= self.n:
+            return [self._keys[k] for k in self._postings.get(query, ())]
+
+        postings = []
+        for i in range(len(query) - self.n + 1):
+            posting = self._postings.get(query[i:i + self.n])
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return [self._keys[k] for k in candidates if query in self._keys[k]]
+
+    def contained_in(self, query: str, min_len: int = 1) -> List[str]:
+        """Keys of at least `min_len` chars that are substrings of `query`"""
+        found = []
+        seen: Set[int] = set()
+        for i in range(len(query)):
+            for j in range(i + min_len, min(len(query), i + self._max_len) + 1):
+                kid = self._ids.get(query[i:j])
+                if kid is not None and kid not in seen:
+                    seen.add(kid)
+                    found.append(self._keys[kid])
+        return found
+
+    def matching(self, query: str, min_contained: int = 1) -> List[str]:
+        """
+        Keys k with `query in k or k in query`; keys inside the query must
+        be at least `min_contained` chars (a 2-letter name is inside most
+        misspellings)
+        """
+        found = self.containing(query)
+        if not found:
+            return self.contained_in(query, min_contained)
+        seen = set(found)
+        found.extend(k for k in self.contained_in(query, min_contained) if k not in seen)
+        return found
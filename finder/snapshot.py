@@ -0,0 +1,440 @@
+"""
+Memory-mapped binary snapshot of the language database and its indices
+
+Layout (little-endian, sections 8-byte aligned):
+
+    header      magic, format version, language count, section count,
+                SHA-256 of everything after the header
+    sections    name -> (offset, length) table, then the sections:
+      meta        JSON: source checksum, data path, index schema, ...
+      strings     u32 count, u32 offsets[count + 1], UTF-8 blob
+      records     fixed-width Language records (RECORD)
+      lists       u32 string ids referenced by records' list fields
+      index.*     u32 key count, (key, offset, count) u32 triples sorted
+                  by key, then u32 posting lists of dense ids
+      array.*     raw array() data; typecodes are listed in meta
+
+Opening a snapshot maps the file and reads the header, section table and
+meta, and checks the layout they describe (section bounds, alignment and
+overlap, total file size, record and string table lengths), so a
+truncated or padded file is rejected without reading the body. The full
+SHA-256 check reads every page and is opt-in (verify=True). Records are
+decoded on first access and postings/arrays are used
+in place, so startup doesn't grow with the database and processes
+opening the same file share its pages through the OS page cache.
+"""
+from __future__ import annotations
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+MAGIC = b"OMNIFND\0"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sIII32s")     # magic, version, languages, sections, sha256
+_SECTION = struct.Struct("<32sQQ")       # name, offset, length
+_NONE = 0xFFFFFFFF                       # string id for None
+
+STR_FIELDS = (
+    "code", "iso_639_3", "script_code", "english_name", "native_name",
+    "autonym", "language_family", "script_name", "writing_direction",
+    "speaker_count_source", "resource_level", "data_source",
+    "wikipedia_code", "glottolog_code",
+)
+LIST_FIELDS = ("countries", "country_names", "regions", "related_languages")
+
+# string ids, speaker count, lat, lon, flags, (offset, count) per list field
+RECORD = struct.Struct("<%dIqddI%dI4x" % (len(STR_FIELDS), 2 * len(LIST_FIELDS)))
+_HAS_SPEAKERS = 1
+_HAS_COORDS = 2
+
+
+class SnapshotError(ValueError):
+    """Snapshot file is missing, corrupt or from an incompatible version"""
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+# ==================== Writer ====================
+
+class _StringTable:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def add(self, s: Optional[str]) -> int:
+        if s is None:
+            return _NONE
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = self.ids[s] = len(self.values)
+            self.values.append(s)
+        return sid
+
+    def encode(self) -> bytes:
+        blob = bytearray()
+        offsets = array("I", [0])
+        for s in self.values:
+            blob += s.encode("utf-8")
+            offsets.append(len(blob))
+        return struct.pack("<I", len(self.values)) + offsets.tobytes() + bytes(blob)
+
+
+def _encode_index(postings: Dict[str, Sequence[int]], strings: _StringTable) -> bytes:
+    entries = array("I")
+    ids = array("I")
+    for key in sorted(postings):
+        entries.extend((strings.add(key), len(ids), len(postings[key])))
+        ids.extend(postings[key])
+    return struct.pack("<I", len(postings)) + entries.tobytes() + ids.tobytes()
+
+
+def write_snapshot(
+    path: Path,
+    languages: Sequence[Any],
+    indices: Dict[str, Dict[str, Sequence[int]]],
+    arrays: Dict[str, array],
+    meta: Dict[str, Any],
+) -> Path:
+    """
+    Write a snapshot atomically.
+
+    Args:
+        languages: Language objects in dense-id order
+        indices: index name -> key -> dense ids
+        arrays: named arrays stored verbatim (e.g. sort permutations)
+        meta: extra JSON-serializable metadata
+    """
+    path = Path(path)
+    strings = _StringTable()
+    records = bytearray()
+    lists = array("I")
+    list_pool: Dict[Tuple[str, ...], int] = {}
+
+    for lang in languages:
+        refs = []
+        for name in LIST_FIELDS:
+            values = tuple(getattr(lang, name) or ())
+            offset = list_pool.get(values)
+            if offset is None:
+                offset = list_pool[values] = len(lists)
+                lists.extend(strings.add(v) for v in values)
+            refs.extend((offset, len(values)))
+
+        flags = 0
+        speakers = 0
+        if lang.speaker_count is not None:
+            flags |= _HAS_SPEAKERS
+            speakers = int(lang.speaker_count)
+        lat = lon = float("nan")
+        if lang.coordinates:
+            flags |= _HAS_COORDS
+            lat = float(lang.coordinates.get("lat", lat))
+            lon = float(lang.coordinates.get("lon") if lang.coordinates.get("lon") is not None else lon)
+
+        records += RECORD.pack(
+            *(strings.add(getattr(lang, name)) for name in STR_FIELDS),
+            speakers, lat, lon, flags, *refs,
+        )
+
+    sections: Dict[str, bytes] = {}
+    all_indices = dict(indices)
+    all_indices["code"] = {lang.code: [i] for i, lang in enumerate(languages)}
+    for name, postings in all_indices.items():
+        sections[f"index.{name}"] = _encode_index(postings, strings)
+    for name, values in arrays.items():
+        sections[f"array.{name}"] = values.tobytes()
+    sections["records"] = bytes(records)
+    sections["lists"] = lists.tobytes()
+    sections["strings"] = strings.encode()
+    sections["meta"] = json.dumps({
+        **meta,
+        "indices": sorted(indices),
+        "arrays": {name: values.typecode for name, values in arrays.items()},
+    }, ensure_ascii=False).encode("utf-8")
+
+    table_size = _HEADER.size + _SECTION.size * len(sections)
+    offset = _align(table_size)
+    table = bytearray()
+    body = bytearray(offset - _HEADER.size)
+    for name, data in sections.items():
+        table += _SECTION.pack(name.encode("utf-8"), offset, len(data))
+        body += data + bytes(_align(len(data)) - len(data))
+        offset += _align(len(data))
+    body[:len(table)] = table
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(languages), len(sections),
+                          hashlib.sha256(body).digest())
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+    return path
+
+
+# ==================== Reader ====================
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file"""
+
+    def __init__(self, path: Path, verify: bool = False):
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"Cannot open snapshot {self.path}: {e}") from e
+
+        if len(self._mm) < _HEADER.size:
+            raise SnapshotError(f"{self.path} is not a finder snapshot")
+        magic, version, count, nsections, digest = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError(f"{self.path} is not a finder snapshot")
+        if version != FORMAT_VERSION:
+            raise SnapshotError(
+                f"{self.path} has snapshot format {version}, expected {FORMAT_VERSION}; recompile it"
+            )
+        self.count = count
+        self._digest = digest
+        self._view = memoryview(self._mm)
+
+        table_end = _HEADER.size + nsections * _SECTION.size
+        if table_end > len(self._mm):
+            raise SnapshotError(f"{self.path} is truncated")
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        for k in range(nsections):
+            name, offset, length = _SECTION.unpack_from(self._mm, _HEADER.size + k * _SECTION.size)
+            self._sections[name.rstrip(b"\0").decode("utf-8", "replace")] = (offset, length)
+        self._check_layout(table_end)
+
+        if verify:
+            self.verify()
+
+        try:
+            self.meta: Dict[str, Any] = json.loads(bytes(self._section("meta")))
+        except ValueError as e:
+            raise SnapshotError(f"{self.path} has unreadable metadata; recompile it") from e
+
+        strings = self._section("strings")
+        (nstrings,) = struct.unpack_from("<I", strings, 0) if len(strings) >= 4 else (None,)
+        if nstrings is None or 4 + 4 * (nstrings + 1) > len(strings):
+            raise SnapshotError(f"{self.path} has a corrupt string table; recompile it")
+        self._string_offsets = strings[4:4 + 4 * (nstrings + 1)].cast("I")
+        self._string_blob = strings[4 + 4 * (nstrings + 1):]
+        if self._string_offsets[-1] != len(self._string_blob):
+            raise SnapshotError(f"{self.path} has a corrupt string table; recompile it")
+        self._strings: Dict[int, str] = {}
+
+        self._records = self._section("records")
+        if len(self._records) != count * RECORD.size:
+            raise SnapshotError(f"{self.path} has {len(self._records)} record bytes for {count} languages")
+        self._lists = self._section("lists").cast("I")
+        self._tuples: Dict[Tuple[int, int], Tuple[str, ...]] = {}
+
+    def _section(self, name: str) -> memoryview:
+        try:
+            offset, length = self._sections[name]
+        except KeyError:
+            raise SnapshotError(f"{self.path} has no '{name}' section") from None
+        return self._view[offset:offset + length]
+
+    def _check_layout(self, table_end: int):
+        """Sections are aligned, in bounds, don't overlap and end exactly at end of file"""
+        end = _align(table_end)
+        for name, (offset, length) in sorted(self._sections.items(), key=lambda kv: kv[1]):
+            if offset % 8 or offset < end:
+                raise SnapshotError(f"{self.path} has a corrupt section table ('{name}')")
+            if offset + length > len(self._mm):
+                raise SnapshotError(f"{self.path} is truncated")
+            end = offset + _align(length)
+        if end != len(self._mm):
+            raise SnapshotError(f"{self.path} is {len(self._mm)} bytes, its sections end at {end}; recompile it")
+        for name in ("meta", "strings", "records", "lists"):
+            self._section(name)
+
+    def verify(self):
+        """Check the body checksum; raises SnapshotError on mismatch"""
+        if hashlib.sha256(self._view[_HEADER.size:]).digest() != self._digest:
+            raise SnapshotError(f"{self.path} failed its checksum; recompile it")
+
+    def string(self, sid: int) -> Optional[str]:
+        if sid == _NONE:
+            return None
+        s = self._strings.get(sid)
+        if s is None:
+            start, end = self._string_offsets[sid], self._string_offsets[sid + 1]
+            s = self._strings[sid] = str(self._string_blob[start:end], "utf-8")
+        return s
+
+    def _tuple(self, offset: int, count: int) -> Tuple[str, ...]:
+        t = self._tuples.get((offset, count))
+        if t is None:
+            t = tuple(self.string(sid) for sid in self._lists[offset:offset + count])
+            self._tuples[(offset, count)] = t
+        return t
+
+    def record(self, i: int) -> Dict[str, Any]:
+        """Decode the fields of record i (Language constructor kwargs)"""
+        values = RECORD.unpack_from(self._records, i * RECORD.size)
+        n = len(STR_FIELDS)
+        fields: Dict[str, Any] = {
+            name: self.string(sid) for name, sid in zip(STR_FIELDS, values[:n])
+        }
+        speakers, lat, lon, flags = values[n:n + 4]
+        refs = values[n + 4:]
+        for k, name in enumerate(LIST_FIELDS):
+            fields[name] = self._tuple(refs[2 * k], refs[2 * k + 1])
+        fields["speaker_count"] = speakers if flags & _HAS_SPEAKERS else None
+        fields["coordinates"] = {"lat": lat, "lon": lon} if flags & _HAS_COORDS else None
+        return fields
+
+    def code(self, i: int) -> str:
+        (sid,) = struct.unpack_from("<I", self._records, i * RECORD.size)
+        return self.string(sid)
+
+    def index(self, name: str) -> "SnapshotIndex":
+        return SnapshotIndex(self, self._section(f"index.{name}"))
+
+    def array(self, name: str) -> memoryview:
+        """Stored array as a zero-copy memoryview"""
+        return self._section(f"array.{name}").cast(self.meta["arrays"][name])
+
+
+class SnapshotIndex(Mapping):
+    """
+    One index of a snapshot: key -> [codes], like the dict indices built
+    from languages.json, plus ids() for the raw dense-id posting list.
+    """
+
+    def __init__(self, snapshot: Snapshot, section: memoryview):
+        self._snap = snapshot
+        (self._count,) = struct.unpack_from("<I", section, 0)
+        self._entries = section[4:4 + 12 * self._count].cast("I")
+        self._postings = section[4 + 12 * self._count:].cast("I")
+
+    def _find(self, key: str) -> int:
+        """Entry number of key (binary search over sorted keys), or -1"""
+        lo, hi = 0, self._count
+        string = self._snap.string
+        entries = self._entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            probe = string(entries[3 * mid])
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def ids(self, key: str) -> Sequence[int]:
+        """Dense ids under key (empty if absent)"""
+        k = self._find(key) if isinstance(key, str) else -1
+        if k < 0:
+            return ()
+        offset, count = self._entries[3 * k + 1], self._entries[3 * k + 2]
+        return self._postings[offset:offset + count]
+
+    def __getitem__(self, key: str) -> List[str]:
+        ids = self.ids(key)
+        if not ids:
+            raise KeyError(key)
+        return [self._snap.code(i) for i in ids]
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        string = self._snap.string
+        for k in range(self._count):
+            yield string(self._entries[3 * k])
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class SnapshotRecords(Mapping):
+    """code -> Language, decoding each record on first access"""
+
+    def __init__(self, snapshot: Snapshot, factory: Callable[[Dict[str, Any]], Any]):
+        self._snap = snapshot
+        self._factory = factory
+        self._codes = snapshot.index("code")
+        self._decoded: List[Any] = [None] * snapshot.count
+        self.by_id = _ById(self)
+        self.ids = _CodeIds(self._codes)
+
+    def at(self, i: int):
+        lang = self._decoded[i]
+        if lang is None:
+            lang = self._decoded[i] = self._factory(self._snap.record(i))
+        return lang
+
+    def __getitem__(self, code: str):
+        ids = self._codes.ids(code)
+        if not ids:
+            raise KeyError(code)
+        return self.at(ids[0])
+
+    def __contains__(self, code) -> bool:
+        return code in self._codes
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._snap.code(i) for i in range(len(self)))
+
+    def __len__(self) -> int:
+        return self._snap.count
+
+    def values(self) -> List[Any]:
+        return [self.at(i) for i in range(len(self))]
+
+
+class _ById(Sequence):
+    """dense id -> Language view over SnapshotRecords"""
+
+    def __init__(self, records: SnapshotRecords):
+        self._records = records
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._records.at(k) for k in range(*i.indices(len(self)))]
+        return self._records.at(i)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class _CodeIds(Mapping):
+    """code -> dense id view over the snapshot's code index"""
+
+    def __init__(self, codes: SnapshotIndex):
+        self._codes = codes
+
+    def __getitem__(self, code: str) -> int:
+        ids = self._codes.ids(code)
+        if not ids:
+            raise KeyError(code)
+        return ids[0]
+
+    def __contains__(self, code) -> bool:
+        return code in self._codes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._codes)
+
+    def __len__(self) -> int:
+        return len(self._codes)
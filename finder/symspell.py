@@ -0,0 +1,112 @@
+"""
+Typo-tolerant term lookup (SymSpell symmetric-delete algorithm)
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Damerau-Levenshtein (optimal string alignment) distance between a and b,
+    or None as soon as it is known to exceed max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d = min(d, prev2[j - 2] + 1)
+            cur[j] = d
+            row_min = min(row_min, d)
+        if row_min > max_distance:
+            return None
+        prev2, prev = prev, cur
+
+    return prev[-1] if prev[-1] <= max_distance else None
+
+
+def _deletes(term: str, max_edits: int) -> Set[str]:
+    """All strings reachable from term by deleting up to max_edits chars"""
+    out = {term}
+    frontier = {term}
+    for _ in range(max_edits):
+        nxt = set()
+        for s in frontier:
+            for i in range(len(s)):
+                nxt.add(s[:i] + s[i + 1:])
+        nxt -= out
+        out |= nxt
+        frontier = nxt
+    return out
+
+
+class SymSpellIndex:
+    """
+    Bounded edit-distance lookup over a fixed set of terms.
+
+    At build time every term's prefix is expanded into its deletion
+    neighbourhood (up to max_edits deletes). Two strings within distance k
+    share at least one such delete, so a lookup only expands the query's
+    own deletes and verifies the handful of terms they hit, instead of
+    computing a distance against every term.
+    """
+
+    def __init__(self, terms: Iterable[str], max_edits: int = 2, prefix_length: int = 7):
+        self.max_edits = max_edits
+        self.prefix_length = prefix_length
+        self._terms: List[str] = []
+
+        deletes: Dict[str, List[int]] = {}
+        seen: Set[str] = set()
+        for term in terms:
+            if not term or term in seen:
+                continue
+            seen.add(term)
+            tid = len(self._terms)
+            self._terms.append(term)
+            for d in _deletes(term[:prefix_length], max_edits):
+                deletes.setdefault(d, []).append(tid)
+        self._deletes: Dict[str, Tuple[int, ...]] = {d: tuple(t) for d, t in deletes.items()}
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def lookup(self, query: str, max_edits: Optional[int] = None) -> List[str]:
+        """
+        Terms closest to `query` within max_edits, all at the same (minimal)
+        distance. Empty list if nothing is close enough.
+        """
+        if max_edits is None:
+            max_edits = self.max_edits
+        if not 0 <= max_edits <= self.max_edits:
+            raise ValueError(f"max_edits must be between 0 and {self.max_edits}")
+        if not query:
+            return []
+
+        best = max_edits
+        found: List[str] = []
+        checked: Set[int] = set()
+        for d in _deletes(query[:self.prefix_length], max_edits):
+            for tid in self._deletes.get(d, ()):
+                if tid in checked:
+                    continue
+                checked.add(tid)
+                term = self._terms[tid]
+                dist = edit_distance(query, term, best)
+                if dist is None:
+                    continue
+                if dist < best:
+                    best = dist
+                    found = [term]
+                elif dist == best:
+                    found.append(term)
+        return found
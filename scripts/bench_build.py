@@ -0,0 +1,406 @@
+# scripts/bench_build.py
+"""
+End-to-end build benchmark against a simulated Wikidata/Glottolog.
+
+Each scenario (dataset size x failure rate) runs scripts.build_incremental
+in a scratch directory with synthetic sources, pointed (--endpoint) at a
+local MockServer that fabricates deterministic SPARQL/Glottolog answers
+with the configured latency, jitter and injected 429/5xx/timeouts.
+
+    python -m scripts.bench_build --sizes 100,500 --failure-rates 0,0.05
+    python -m scripts.bench_build --save-baseline          # store as the new baseline
+    python -m scripts.bench_build -- --batch-size 50 --concurrency 4   # extra build args
+
+Reports languages/sec, per-stage p50/p95/p99, request counts, cache hit
+ratio and bytes transferred; writes JSON (--output) and compares it to
+the stored baseline (exit status 1 on a regression beyond --tolerance).
+"""
+from __future__ import annotations
+import argparse, asyncio, contextlib, io, itertools, json, os, platform, re, string, sys, tempfile, time, zlib
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import parse_qs
+
+REPO = Path(__file__).resolve().parent.parent
+BASELINE_PATH = REPO / "benchmarks" / "build_baseline.json"
+OUTPUT_PATH = REPO / "benchmarks" / "build_latest.json"
+
+# Stage p95 changes smaller than this are noise, whatever the ratio
+MIN_DELTA_S = 0.010
+
+# How a scenario's failure rate is split across fault kinds
+FAULT_MIX = {"p429": 0.5, "p5xx": 0.4, "ptimeout": 0.1}
+
+COUNTRIES = [("IN", "India"), ("NP", "Nepal"), ("PK", "Pakistan"), ("BD", "Bangladesh"),
+             ("NG", "Nigeria"), ("ID", "Indonesia"), ("BR", "Brazil"), ("US", "United States")]
+REGIONS = [f"Region {n}" for n in range(97)]
+FAMILIES = ["Indo-European", "Dravidian", "Sino-Tibetan", "Austronesian", "Niger–Congo", "Afroasiatic"]
+_VALUES = re.compile(r"VALUES\s+\?iso\s*\{([^}]*)\}")
+_SELECT = re.compile(r"SELECT(.*?)WHERE", re.S)
+
+
+# ---------- synthetic world ----------
+
+def synthetic_codes(n: int) -> List[str]:
+    letters = string.ascii_lowercase
+    return [f"{''.join(t)}_Latn" for t in itertools.islice(itertools.product(letters, repeat=3), n)]
+
+
+def write_sources(root: Path, codes: List[str]):
+    """ISO 639-3 tables for the synthetic codes (so merges find a Ref_Name)"""
+    iso = root / "sources" / "iso"
+    iso.mkdir(parents=True, exist_ok=True)
+    iso3s = [c.split("_")[0] for c in codes]
+    core = ["Id\tPart2b\tPart2t\tPart1\tScope\tLanguage_Type\tRef_Name\tComment"]
+    core += [f"{c}\t\t\t\tI\tL\t{c.title()} language\t" for c in iso3s]
+    names = ["Id\tPrint_Name\tInverted_Name"] + [f"{c}\t{c.title()} language\t{c.title()} language" for c in iso3s]
+    (iso / "iso-639-3.tab").write_text("\r\n".join(core) + "\r\n", encoding="utf-8")
+    (iso / "iso-639-3_Name_Index.tab").write_text("\r\n".join(names) + "\r\n", encoding="utf-8")
+
+
+def _h(code: str) -> int:
+    return zlib.crc32(code.encode())
+
+
+def _lit(v) -> dict:
+    return {"type": "literal", "value": str(v)}
+
+
+def _uri(v) -> dict:
+    return {"type": "uri", "value": v}
+
+
+def _core_rows(iso: str) -> List[Dict[str, dict]]:
+    """One row per (autonym, script), like the un-grouped query returns"""
+    h = _h(iso)
+    base = {
+        "iso": _lit(iso),
+        "lang": _uri(f"http://www.wikidata.org/entity/Q{h % 10**7}"),
+        "speakers": _lit(h % 20_000_000),
+        "glotto": _lit(f"{iso}{h % 9000 + 1000}"),
+        "wp": _lit(f"{iso.title()} language"),
+    }
+    autonyms = [f"{iso.title()}ish", f"{iso.upper()} bhasha"][:1 + h % 2]
+    scripts = ["Q8229", "Q38592", "Q8201"][:1 + (h >> 4) % 3]
+    return [{**base, "autonym": _lit(a), "script": _uri(f"http://www.wikidata.org/entity/{sc}")}
+            for a in autonyms for sc in scripts]
+
+
+def _core_aggregate(iso: str) -> Dict[str, dict]:
+    """The GROUP BY form of _core_rows: one row, multi-valued fields concatenated"""
+    from extractor.wikidata import AGG_SEP
+    rows = _core_rows(iso)
+    first = rows[0]
+
+    def concat(key: str) -> dict:
+        return _lit(AGG_SEP.join(dict.fromkeys(r[key]["value"] for r in rows)))
+
+    return {"iso": first["iso"], "item": first["lang"], "autonyms": concat("autonym"),
+            "maxSpeakers": first["speakers"], "glottocode": first["glotto"],
+            "scripts": concat("script"), "article": first["wp"]}
+
+
+def _entity(label: str) -> str:
+    return f"Q{_h(label)}"
+
+
+def _geo_rows(iso: str) -> List[Dict[str, dict]]:
+    """IDs and ISO codes only, like the label-free geo query"""
+    h = _h(iso)
+    countries = [COUNTRIES[(h >> (3 * i)) % len(COUNTRIES)][0] for i in range(1 + h % 3)]
+    regions = [REGIONS[(h >> (5 * j)) % len(REGIONS)] for j in range(h % 4)]
+    rows = []
+    for cc in dict.fromkeys(countries):
+        base = {"iso": _lit(iso), "country": _uri(f"http://www.wikidata.org/entity/{_entity(cc)}"),
+                "countryCode": _lit(cc)}
+        for r in regions or [None]:
+            row = dict(base)
+            if r:
+                row["adm1"] = _uri(f"http://www.wikidata.org/entity/{_entity(r)}")
+            rows.append(row)
+    return rows
+
+
+def _label_rows(query: str) -> List[Dict[str, dict]]:
+    """English labels for a QID label lookup (every synthetic country and region has one)"""
+    labels = {_entity(cc): name for cc, name in COUNTRIES}
+    labels.update((_entity(r), r) for r in REGIONS)
+    return [{"item": _uri(f"http://www.wikidata.org/entity/{q}"), "label": {**_lit(labels[q]), "xml:lang": "en"}}
+            for q in re.findall(r"wd:(Q\d+)", query) if q in labels]
+
+
+def sparql_answer(query: str) -> dict:
+    """Bindings for the selected variables of a core, geo or label query"""
+    values = _VALUES.search(query)
+    codes = re.findall(r'"([^"]+)"', values.group(1)) if values else []
+    select = _SELECT.search(query)
+    wanted = set(re.findall(r"\?(\w+)", select.group(1))) if select else set()
+    if "rdfs:label" in query:
+        return {"head": {"vars": ["item", "label"]}, "results": {"bindings": _label_rows(query)}}
+    geo = "countryCode" in wanted
+    grouped = "GROUP BY" in query
+    bindings = []
+    for iso in codes:
+        rows = _geo_rows(iso) if geo else [_core_aggregate(iso)] if grouped else _core_rows(iso)
+        for row in rows:
+            bindings.append({k: v for k, v in row.items() if k in wanted})
+    return {"head": {"vars": sorted(wanted)}, "results": {"bindings": bindings}}
+
+
+def glottolog_answer(code: str) -> dict:
+    h = _h(code)
+    return {
+        "id": code,
+        "name": f"Languoid {code}",
+        "latitude": (h % 18000) / 100 - 90,
+        "longitude": (h % 36000) / 100 - 180,
+        "classification": [{"id": f"fam{h % 6}", "name": FAMILIES[h % len(FAMILIES)]},
+                           {"id": f"sub{h % 40}", "name": f"Branch {h % 40}"}],
+    }
+
+
+def synthetic_handler(method: str, url: str, body: bytes):
+    if "glottolog" in url:
+        code = url.rsplit("/", 1)[-1].split(".")[0]
+        return 200, {"Content-Type": "application/json"}, json.dumps(glottolog_answer(code)).encode()
+    if "sparql" in url:
+        query = parse_qs(body.decode("utf-8")).get("query", [""])[0]
+        return (200, {"Content-Type": "application/sparql-results+json"},
+                json.dumps(sparql_answer(query)).encode())
+    return None
+
+
+# ---------- measurement ----------
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class StageTimer:
+    """Wraps the build's stage functions to collect per-call durations"""
+
+    STAGES = {"core": "fetch_core_stage", "geo": "_fetch_geo_stage", "glottolog": "for_glottocodes",
+              "enrich": "enrich_stage", "merge": "merge_batch"}
+
+    def __init__(self, module):
+        self.module = module
+        self.samples: Dict[str, List[float]] = {name: [] for name in [*self.STAGES, "batch"]}
+        self._saved: Dict[str, object] = {}
+
+    def __enter__(self):
+        for stage, attr in self.STAGES.items():
+            fn = self._saved[attr] = getattr(self.module, attr)
+            setattr(self.module, attr, self._wrap(stage, fn))
+        run_pipeline = self._saved["run_pipeline"] = self.module.run_pipeline
+        samples = self.samples["batch"]
+
+        async def timed_pipeline(*args, **kwargs):
+            async for item in run_pipeline(*args, **kwargs):
+                if item[0] == "ok":
+                    samples.append(item[4])
+                yield item
+        self.module.run_pipeline = timed_pipeline
+        return self
+
+    def __exit__(self, *exc):
+        for attr, fn in self._saved.items():
+            setattr(self.module, attr, fn)
+
+    def _wrap(self, stage: str, fn):
+        samples = self.samples[stage]
+        if asyncio.iscoroutinefunction(fn):
+            async def timed(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - t0)
+        else:
+            def timed(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - t0)
+        return timed
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {"n": len(v), "p50_s": round(percentile(v, 0.50), 4),
+                    "p95_s": round(percentile(v, 0.95), 4), "p99_s": round(percentile(v, 0.99), 4)}
+            for stage, v in self.samples.items() if v
+        }
+
+
+async def run_scenario(size: int, failure_rate: float, args, build_args: List[str]) -> dict:
+    from extractor.mock_server import MockServer
+    from extractor.ratelimit import LIMITER
+    import scripts.build_incremental as build
+
+    codes = synthetic_codes(size)
+    faults = {k: failure_rate * share for k, share in FAULT_MIX.items()}
+    LIMITER.reset()
+    with tempfile.TemporaryDirectory(prefix="omnifinder-bench-") as tmp:
+        root = Path(tmp)
+        write_sources(root, codes)
+        cwd = os.getcwd()
+        os.chdir(root)  # the build uses relative data/, sources/ paths
+        saved_codes = build.load_supported_codes
+        build.load_supported_codes = lambda: list(codes)
+        try:
+            async with MockServer(handler=synthetic_handler, latency=args.latency, jitter=args.jitter,
+                                  retry_after=args.retry_after, hang=args.hang, seed=args.seed,
+                                  **faults) as server:
+                argv = ["--scripts", "Latn", "--out", str(root / "data" / "languages.json"),
+                        "--endpoint", server.url, "--http-cache", str(root / "cache" / "http.sqlite"),
+                        "--wikidata-rate", str(args.wikidata_rate), *build_args]
+                out = io.StringIO()
+                with StageTimer(build) as timer:
+                    t0 = time.perf_counter()
+                    with contextlib.redirect_stdout(sys.stdout if args.verbose else out):
+                        summary = await build.main(argv)
+                    wall = time.perf_counter() - t0
+                served = server.stats()
+        finally:
+            if build.orchestrator.HTTP_CACHE is not None:
+                build.orchestrator.HTTP_CACHE.close()
+            build.load_supported_codes = saved_codes
+            os.chdir(cwd)
+
+    summary = summary or {}
+    cache = summary.get("http_cache") or {"hits": 0, "misses": 0}
+    lookups = cache["hits"] + cache["misses"]
+    session = summary.get("session") or {}
+    built = summary.get("built", 0)
+    return {
+        "size": size,
+        "failure_rate": failure_rate,
+        "wall_s": round(wall, 3),
+        "languages": built,
+        "languages_per_s": round(built / wall, 3) if wall else 0.0,
+        "failed_batches": summary.get("failed_batches", 0),
+        "stages": timer.report(),
+        "requests": {
+            "client": session.get("requests", 0),
+            "connections": session.get("connections", 0),
+            "server": served["requests"],
+            "statuses": {str(k): v for k, v in served["statuses"].items()},
+            "injected": served["injected"],
+        },
+        "cache": {**cache, "hit_ratio": round(cache["hits"] / lookups, 4) if lookups else 0.0},
+        "bytes": {"sent": served["bytes_sent"], "wire": session.get("bytes_wire", 0),
+                  "decoded": session.get("bytes_decoded", 0)},
+    }
+
+
+# ---------- baseline comparison ----------
+
+def scenario_key(s: dict) -> str:
+    return f"{s['size']}@{s['failure_rate']:g}"
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Human-readable regressions (throughput down or batch p95 up by more than `tolerance`)"""
+    base = {scenario_key(s): s for s in baseline.get("scenarios", [])}
+    problems = []
+    for s in results["scenarios"]:
+        b = base.get(scenario_key(s))
+        if b is None:
+            continue
+        if b["languages_per_s"] and s["languages_per_s"] < b["languages_per_s"] * (1 - tolerance):
+            problems.append(f"{scenario_key(s)}: {s['languages_per_s']:.2f} lang/s "
+                            f"vs baseline {b['languages_per_s']:.2f}")
+        for stage, st in s["stages"].items():
+            bst = b.get("stages", {}).get(stage)
+            if (bst and st["p95_s"] > bst["p95_s"] * (1 + tolerance)
+                    and st["p95_s"] - bst["p95_s"] > MIN_DELTA_S):
+                problems.append(f"{scenario_key(s)}: {stage} p95 {st['p95_s']:.3f}s "
+                                f"vs baseline {bst['p95_s']:.3f}s")
+    return problems
+
+
+def print_scenario(s: dict):
+    r, c, b = s["requests"], s["cache"], s["bytes"]
+    print(f"\n⏱️  {s['size']} languages, {s['failure_rate']:.0%} failures: "
+          f"{s['languages']} built in {s['wall_s']:.1f}s → {s['languages_per_s']:.1f} lang/s"
+          f" ({s['failed_batches']} failed batches)")
+    print(f"   Requests: {r['client']} client / {r['server']} served over {r['connections']} connections, "
+          f"statuses {r['statuses']}, injected {r['injected']}")
+    print(f"   Cache: {c['hits']} hits / {c['misses']} misses ({c['hit_ratio']:.0%})   "
+          f"Bytes: {b['sent']:,} sent, {b['decoded']:,} decoded")
+    for stage, st in s["stages"].items():
+        print(f"   • {stage:10} n={st['n']:<5} p50 {st['p50_s']*1000:8.1f}ms  "
+              f"p95 {st['p95_s']*1000:8.1f}ms  p99 {st['p99_s']*1000:8.1f}ms")
+
+
+def main():
+    argv = sys.argv[1:]
+    build_args: List[str] = []
+    if "--" in argv:
+        i = argv.index("--")
+        argv, build_args = argv[:i], argv[i + 1:]
+
+    ap = argparse.ArgumentParser(description="Benchmark build_incremental against a simulated endpoint")
+    ap.add_argument("--sizes", type=str, default="100,500", help="Comma-separated dataset sizes")
+    ap.add_argument("--failure-rates", type=str, default="0,0.05",
+                    help=f"Comma-separated fault probabilities per request (split {FAULT_MIX})")
+    ap.add_argument("--latency", type=float, default=0.05, help="Simulated server latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.05, help="Extra uniform jitter (s)")
+    ap.add_argument("--retry-after", type=float, default=0.5, help="Retry-After sent with 429s")
+    ap.add_argument("--hang", type=float, default=2.0, help="Seconds an injected timeout hangs")
+    ap.add_argument("--wikidata-rate", type=float, default=50.0,
+                    help="Starting SPARQL rate (the stand-in has no real limit)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--output", type=str, default=str(OUTPUT_PATH), help="Write results JSON here")
+    ap.add_argument("--baseline", type=str, default=str(BASELINE_PATH))
+    ap.add_argument("--save-baseline", action="store_true", help="Also store results as the baseline")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression (fraction)")
+    ap.add_argument("--verbose", action="store_true", help="Show build output")
+    args = ap.parse_args(argv)
+
+    sys.path.insert(0, str(REPO))
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    rates = [float(x) for x in args.failure_rates.split(",") if x.strip()]
+
+    results = {
+        "created": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "save_baseline", "verbose")},
+        "build_args": build_args,
+        "scenarios": [],
+    }
+    for size in sizes:
+        for rate in rates:
+            s = asyncio.run(run_scenario(size, rate, args, build_args))
+            results["scenarios"].append(s)
+            print_scenario(s)
+
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results written to {out}")
+
+    baseline_path = Path(args.baseline)
+    status = 0
+    if baseline_path.exists() and not args.save_baseline:
+        problems = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+        if problems:
+            print(f"\n❌ {len(problems)} regression(s) vs {baseline_path} (tolerance {args.tolerance:.0%}):")
+            for p in problems:
+                print(f"   • {p}")
+            status = 1
+        else:
+            print(f"\n✅ No regressions vs {baseline_path} (tolerance {args.tolerance:.0%})")
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"📌 Baseline saved to {baseline_path}")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
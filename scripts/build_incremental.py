@@ -2,23 +2,37 @@
 from __future__ import annotations
 import asyncio, json, argparse, time
 from pathlib import Path
-from typing import List, Dict, Tuple, Set
+from typing import AsyncIterator, List, Dict, Tuple, Set
 
 from extractor.supported import load_supported_codes
 from extractor.iso_cldr import load_iso_tables
 from extractor.wikidata import fetch_batch as wd_fetch, fetch_geo_batch
-from extractor.glottolog import for_glottocodes
+from extractor.glottolog import (
+    for_glottocodes, configure_limiter as configure_glottolog_limiter,
+    CONCURRENCY as GLOTTO_CONCURRENCY, RATE as GLOTTO_RATE,
+)
+from extractor import orchestrator
+from extractor.orchestrator import HttpSession, set_http_cache
+from extractor.fixtures import FixtureArchive
+from extractor.http_cache import HttpCache
+from extractor.ratelimit import LIMITER
+from extractor.journal import BuildJournal
+from extractor.staging import StagingArea
 from extractor.merge import (
     merge_language, val,
     _resource_level_from_speakers, _data_source_heuristic,
-    _related_by_family_geo_selfscript,
 )
-from extractor.profiler import get_profiler, time_block, checkpoint, print_summary, export_json as export_profile
+from extractor.related import RelatedIndex, compute_related
+from extractor.profiler import (
+    get_profiler, time_block, checkpoint, print_summary,
+    export_json as export_profile, export_chrome_trace,
+)
 
 OUT_PATH = Path("data/languages.json")
 PROGRESS_PATH = Path("data/progress.json")
 SKIPPED_PATH = Path("data/skipped.json")
 PROFILE_PATH = Path("data/profiling.json")
+TRACE_PATH = Path("data/profiling.trace.json")
 ISO_PATH = Path("sources/iso")
 CLDR_MAP = {"Deva": "Devanagari", "Latn": "Latin", "Arab": "Arabic"}
 
@@ -34,6 +48,19 @@ def load_existing(path: Path) -> Dict[str, dict]:
         return json.loads(path.read_text())
     return {}
 
+def journal_path(out_path: Path) -> Path:
+    """data/languages.json -> data/languages.journal.jsonl"""
+    return out_path.with_name(out_path.stem + ".journal.jsonl")
+
+def staging_path(out_path: Path) -> Path:
+    """data/languages.json -> data/languages.staging.jsonl"""
+    return out_path.with_name(out_path.stem + ".staging.jsonl")
+
+def apply_related(records: Dict[str, dict]):
+    """Global related-languages pass over a full record set (standalone --compact only)"""
+    for code, rel in compute_related(records).items():
+        records[code]["related_languages"] = rel
+
 def save_progress(done_codes: Set[str], total: int):
     PROGRESS_PATH.parent.mkdir(parents=True, exist_ok=True)
     data = {
@@ -88,49 +115,102 @@ def filter_by_scripts(codes: List[str], allowed_scripts: Set[str]|None) -> List[
             out.append(c)
     return out
 
-async def process_batch(batch_codes: List[str], iso_tables, batch_num: int, skip_geo: bool = False) -> Dict[str, dict]:
-    """Process a batch of language codes with detailed profiling"""
-    with time_block("process_batch", batch_num=batch_num, num_codes=len(batch_codes)):
-        # We may have multiple codes with same iso3 (different scripts/variants)
+def batch_iso3s(batch_codes: List[str]) -> List[str]:
+    # We may have multiple codes with same iso3 (different scripts/variants)
+    out = set()
+    for c in batch_codes:
+        try:
+            out.add(split_parts(c)[0])
+        except ValueError:
+            pass  # reported (and skipped) at merge
+    return sorted(out)
+
+async def fetch_core_stage(batch_codes: List[str], batch_num: int, client=None,
+                           staging: StagingArea | None = None) -> Tuple[List[str], Dict[str, dict]]:
+    """Stage 1: Wikidata core for a batch. Returns (iso3s, wd)"""
+    with time_block("stage_core", batch_num=batch_num, num_codes=len(batch_codes)):
         with time_block("extract_iso3_codes"):
-            iso3s = sorted({split_parts(c)[0] for c in batch_codes})
+            iso3s = batch_iso3s(batch_codes)
         checkpoint("iso3_codes_extracted", num_unique=len(iso3s), from_codes=len(batch_codes))
 
-        # Fetch wikidata core
-        print(f"  📡 Fetching Wikidata core for {len(iso3s)} ISO codes...")
-        with time_block("fetch_wikidata_core", num_iso3=len(iso3s)):
-            wd = await wd_fetch(iso3s)
-        checkpoint("wikidata_core_complete", results=len(wd), requested=len(iso3s))
-        
-        # Fetch geo (optional)
-        geo = {}
-        if skip_geo:
-            print(f"  ⏭️  Skipping geographic data (--skip-geo enabled)")
-            checkpoint("geo_data_skipped", reason="user_option")
-        else:
-            print(f"  🌍 Fetching geographic data...")
-            with time_block("fetch_geo_data", num_iso3=len(iso3s)):
-                try:
-                    geo = await fetch_geo_batch(iso3s, timeout=90.0, chunk_size=3, retries=2)
-                    checkpoint("geo_data_complete", results=len(geo), requested=len(iso3s))
-                except Exception as e:
-                    print(f"  ⚠️  Geographic data failed: {type(e).__name__}")
-                    print(f"     Continuing without geo data (can be added later)")
-                    checkpoint("geo_data_failed", error=type(e).__name__)
-                    geo = {}
-
+        todo = staging.missing("core", iso3s) if staging is not None else iso3s
+        wd: Dict[str, dict] = {}
+        if todo:
+            # Fetch wikidata core
+            print(f"  📡 [{batch_num}] Fetching Wikidata core for {len(todo)} ISO codes"
+                  + (f" ({len(iso3s) - len(todo)} staged)" if len(todo) < len(iso3s) else "") + "...")
+            with time_block("fetch_wikidata_core", num_iso3=len(todo)):
+                wd = await wd_fetch(todo, client=client)
+            if staging is not None:
+                # codes without a Wikidata item are final too ({} = nothing to add)
+                staging.commit("core", {iso: wd.get(iso, {}) for iso in todo})
+        checkpoint("wikidata_core_complete", results=len(wd), requested=len(todo))
+        if staging is not None:
+            wd = staging.get("core", iso3s)
+        return iso3s, wd
+
+async def _fetch_geo_stage(iso3s: List[str], batch_num: int, skip_geo: bool, client=None,
+                           staging: StagingArea | None = None) -> Dict[str, dict]:
+    if skip_geo:
+        print(f"  ⏭️  [{batch_num}] Skipping geographic data (--skip-geo enabled)")
+        checkpoint("geo_data_skipped", reason="user_option")
+        return {}
+    todo = staging.missing("geo", iso3s) if staging is not None else iso3s
+    if not todo:
+        return staging.get("geo", iso3s)
+    print(f"  🌍 [{batch_num}] Fetching geographic data for {len(todo)} ISO codes...")
+    with time_block("fetch_geo_data", num_iso3=len(todo)):
+        try:
+            geo = await fetch_geo_batch(
+                todo, client=client, timeout=90.0, chunk_size=25, retries=2,
+                on_result=(lambda g: staging.commit("geo", g)) if staging is not None else None,
+            )
+            checkpoint("geo_data_complete", results=len(geo), requested=len(todo))
+            if staging is not None:
+                geo.update(staging.get("geo", iso3s))
+            return geo
+        except Exception as e:
+            print(f"  ⚠️  [{batch_num}] Geographic data failed: {type(e).__name__}")
+            print(f"     Continuing without geo data (can be added later)")
+            checkpoint("geo_data_failed", error=type(e).__name__)
+            return {}
+
+async def enrich_stage(batch_codes: List[str], iso3s: List[str], wd: Dict[str, dict], iso_tables, batch_num: int,
+                       skip_geo: bool = False, glotto_concurrency: int = GLOTTO_CONCURRENCY,
+                       glotto_throttle: bool = True, client=None,
+                       staging: StagingArea | None = None) -> Dict[str, dict]:
+    """
+    Stage 2: geo and Glottolog (concurrently; both only need the core result), then merge.
+    With `staging`, already staged results are reused and new ones are staged as they arrive.
+    """
+    with time_block("stage_enrich", batch_num=batch_num, num_codes=len(batch_codes)):
         # Glottocodes from wd
         with time_block("extract_glottocodes"):
             glottos = [wd[k]["glottocode"] for k in wd if wd[k].get("glottocode")]
         checkpoint("glottocodes_extracted", num_glottocodes=len(glottos))
-        
-        print(f"  🗂️  Fetching Glottolog data for {len(glottos)} codes...")
-        with time_block("fetch_glottolog", num_glottocodes=len(glottos)):
-            gl = await for_glottocodes(glottos)
-        checkpoint("glottolog_complete", results=len(gl), requested=len(glottos))
 
+        async def glottolog():
+            todo = staging.missing("glotto", glottos) if staging is not None else glottos
+            print(f"  🗂️  [{batch_num}] Fetching Glottolog data for {len(todo)} codes...")
+            with time_block("fetch_glottolog", num_glottocodes=len(todo)):
+                gl = await for_glottocodes(
+                    todo, concurrency=glotto_concurrency, throttle=glotto_throttle, client=client,
+                    on_result=(lambda gc, data: staging.commit("glotto", {gc: data})) if staging is not None else None,
+                )
+            checkpoint("glottolog_complete", results=len(gl), requested=len(todo))
+            if staging is not None:
+                gl.update(staging.get("glotto", glottos))
+            return gl
+
+        geo, gl = await asyncio.gather(_fetch_geo_stage(iso3s, batch_num, skip_geo, client, staging), glottolog())
+        return merge_batch(batch_codes, iso_tables, wd, gl, geo, batch_num)
+
+def merge_batch(batch_codes: List[str], iso_tables, wd: Dict[str, dict], gl: Dict[str, dict],
+                geo: Dict[str, dict], batch_num: int) -> Dict[str, dict]:
+    """Stage 3: merge sources into records and compute derived fields"""
+    with time_block("stage_merge", batch_num=batch_num, num_codes=len(batch_codes)):
         # Merge data for each language
-        print(f"  🔀 Merging data for {len(batch_codes)} languages...")
+        print(f"  🔀 [{batch_num}] Merging data for {len(batch_codes)} languages...")
         out: Dict[str, dict] = {}
         with time_block("merge_all_languages", num_codes=len(batch_codes)):
             for code in batch_codes:
@@ -161,20 +241,195 @@ async def process_batch(batch_codes: List[str], iso_tables, batch_num: int, skip
                         continue
 
         # Compute derivations
-        print(f"  🧮 Computing resource levels and related languages...")
+        print(f"  🧮 [{batch_num}] Computing resource levels...")
         with time_block("compute_derivations", num_langs=len(out)):
             for k, row in out.items():
                 spk = (row.get("speaker_count") or {}).get("value")
                 row["resource_level"] = val(_resource_level_from_speakers(spk), "derived", 0.9)
                 row["data_source"]   = val(_data_source_heuristic(row["iso_639_3"]), "derived", 0.7)
 
-            # Related languages (within batch for now; can recompute globally later)
-            for k in list(out.keys()):
-                out[k]["related_languages"] = _related_by_family_geo_selfscript(k, out)
-
         checkpoint("batch_complete", num_languages=len(out))
         return out
 
+async def process_batch(batch_codes: List[str], iso_tables, batch_num: int, skip_geo: bool = False,
+                        glotto_concurrency: int = GLOTTO_CONCURRENCY, glotto_throttle: bool = True,
+                        client=None, staging: StagingArea | None = None) -> Dict[str, dict]:
+    """Process one batch through every stage, sequentially"""
+    with time_block("process_batch", batch_num=batch_num, num_codes=len(batch_codes)):
+        iso3s, wd = await fetch_core_stage(batch_codes, batch_num, client, staging)
+        return await enrich_stage(batch_codes, iso3s, wd, iso_tables, batch_num, skip_geo,
+                                  glotto_concurrency, glotto_throttle, client, staging)
+
+def split_halves(codes: List[str]) -> Tuple[List[str], List[str]]:
+    mid = len(codes) // 2
+    return codes[:mid], codes[mid:]
+
+async def run_pipeline(batches: List[Tuple[object, List[str]]], iso_tables, args, client,
+                       skip_trigger_path: Path, *, bisect: bool = True, limit: float | None = None,
+                       staging: StagingArea | None = None) -> AsyncIterator[Tuple[str, object, List[str], object, float]]:
+    """
+    Stream batches through the stages:
+
+        producer -> core_q -> N core workers -> enrich_q -> N enrich workers -> results
+
+    so up to --concurrency batches are in each stage at once, and geo/Glottolog
+    of batch N overlap core of batch N+1. All HTTP still goes through the
+    shared client and per-host rate limiter.
+
+    With `bisect`, a batch that times out or raises goes back into core_q as
+    two halves (labelled N.1 / N.2) that run concurrently, recursively, so a
+    few pathological codes are isolated in O(log n) extra attempts instead of
+    failing the whole batch.
+
+    With `staging`, stages commit results as they arrive; when a batch fails,
+    languages whose core, geo and Glottolog data are all staged are merged
+    anyway ("partial") and only the rest is retried, fetching only the stages
+    still missing.
+
+    Yields (status, label, codes, payload, seconds) as work finishes, where
+    status is "ok" / "partial" (payload = records), "split" (payload = the
+    failure that caused it; informational), "timeout" / "error" (payload =
+    exception; final for these codes) or "skipped" (payload = reason).
+    """
+    workers = max(1, args.concurrency)
+    core_q: asyncio.Queue = asyncio.Queue()  # unbounded: retries are queued from inside the stages
+    enrich_q: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    results: asyncio.Queue = asyncio.Queue()
+    limit = args.max_batch_seconds if limit is None else limit
+    admit = asyncio.Semaphore(workers)  # fresh batches waiting for core; retries skip the line
+    pending = 0                         # admitted jobs (including halves) not yet finished
+    producing = True
+    drained = asyncio.Event()
+
+    def finish():
+        nonlocal pending
+        pending -= 1
+        if not producing and pending == 0:
+            drained.set()
+
+    def salvage(label, codes: List[str]) -> Tuple[Dict[str, dict], List[str]]:
+        """Merge the languages of a failed batch whose stages all finished"""
+        if staging is None:
+            return {}, codes
+        done, rest = [], []
+        for c in codes:
+            try:
+                iso3 = split_parts(c)[0]
+            except ValueError:
+                rest.append(c)
+                continue
+            (done if staging.complete(iso3, need_geo=not args.skip_geo) else rest).append(c)
+        if not done:
+            return {}, codes
+        wd, gl, geo = staging.inputs(batch_iso3s(done))
+        return merge_batch(done, iso_tables, wd, gl, geo, label), rest
+
+    async def failed(label, codes: List[str], status: str, error, seconds: float):
+        nonlocal pending
+        try:
+            records, codes = salvage(label, codes)
+            if records:
+                checkpoint("batch_salvaged", batch=str(label), merged=len(records), missing=len(codes))
+                await results.put(("partial", label, list(records), records, seconds))
+            if not codes:
+                return
+            if bisect and len(codes) > 1:
+                left, right = split_halves(codes)
+                pending += 2
+                core_q.put_nowait((f"{label}.1", left, False))
+                core_q.put_nowait((f"{label}.2", right, False))
+                checkpoint("batch_bisected", batch=str(label), size=len(codes), status=status)
+                await results.put(("split", label, codes, error if error is not None else status, seconds))
+            else:
+                await results.put((status, label, codes, error, seconds))
+        finally:
+            finish()  # even if salvaging raised: the job is over either way
+
+    async def producer():
+        nonlocal pending, producing
+        for batch_num, codes in batches:
+            # Manual skip button: touch data/skip.now to skip the next batch
+            if skip_trigger_path.exists():
+                skip_trigger_path.unlink(missing_ok=True)
+                await results.put(("skipped", batch_num, codes, "manual-trigger", 0.0))
+                continue
+            await admit.acquire()
+            pending += 1
+            await core_q.put((batch_num, codes, True))
+        producing = False
+        if pending == 0:
+            drained.set()
+
+    async def core_worker():
+        while (job := await core_q.get()) is not None:
+            batch_num, codes, fresh = job
+            print(f"\n🧩 Batch {batch_num}: {len(codes)} languages ({', '.join(codes[:5])}"
+                  + (" ..." if len(codes) > 5 else "") + ")")
+            t0 = time.monotonic()
+            try:
+                iso3s, wd = await asyncio.wait_for(fetch_core_stage(codes, batch_num, client, staging),
+                                                   timeout=limit)
+            except asyncio.TimeoutError:
+                await failed(batch_num, codes, "timeout", None, time.monotonic() - t0)
+                continue
+            except Exception as e:
+                await failed(batch_num, codes, "error", e, time.monotonic() - t0)
+                continue
+            finally:
+                if fresh:
+                    admit.release()
+            # the wall-clock budget covers active stage time, not time queued between stages
+            await enrich_q.put((batch_num, codes, iso3s, wd, time.monotonic() - t0))
+
+    async def enrich_worker():
+        while (job := await enrich_q.get()) is not None:
+            batch_num, codes, iso3s, wd, spent = job
+            t0 = time.monotonic()
+            try:
+                out = await asyncio.wait_for(
+                    enrich_stage(codes, iso3s, wd, iso_tables, batch_num, args.skip_geo,
+                                 args.glottolog_concurrency, args.glottolog_rate > 0, client, staging),
+                    timeout=max(0.0, limit - spent),
+                )
+            except asyncio.TimeoutError:
+                await failed(batch_num, codes, "timeout", None, spent + time.monotonic() - t0)
+                continue
+            except Exception as e:
+                await failed(batch_num, codes, "error", e, spent + time.monotonic() - t0)
+                continue
+            await results.put(("ok", batch_num, codes, out, spent + time.monotonic() - t0))
+            finish()
+
+    async def stages():
+        tasks = [asyncio.ensure_future(w()) for w in [core_worker, enrich_worker] for _ in range(workers)]
+        feeder = asyncio.ensure_future(producer())
+        drain = asyncio.ensure_future(drained.wait())
+        try:
+            # a worker only returns after its sentinel, so one that finishes
+            # before the drain crashed: fail the run instead of waiting forever
+            watch = {*tasks, feeder, drain}
+            while not drained.is_set():
+                done, watch = await asyncio.wait(watch, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t is not drain and t.exception() is not None:
+                        raise t.exception()
+            for _ in range(workers):
+                await core_q.put(None)
+                await enrich_q.put(None)
+            await asyncio.gather(*tasks)
+        finally:
+            for t in (*tasks, feeder, drain):
+                t.cancel()
+            results.put_nowait(None)  # unblocks the consumer, which then re-raises from the runner
+
+    runner = asyncio.ensure_future(stages())
+    try:
+        while (item := await results.get()) is not None:
+            yield item
+        await runner
+    finally:
+        runner.cancel()
+
 def mark_skipped(skipped: Dict[str, list], batch_codes: List[str], reason: str):
     skipped.setdefault("batches", []).append({
         "timestamp": int(time.time()),
@@ -190,7 +445,8 @@ def print_progress_bar(current: int, total: int, width: int = 50):
     percent = 100 * current / total if total > 0 else 0
     print(f"\r  Progress: |{bar}| {current}/{total} ({percent:.1f}%)", end="", flush=True)
 
-async def main():
+async def main(argv: List[str] | None = None) -> Dict[str, object] | None:
+    """Run a build; returns a short machine-readable summary (used by scripts.bench_build)"""
     profiler = get_profiler()
     
     with time_block("full_build"):
@@ -201,19 +457,68 @@ async def main():
         ap.add_argument("--limit", type=int, default=0, help="Max languages to process this run (0 = no limit)")
         ap.add_argument("--out", type=str, default=str(OUT_PATH))
         ap.add_argument("--skip-trigger", type=str, default="data/skip.now",
-                        help="Touch this file during a run to skip the current batch.")
+                        help="Touch this file during a run to skip the next batch.")
         ap.add_argument("--max-batch-seconds", type=float, default=120.0,
-                        help="Auto-skip a batch if it exceeds this wall-clock time.")
+                        help="Fail (and bisect) a batch if it exceeds this wall-clock time.")
+        ap.add_argument("--no-bisect", action="store_true",
+                        help="Don't split failing batches in half and retry the halves")
+        ap.add_argument("--final-retries", type=int, default=1,
+                        help="Retry rounds at the end for languages that still failed alone")
+        ap.add_argument("--concurrency", type=int, default=3,
+                        help="Batches in flight per pipeline stage (core, geo+Glottolog).")
         ap.add_argument("--skiplist", type=str, default="",
                         help="Path to a file listing codes or ISO3 to always skip (one per line).")
         ap.add_argument("--skip-geo", action="store_true",
                         help="Skip geographic data fetching (faster, can be added later)")
+        ap.add_argument("--glottolog-concurrency", type=int, default=GLOTTO_CONCURRENCY,
+                        help="Glottolog requests in flight at once")
+        ap.add_argument("--glottolog-rate", type=float, default=GLOTTO_RATE,
+                        help="Max Glottolog requests started per second (0 = unlimited)")
+        ap.add_argument("--wikidata-rate", type=float, default=LIMITER.defaults["query.wikidata.org"]["rate"],
+                        help="Starting SPARQL requests/second (adapts to 429/503 and success)")
+        ap.add_argument("--http2", action="store_true",
+                        help="Use HTTP/2 for the shared client (needs httpx[http2])")
+        ap.add_argument("--record", type=str, default="",
+                        help="Save every HTTP response to this fixture archive (.jsonl.gz)")
+        ap.add_argument("--replay", type=str, default="",
+                        help="Serve HTTP only from this fixture archive (no network)")
+        ap.add_argument("--endpoint", type=str, default="",
+                        help="Send all HTTP to a local stand-in (python -m scripts.mock_endpoint)")
+        ap.add_argument("--http-cache", type=str, default="",
+                        help="Response cache database (default cache/http.sqlite; "
+                             "off by default with --record/--replay/--endpoint)")
+        ap.add_argument("--no-http-cache", action="store_true",
+                        help="Don't read or write the response cache")
+        ap.add_argument("--compact", action="store_true",
+                        help="Only fold the batch journal into --out, then exit")
         ap.add_argument("--profile", action="store_true",
-                        help="Export detailed profiling data at the end")
-        args = ap.parse_args()
+                        help="Export span data and a Chrome/Perfetto trace at the end")
+        args = ap.parse_args(argv)
+        if args.record and args.replay:
+            ap.error("--record and --replay are mutually exclusive")
+
+        # a warm cache would hide requests from recording and from the stand-in
+        simulated = bool(args.record or args.replay or args.endpoint)
+        if args.no_http_cache or (simulated and not args.http_cache):
+            set_http_cache(None)
+        elif args.http_cache:
+            set_http_cache(HttpCache(Path(args.http_cache)))
 
         out_path = Path(args.out)
         skip_trigger_path = Path(args.skip_trigger)
+        journal = BuildJournal(journal_path(out_path))
+        staging = StagingArea(staging_path(out_path))
+        if staging.torn_bytes:
+            print(f"⚠️  Dropped a torn {staging.torn_bytes}-byte entry from {staging.path} (interrupted write)")
+        if len(staging):
+            print(f"🧩 Reusing {len(staging)} staged stage results from {staging.path}")
+        if journal.torn_bytes:
+            print(f"⚠️  Dropped a torn {journal.torn_bytes}-byte record from {journal.path} (interrupted write)")
+
+        if args.compact:
+            merged = journal.compact(out_path, finalize=apply_related)
+            print(f"✅ Compacted journal into {out_path} ({len(merged)} records)")
+            return
 
         print("🚀 Starting Omnilingual Finder Data Build")
         print("=" * 80)
@@ -239,10 +544,17 @@ async def main():
                 target_codes = [c for c in target_codes if want(c)]
         checkpoint("skiplist_applied", skipped=len(skiplist), remaining=len(target_codes))
 
-        # 3) Resume: load existing output and skip done codes
+        # 3) Resume: existing output plus anything journaled since the last compaction
         with time_block("load_existing_data"):
             existing = load_existing(out_path)
-        checkpoint("existing_data_loaded", existing_count=len(existing))
+            existing.update(journal.records())
+        checkpoint("existing_data_loaded", existing_count=len(existing), journaled_batches=journal.batches)
+
+        # Related languages are computed across the whole database, not per batch:
+        # once here, then kept current per batch, so compaction writes `existing` as is
+        with time_block("related_index"):
+            related = RelatedIndex(existing)
+            related.apply(existing)
 
         done_codes = set(existing.keys())
         remaining = [c for c in target_codes if c not in done_codes]
@@ -260,9 +572,13 @@ async def main():
         print(f"   To process now:      {total_this_run:4} languages")
         print(f"   Batch size:          {args.batch_size}")
         print(f"   Max batch time:      {args.max_batch_seconds}s")
+        print(f"   Concurrency:         {args.concurrency} batches per stage")
         print("=" * 80)
 
         if total_this_run == 0:
+            if journal.batches:
+                journal.compact(out_path, base=existing, folded=True)
+            staging.clear()
             print("\n✅ Nothing to do. (Everything already built for selected scripts.)")
             return
 
@@ -275,81 +591,117 @@ async def main():
         # Skipped registry
         skipped_registry = load_existing(SKIPPED_PATH)
 
-        # 6) Batch loop with checkpointing + manual/auto skip
-        print("\n🔄 Processing batches...\n")
-        start = 0
-        num_batches = (len(remaining) + args.batch_size - 1) // args.batch_size
-        
-        while start < len(remaining):
-            batch_codes = remaining[start:start + args.batch_size]
-            batch_num = start // args.batch_size + 1
-            
-            print(f"\n{'='*80}")
-            print(f"🧩 Batch {batch_num}/{num_batches}: {len(batch_codes)} languages")
-            print(f"{'='*80}")
-            
-            # Print some sample codes
-            print(f"   Codes: {', '.join(batch_codes[:5])}" + (" ..." if len(batch_codes) > 5 else ""))
-
-            # Manual skip button: touch data/skip.now to skip this batch instantly
-            if skip_trigger_path.exists():
-                skip_trigger_path.unlink(missing_ok=True)
-                print(f"⏭️  Manual skip triggered → skipping batch {batch_num}")
-                mark_skipped(skipped_registry, batch_codes, reason="manual-trigger")
-                start += args.batch_size
-                continue
-
-            batch_start_time = time.time()
-            
-            try:
-                # Run the batch with a wall-clock guard
-                batch_out = await asyncio.wait_for(
-                    process_batch(batch_codes, iso_tables, batch_num, skip_geo=args.skip_geo),
-                    timeout=args.max_batch_seconds
-                )
-                
-                batch_duration = time.time() - batch_start_time
-                print(f"\n  ✅ Batch completed in {batch_duration:.1f}s")
-                
-            except asyncio.TimeoutError:
-                batch_duration = time.time() - batch_start_time
-                print(f"\n  ⏳ Batch {batch_num} exceeded {args.max_batch_seconds}s → skipping")
-                mark_skipped(skipped_registry, batch_codes, reason="timeout")
-                # Write current state and continue
-                atomic_write(out_path, existing)
-                save_progress(done_codes, len(target_codes))
-                start += args.batch_size
-                continue
-                
-            except Exception as e:
-                batch_duration = time.time() - batch_start_time
-                print(f"\n  ❌ Batch {batch_num} failed: {e}")
-                # Mark skipped but keep going
-                mark_skipped(skipped_registry, batch_codes, reason=f"error:{type(e).__name__}")
-                atomic_write(out_path, existing)
-                save_progress(done_codes, len(target_codes))
-                start += args.batch_size
-                continue
-
-            # Merge into existing and write atomically
-            print(f"  💾 Saving {len(batch_out)} languages...")
+        LIMITER.configure("query.wikidata.org", args.wikidata_rate, burst=max(1.0, args.wikidata_rate),
+                          max_rate=args.wikidata_rate * 5)
+        if args.glottolog_rate > 0:
+            configure_glottolog_limiter(args.glottolog_rate)
+
+        # One pooled client for every request of this build
+        session = await HttpSession(
+            http2=args.http2,
+            record=FixtureArchive(Path(args.record)) if args.record else None,
+            replay=FixtureArchive(Path(args.replay)) if args.replay else None,
+            endpoint=args.endpoint or None,
+        ).open()
+        if session.replay is not None:
+            print(f"📼 Replaying {len(session.replay)} recorded responses from {args.replay}")
+
+        # 6) Batch pipeline with checkpointing + manual/auto skip
+        print(f"\n🔄 Processing batches ({args.concurrency} in flight per stage)...\n")
+        batches = [
+            (i // args.batch_size + 1, remaining[i:i + args.batch_size])
+            for i in range(0, len(remaining), args.batch_size)
+        ]
+        num_batches = len(batches)
+        built = failed_batches = 0
+        failures: List[Tuple[List[str], str]] = []  # codes that failed even on their own
+
+        def commit(batch_out: Dict[str, dict], label):
+            nonlocal built
+            # Append to the journal (durable); languages.json is written once at the end
+            print(f"  💾 Journaling {len(batch_out)} languages...")
             with time_block("save_batch_results"):
                 existing.update(batch_out)
-                atomic_write(out_path, existing)
-
-            # Update progress
+                # only the (family, script) groups this batch touched are recomputed;
+                # older records they change are updated in `existing`, which compaction writes
+                with time_block("related_update"):
+                    related.add(batch_out)
+                    related.apply(existing)
+                journal.append(batch_out, label)
             done_codes.update(batch_out.keys())
-            save_progress(done_codes, len(target_codes))
-            
+            built += len(batch_out)
             # Print overall progress
             print_progress_bar(len(done_codes), len(target_codes))
 
-            start += args.batch_size
-            
-            # Be nice to public endpoints
-            if start < len(remaining):
-                print(f"\n  😴 Pausing 0.5s before next batch...")
-                await asyncio.sleep(0.5)
+        def describe(status: str, payload) -> str:
+            if status == "timeout" or payload == "timeout":
+                return "timeout"
+            return f"error:{type(payload).__name__}"
+
+        # Batches finish out of order; this loop is the only writer
+        async for status, batch_num, batch_codes, payload, batch_duration in run_pipeline(
+            batches, iso_tables, args, session.client, skip_trigger_path,
+            bisect=not args.no_bisect, staging=staging,
+        ):
+            if status == "skipped":
+                print(f"⏭️  Manual skip triggered → skipping batch {batch_num}")
+                mark_skipped(skipped_registry, batch_codes, reason=payload)
+                continue
+            if status == "split":
+                print(f"\n  ✂️  Batch {batch_num} failed ({describe(status, payload)}) after "
+                      f"{batch_duration:.1f}s → retrying {len(batch_codes)} languages as two halves")
+                continue
+            if status == "partial":
+                print(f"\n  🩹 Batch {batch_num} failed; salvaged {len(payload)} languages whose stages all finished")
+                commit(payload, batch_num)
+                continue
+            if status in ("timeout", "error"):
+                print(f"\n  ❌ Batch {batch_num} ({', '.join(batch_codes[:3])}) failed: {describe(status, payload)}"
+                      " → queued for the final retry round")
+                failures.append((batch_codes, describe(status, payload)))
+                continue
+
+            of = f"/{num_batches}" if isinstance(batch_num, int) else ""
+            print(f"\n  ✅ Batch {batch_num}{of} completed in {batch_duration:.1f}s")
+            commit(payload, batch_num)
+
+        # Final bounded retry round: isolated failures get one more try each
+        # (no further splitting, double time budget) before being recorded as skipped
+        for round_num in range(1, args.final_retries + 1):
+            if not failures:
+                break
+            retry = [(f"r{round_num}.{i}", codes) for i, (codes, _) in enumerate(failures, 1)]
+            print(f"\n🔁 Final retry round {round_num}/{args.final_retries}: "
+                  f"{sum(len(c) for _, c in retry)} languages in {len(retry)} batches")
+            failures = []
+            with time_block("final_retry_round", round=round_num, batches=len(retry)):
+                async for status, label, codes, payload, seconds in run_pipeline(
+                    retry, iso_tables, args, session.client, skip_trigger_path,
+                    bisect=False, limit=args.max_batch_seconds * 2, staging=staging,
+                ):
+                    if status == "ok":
+                        print(f"\n  ✅ Retry {label} completed in {seconds:.1f}s")
+                        commit(payload, label)
+                    elif status == "partial":
+                        print(f"\n  🩹 Retry {label} failed; salvaged {len(payload)} languages")
+                        commit(payload, label)
+                    elif status == "skipped":
+                        mark_skipped(skipped_registry, codes, reason=payload)
+                    else:
+                        failures.append((codes, describe(status, payload)))
+
+        for codes, reason in failures:
+            print(f"  ⏭️  Giving up on {', '.join(codes)} ({reason}) → {SKIPPED_PATH}")
+            mark_skipped(skipped_registry, codes, reason=reason)
+        failed_batches = len(failures)
+
+        await session.aclose()
+
+        print(f"\n\n  🗜️  Compacting {journal.batches} journaled batches into {out_path}...")
+        with time_block("compact_journal"):
+            existing = journal.compact(out_path, base=existing, folded=True)
+            save_progress(done_codes, len(target_codes))
+            staging.clear()
 
         print(f"\n\n{'='*80}")
         print(f"✅ Build Complete!")
@@ -358,6 +710,17 @@ async def main():
         if SKIPPED_PATH.exists():
             skipped_count = len(load_existing(SKIPPED_PATH).get("batches", []))
             print(f"   Skipped batches: {skipped_count} (see {SKIPPED_PATH})")
+        if orchestrator.HTTP_CACHE is not None:
+            print(f"   HTTP cache: {orchestrator.HTTP_CACHE.hits} hits, {orchestrator.HTTP_CACHE.misses} misses")
+        if session.record is not None:
+            print(f"   Recorded {session.record.added} responses → {session.record.path} ({len(session.record)} total)")
+        st = session.stats()
+        print(f"   HTTP session: {st['requests']} requests over {st['connections']} connections "
+              f"({st['reuse_ratio']:.0%} reused), {st['bytes_wire']:,} bytes on the wire "
+              f"({st['bytes_decoded']:,} decoded), {st['http_versions']}")
+        for host, r in LIMITER.stats().items():
+            print(f"   Rate limit {host}: {r['requests']} requests, {r['throttled']} throttled, "
+                  f"{r['waited_s']:.1f}s waiting, ending at {r['rate']:.2f}/s")
         print(f"{'='*80}\n")
 
         # Print profiling summary
@@ -366,7 +729,20 @@ async def main():
         # Optionally export detailed profiling
         if args.profile:
             export_profile(PROFILE_PATH)
-            print(f"📊 Detailed profiling exported to {PROFILE_PATH}")
+            export_chrome_trace(TRACE_PATH)
+            print(f"📊 Detailed profiling exported to {PROFILE_PATH} (trace: {TRACE_PATH}, open in Perfetto)")
+
+        cache = orchestrator.HTTP_CACHE
+        return {
+            "records": len(existing),
+            "built": built,
+            "requested": total_this_run,
+            "failed_batches": failed_batches,
+            "batches": num_batches,
+            "http_cache": {"hits": cache.hits, "misses": cache.misses} if cache is not None else None,
+            "session": st,
+            "rate_limits": LIMITER.stats(),
+        }
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -4,6 +4,8 @@ import json, unicodedata, re
 from pathlib import Path
 from typing import Dict, List, Set
 
+from finder.core import LanguageFinder
+
 SRC = Path("data/languages.json")
 OUT = Path("data/finder_index.json")
 
@@ -85,6 +87,10 @@ def main():
             "iso3": iso3
         }
 
+    # runtime indices in the exact shape LanguageFinder uses, so it can
+    # load them as-is instead of re-normalizing every name at startup
+    runtime = LanguageFinder(SRC, fast_start=False).index_payload()
+
     OUT.parent.mkdir(parents=True, exist_ok=True)
     OUT.write_text(json.dumps({
         "by_name": by_name,
@@ -95,7 +101,12 @@ def main():
         "by_script": by_script,
         "by_country": by_country,
         "by_region": by_region,
-        "meta": { "codes": meta_codes }
+        "finder": runtime["indices"],
+        "meta": {
+            "codes": meta_codes,
+            "schema_version": runtime["schema_version"],
+            "source_sha256": runtime["source_sha256"],
+        }
     }, ensure_ascii=False, indent=2))
     print(f"Built index → {OUT}")
 
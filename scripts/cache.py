@@ -0,0 +1,54 @@
+# scripts/cache.py
+"""
+Inspect or prune the extractor's HTTP cache.
+
+    python -m scripts.cache stats
+    python -m scripts.cache prune                      # expired entries only
+    python -m scripts.cache prune --older-than-days 7 --endpoint query.wikidata.org
+    python -m scripts.cache prune --all
+"""
+from __future__ import annotations
+import argparse, json
+from pathlib import Path
+
+from extractor.http_cache import DAY, HttpCache
+
+CACHE_PATH = Path("cache/http.sqlite")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Extractor HTTP cache maintenance")
+    ap.add_argument("--path", type=str, default=str(CACHE_PATH), help="Cache database")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    st = sub.add_parser("stats", help="Show entry counts and sizes")
+    st.add_argument("--json", action="store_true", help="Machine-readable output")
+
+    pr = sub.add_parser("prune", help="Delete expired (and optionally other) entries")
+    pr.add_argument("--older-than-days", type=float, help="Also delete entries fetched before this")
+    pr.add_argument("--endpoint", type=str, help="Also delete entries for this host")
+    pr.add_argument("--all", action="store_true", help="Delete everything")
+    args = ap.parse_args()
+
+    cache = HttpCache(Path(args.path))
+    if args.command == "stats":
+        s = cache.stats()
+        if args.json:
+            print(json.dumps(s, indent=2))
+            return
+        ratio = s["bytes_stored"] / s["bytes_uncompressed"] if s["bytes_uncompressed"] else 0
+        print(f"📦 {s['path']}")
+        print(f"   Entries:  {s['entries']:,} ({s['expired']:,} expired)")
+        print(f"   Payload:  {s['bytes_uncompressed']:,} bytes → {s['bytes_stored']:,} stored ({ratio:.0%})")
+        print(f"   File:     {s['file_bytes']:,} bytes")
+        for endpoint, e in s["endpoints"].items():
+            print(f"   • {endpoint or '?':30} {e['entries']:6,} entries  {e['bytes']:>12,} bytes")
+    else:
+        older = args.older_than_days * DAY if args.older_than_days is not None else None
+        removed = cache.prune(older_than=older, endpoint=args.endpoint, everything=args.all)
+        print(f"🧹 Removed {removed:,} entries")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
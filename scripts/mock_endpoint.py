@@ -0,0 +1,55 @@
+# scripts/mock_endpoint.py
+"""
+Serve a recorded fixture archive as a local Wikidata/Glottolog stand-in.
+
+    python -m scripts.build_incremental --record fixtures/deva.jsonl.gz --scripts Deva
+    python -m scripts.mock_endpoint fixtures/deva.jsonl.gz --port 8765 \\
+        --latency 0.3 --jitter 0.2 --p429 0.05 --p5xx 0.02 --ptimeout 0.01 --seed 1
+    python -m scripts.build_incremental --endpoint http://127.0.0.1:8765 --scripts Deva --out /tmp/deva.json
+"""
+from __future__ import annotations
+import argparse, asyncio, json
+from pathlib import Path
+
+from extractor.fixtures import FixtureArchive
+from extractor.mock_server import MockServer
+
+
+async def run(args):
+    archive = FixtureArchive(Path(args.archive))
+    server = MockServer(
+        archive, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+        p429=args.p429, p5xx=args.p5xx, ptimeout=args.ptimeout,
+        retry_after=args.retry_after, hang=args.hang, seed=args.seed,
+    )
+    await server.start()
+    print(f"🧪 Serving {len(archive)} recorded responses on {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+        print(json.dumps(server.stats(), indent=2))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local HTTP stand-in serving a fixture archive")
+    ap.add_argument("archive", type=str, help="Fixture archive from build_incremental --record")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="Extra uniform 0..jitter seconds")
+    ap.add_argument("--p429", type=float, default=0.0, help="Fraction of requests answered 429")
+    ap.add_argument("--p5xx", type=float, default=0.0, help="Fraction answered 502/503/504")
+    ap.add_argument("--ptimeout", type=float, default=0.0, help="Fraction that hang, then drop")
+    ap.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s")
+    ap.add_argument("--hang", type=float, default=300.0, help="Seconds a 'timeout' request hangs")
+    ap.add_argument("--seed", type=int, default=None, help="Make injected faults reproducible")
+    args = ap.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -44,7 +44,6 @@ setup(
         ],
         "build": [
             "httpx>=0.24",
-            "pandas>=1.5",
             "requests>=2.28",
         ],
     },
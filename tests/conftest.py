@@ -0,0 +1,35 @@
+"""
+Shared fixtures: a realistic name set built from the ISO 639-3 tables in
+sources/iso (Wikidata-style labels: Ref_Name without its qualifier).
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from extractor.iso_cldr import load_iso_tables
+from finder.core import LanguageFinder
+
+REPO = Path(__file__).resolve().parent.parent
+ISO_DIR = REPO / "sources" / "iso"
+
+
+@pytest.fixture(scope="session")
+def iso_languages_path(tmp_path_factory) -> Path:
+    tables = load_iso_tables(ISO_DIR, use_cache=False)
+    records = {
+        f"{code}_Latn": {
+            "iso_639_3": code,
+            "script_code": "Latn",
+            "english_name": {"value": tables.ref_name(code).split(" (")[0], "source": "iso"},
+        }
+        for code in tables.core
+    }
+    path = tmp_path_factory.mktemp("data") / "languages.json"
+    path.write_text(json.dumps(records))
+    return path
+
+
+@pytest.fixture(scope="session")
+def iso_finder(iso_languages_path) -> LanguageFinder:
+    return LanguageFinder(data_path=iso_languages_path, fast_start=False)
@@ -0,0 +1,84 @@
+"""
+Record / replay round trip: responses recorded through HttpSession replay
+identically with no server, and the mock server serves the same archive.
+"""
+import asyncio
+import json
+
+import pytest
+
+from extractor.fixtures import FixtureArchive, FixtureMiss
+from extractor.mock_server import MockServer
+from extractor.orchestrator import HttpSession, fetch, set_http_cache
+from extractor.ratelimit import LIMITER
+
+URLS = [f"https://glottolog.org/resource/languoid/id/lang{i}.json" for i in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def uncached_unthrottled(monkeypatch):
+    set_http_cache(None)
+    monkeypatch.setattr(LIMITER, "defaults", dict(LIMITER.defaults))
+    LIMITER.configure("glottolog.org", 1000.0, burst=1000)
+    yield
+    LIMITER.reset()
+
+
+def make_handler():
+    seen = set()
+
+    def handler(method, url, body):
+        if url == URLS[0] and url not in seen:  # throttled once: must not be recorded
+            seen.add(url)
+            return 429, {"Retry-After": "0"}, b"slow down"
+        return 200, {"Content-Type": "application/json"}, json.dumps({"url": url, "name": "Gã"}).encode()
+    return handler
+
+
+async def fetch_urls(session_kw, urls=URLS):
+    async with HttpSession(**session_kw) as session:
+        return [await fetch(session.client, u, cache=False) for u in urls]
+
+
+def test_record_then_replay(tmp_path):
+    path = tmp_path / "glotto.jsonl.gz"
+
+    async def record():
+        async with MockServer(handler=make_handler()) as server:
+            out = await fetch_urls({"record": FixtureArchive(path), "endpoint": server.url})
+            return out, server.stats()
+    recorded, served = asyncio.run(record())
+    assert served["statuses"] == {200: len(URLS), 429: 1}
+
+    archive = FixtureArchive(path)
+    assert len(archive) == len(URLS)
+    assert all(e["status"] == 200 for e in archive.entries.values())
+    assert asyncio.run(fetch_urls({"replay": archive})) == recorded
+
+    async def served_from_archive():
+        async with MockServer(archive) as server:
+            out = await fetch_urls({"endpoint": server.url})
+            return out, server.stats()
+    out, stats = asyncio.run(served_from_archive())
+    assert out == recorded and stats["misses"] == 0
+
+
+def test_replay_miss_raises(tmp_path):
+    archive = FixtureArchive(tmp_path / "empty.jsonl.gz")
+    with pytest.raises(FixtureMiss):
+        asyncio.run(fetch_urls({"replay": archive}, URLS[:1]))
+
+
+def test_archive_save_load_keeps_binary_bodies_and_is_stable(tmp_path):
+    path = tmp_path / "a.jsonl.gz"
+    a = FixtureArchive(path)
+    a.add("GET", URLS[1], b"", 200, {"Content-Type": "application/octet-stream", "X-Drop": "1"}, b"\xff\x00")
+    a.add("POST", URLS[0], b'{"q":1}', 200, {"Content-Type": "application/json"}, b"{}")
+    a.save()
+    first = path.read_bytes()
+    b = FixtureArchive(path)
+    assert b.lookup("GET", URLS[1]) == (200, {"Content-Type": "application/octet-stream"}, b"\xff\x00")
+    assert b.lookup("POST", URLS[0], b'{"q":1}')[2] == b"{}"
+    assert b.lookup("POST", URLS[0], b'{"q":2}') is None
+    b.save()
+    assert path.read_bytes() == first
@@ -0,0 +1,109 @@
+"""
+GlottologFetcher against the local mock server: the concurrency cap,
+429 + Retry-After retries, and request/retry/cache accounting.
+"""
+import asyncio
+import json
+
+import pytest
+
+from extractor import orchestrator
+from extractor.glottolog import GlottologFetcher, configure_limiter
+from extractor.http_cache import HttpCache
+from extractor.mock_server import MockServer
+from extractor.orchestrator import HttpSession
+from extractor.ratelimit import LIMITER
+
+CODES = [f"lang{i:04d}" for i in range(24)]
+
+
+def handler(method, url, body):
+    code = url.rsplit("/", 1)[-1].split(".")[0]
+    return 200, {"Content-Type": "application/json"}, json.dumps({"id": code}).encode()
+
+
+class PeakServer(MockServer):
+    """Records the most requests it was answering at once"""
+
+    def __init__(self, **kw):
+        super().__init__(handler=handler, seed=1, **kw)
+        self.inflight = self.peak = 0
+
+    async def respond(self, method, url, body):
+        self.inflight += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            return await super().respond(method, url, body)
+        finally:
+            self.inflight -= 1
+
+
+@pytest.fixture(autouse=True)
+def no_http_cache(monkeypatch):
+    monkeypatch.setattr(orchestrator, "HTTP_CACHE", None)
+    LIMITER.reset()
+    yield
+    LIMITER.reset()
+
+
+async def fetch_codes(server, *, concurrency=8, throttle=True):
+    async with HttpSession(max_connections=16, endpoint=server.url) as session:
+        async with GlottologFetcher(concurrency=concurrency, throttle=throttle, client=session.client) as gf:
+            out = await gf.fetch_all(CODES)
+    return out, gf
+
+
+def test_concurrency_is_capped():
+    async def go():
+        async with PeakServer(latency=0.02) as server:
+            out, gf = await fetch_codes(server, concurrency=3, throttle=False)
+            return out, gf, server
+    out, gf, server = asyncio.run(go())
+    assert out == {c: {"id": c} for c in CODES}
+    assert server.peak == 3
+    assert gf.report()["requests"] == server.stats()["requests"] == len(CODES)
+
+
+def test_retry_after_retries_are_counted_apart_from_codes(monkeypatch):
+    monkeypatch.setattr(LIMITER, "defaults", dict(LIMITER.defaults))
+    configure_limiter(rate=1000.0)
+    seen = set()
+
+    def busy_once(method, url, body):
+        # every third code is turned away once with Retry-After
+        if url not in seen and CODES.index(url.rsplit("/", 1)[-1][:-5]) % 3 == 0:
+            seen.add(url)
+            return 429, {"Retry-After": "0.05"}, b"slow down"
+        return handler(method, url, body)
+
+    async def go():
+        async with PeakServer() as server:
+            server.handler = busy_once
+            t0 = asyncio.get_running_loop().time()
+            out, gf = await fetch_codes(server)
+            return out, gf, server.stats(), asyncio.get_running_loop().time() - t0
+    out, gf, served, elapsed = asyncio.run(go())
+    r = gf.report()
+    throttled = served["statuses"][429]
+    assert throttled == len(CODES) // 3 and not gf.errors
+    assert elapsed >= 0.05  # the retries waited out Retry-After
+    assert out == {c: {"id": c} for c in CODES}
+    assert r["requests"] == served["requests"] == len(CODES) + throttled
+    assert r["retries"] == throttled
+    assert (r["codes"], r["cached"]) == (len(CODES), 0)
+    assert LIMITER.stats()["glottolog.org"]["throttled"] == throttled
+
+
+def test_second_pass_is_served_from_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(orchestrator, "HTTP_CACHE", HttpCache(tmp_path / "http.sqlite"))
+
+    async def go():
+        async with PeakServer() as server:
+            first = await fetch_codes(server, throttle=False)
+            second = await fetch_codes(server, throttle=False)
+            return first, second, server.stats()
+    (out1, gf1), (out2, gf2), served = asyncio.run(go())
+    assert out1 == out2
+    assert served["requests"] == len(CODES)
+    assert (gf1.report()["requests"], gf1.report()["cached"]) == (len(CODES), 0)
+    assert (gf2.report()["requests"], gf2.report()["cached"]) == (0, len(CODES))
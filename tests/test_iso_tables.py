@@ -0,0 +1,76 @@
+"""
+ISO 639-3 table loading and its parse cache: reused while both .tab files
+are unchanged, rebuilt when either changes, when it is damaged, or when
+CACHE_VERSION moves.
+"""
+import pytest
+
+from extractor import iso_cldr
+from extractor.iso_cldr import CACHE_FILE, CORE_FILE, NAMES_FILE, load_iso_tables
+
+CORE = ("Id\tPart2b\tPart2t\tPart1\tScope\tLanguage_Type\tRef_Name\tComment\n"
+        "hin\thin\thin\thi\tI\tL\tHindi\t\n"
+        "swa\tswa\tswa\tsw\tM\tL\tSwahili (macrolanguage)\t\n")
+NAMES = ("Id\tPrint_Name\tInverted_Name\n"
+         "hin\tHindi\tHindi\n"
+         "swa\tSwahili\tSwahili\n"
+         "swa\tKiswahili\tKiswahili\n")
+
+
+@pytest.fixture
+def iso_dir(tmp_path):
+    (tmp_path / CORE_FILE).write_text(CORE, encoding="utf-8")
+    (tmp_path / NAMES_FILE).write_text(NAMES, encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts real parses of the .tab files"""
+    calls = []
+    parse = iso_cldr._parse
+    monkeypatch.setattr(iso_cldr, "_parse", lambda *a: calls.append(1) or parse(*a))
+    return calls
+
+
+def test_tables(iso_dir):
+    t = load_iso_tables(iso_dir, use_cache=False)
+    assert len(t) == 2 and "hin" in t and "xxx" not in t
+    assert t.ref_name("swa") == "Swahili (macrolanguage)"
+    assert (t.scope("swa"), t.language_type("hin"), t.get("hin", "Part1")) == ("M", "L", "hi")
+    assert t.row("hin")["Comment"] is None
+    assert t.alt_names("swa") == ("Swahili", "Kiswahili") and t.alt_names("xxx") == ()
+    assert not (iso_dir / CACHE_FILE).exists()
+
+
+def test_cache_is_reused_until_a_source_changes(iso_dir, parses):
+    first = load_iso_tables(iso_dir)
+    again = load_iso_tables(iso_dir)
+    assert len(parses) == 1 and (iso_dir / CACHE_FILE).exists()
+    assert (again.core, again.names) == (first.core, first.names)
+
+    (iso_dir / NAMES_FILE).write_text(NAMES + "hin\tHindustani\tHindustani\n", encoding="utf-8")
+    assert load_iso_tables(iso_dir).alt_names("hin") == ("Hindi", "Hindustani")
+    (iso_dir / CORE_FILE).write_text(CORE.replace("Hindi\t\n", "Hindi\tchanged\n"), encoding="utf-8")
+    assert load_iso_tables(iso_dir).get("hin", "Comment") == "changed"
+    assert len(parses) == 3
+    load_iso_tables(iso_dir)
+    assert len(parses) == 3
+
+
+def test_damaged_cache_is_rebuilt(iso_dir, parses):
+    load_iso_tables(iso_dir)
+    cache = iso_dir / CACHE_FILE
+    cache.write_bytes(cache.read_bytes()[:40])  # digest intact, payload cut short
+    assert load_iso_tables(iso_dir).ref_name("hin") == "Hindi"
+    assert len(parses) == 2
+    load_iso_tables(iso_dir)
+    assert len(parses) == 2  # rewritten whole
+
+
+def test_cache_version_bump_invalidates(iso_dir, parses, monkeypatch):
+    load_iso_tables(iso_dir)
+    monkeypatch.setattr(iso_cldr, "CACHE_VERSION", iso_cldr.CACHE_VERSION + 1)
+    load_iso_tables(iso_dir)
+    load_iso_tables(iso_dir)
+    assert len(parses) == 2
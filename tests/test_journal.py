@@ -0,0 +1,77 @@
+"""
+Crash recovery of the build's append-only files: a torn tail left by an
+interrupted write is cut off on open, and appends continue on a clean line.
+"""
+import json
+
+from extractor.journal import BuildJournal
+from extractor.staging import StagingArea
+
+
+def test_journal_drops_torn_tail_and_keeps_appending(tmp_path):
+    path = tmp_path / "languages.journal.jsonl"
+    j = BuildJournal(path)
+    j.append({"aaa_Latn": {"n": 1}}, batch=1)
+    j.append({"bbb_Latn": {"n": 2}}, batch=2)
+    whole = path.stat().st_size
+    torn = b'{"batch":3,"ts":0,"records":{"ccc_La'  # killed mid-append
+    with open(path, "ab") as f:
+        f.write(torn)
+
+    j = BuildJournal(path)
+    assert (j.batches, j.torn_bytes) == (2, len(torn))
+    assert path.stat().st_size == whole
+    j.append({"aaa_Latn": {"n": 3}}, batch=3)
+    assert BuildJournal(path).records() == {"aaa_Latn": {"n": 3}, "bbb_Latn": {"n": 2}}
+
+
+def test_journal_drops_garbage_terminated_line(tmp_path):
+    path = tmp_path / "languages.journal.jsonl"
+    BuildJournal(path).append({"aaa_Latn": {}}, batch=1)
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x00\n")  # newline made it to disk, the data did not
+    j = BuildJournal(path)
+    assert (j.batches, j.torn_bytes) == (1, 4)
+    assert j.records() == {"aaa_Latn": {}}
+
+
+def test_journal_compact_folds_into_output_and_empties(tmp_path):
+    out = tmp_path / "languages.json"
+    out.write_text(json.dumps({"aaa_Latn": {"n": 0}, "zzz_Latn": {"n": 0}}))
+    j = BuildJournal(tmp_path / "languages.journal.jsonl")
+    j.append({"aaa_Latn": {"n": 1}}, batch=1)
+    merged = j.compact(out, finalize=lambda recs: recs.pop("zzz_Latn"))
+    assert merged == json.loads(out.read_text()) == {"aaa_Latn": {"n": 1}}
+    assert j.batches == 0 and j.records() == {}
+
+
+def test_staging_drops_torn_tail_and_keeps_committing(tmp_path):
+    path = tmp_path / "languages.staging.jsonl"
+    s = StagingArea(path)
+    s.commit("core", {"aaa": {"glottocode": "aaaa1234"}})
+    s.commit("glotto", {"aaaa1234": {"id": "aaaa1234"}})
+    whole = path.stat().st_size
+    torn = b'{"stage":"geo","values":{"aaa":'
+    with open(path, "ab") as f:
+        f.write(torn)
+
+    s = StagingArea(path)
+    assert s.torn_bytes == len(torn)
+    assert path.stat().st_size == whole
+    assert s.complete("aaa", need_geo=False) and not s.complete("aaa")
+    s.commit("geo", {"aaa": {"regions": []}})
+    s = StagingArea(path)
+    assert (s.torn_bytes, len(s)) == (0, 3)
+    assert s.complete("aaa")
+    s.clear()
+    assert not path.exists() and len(s) == 0
+
+
+def test_journal_compact_folded_writes_base_as_is(tmp_path):
+    out = tmp_path / "languages.json"
+    j = BuildJournal(tmp_path / "languages.journal.jsonl")
+    j.append({"aaa_Latn": {"related_languages": ["stale"]}}, batch=1)
+    current = {"aaa_Latn": {"related_languages": ["bbb_Latn"]}, "bbb_Latn": {"related_languages": []}}
+    assert j.compact(out, base=current, folded=True) == current
+    assert json.loads(out.read_text()) == current
+    assert j.records() == {}
@@ -0,0 +1,59 @@
+"""
+run_pipeline with stubbed stages: bisection of a failing batch, and a crash
+inside the failure path failing the run instead of hanging it.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import scripts.build_incremental as build
+from extractor.staging import StagingArea
+
+ARGS = SimpleNamespace(concurrency=2, max_batch_seconds=5.0, skip_geo=True,
+                       glottolog_concurrency=1, glottolog_rate=1.0)
+BAD = "ccc_Latn"
+
+
+async def fake_core(codes, batch_num, client=None, staging=None):
+    await asyncio.sleep(0)
+    if BAD in codes:
+        raise RuntimeError("boom")
+    iso3s = build.batch_iso3s(codes)
+    return iso3s, {iso: {} for iso in iso3s}
+
+
+async def fake_enrich(codes, iso3s, wd, iso_tables, batch_num, *rest):
+    await asyncio.sleep(0)
+    return {c: {"code": c} for c in codes}
+
+
+def run(batches, staging=None):
+    async def collect():
+        return [item async for item in build.run_pipeline(
+            batches, None, ARGS, None, build.Path("/nonexistent/skip.now"), staging=staging)]
+    return asyncio.run(asyncio.wait_for(collect(), timeout=10))
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    monkeypatch.setattr(build, "fetch_core_stage", fake_core)
+    monkeypatch.setattr(build, "enrich_stage", fake_enrich)
+
+
+def test_failing_code_is_bisected_out(stages):
+    items = run([(1, ["aaa_Latn", "bbb_Latn", BAD, "ddd_Latn"]), (2, ["eee_Latn"])])
+    merged = {c for status, _, codes, _, _ in items if status == "ok" for c in codes}
+    assert merged == {"aaa_Latn", "bbb_Latn", "ddd_Latn", "eee_Latn"}
+    assert [(s, codes) for s, _, codes, _, _ in items if s == "error"] == [("error", [BAD])]
+
+
+def test_salvage_failure_fails_the_run(stages, monkeypatch):
+    def broken_merge(*a, **kw):
+        raise ValueError("salvage exploded")
+
+    monkeypatch.setattr(build, "merge_batch", broken_merge)
+    staging = StagingArea()
+    staging.commit("core", {"aaa": {}})  # complete, so the failed batch salvages it
+    with pytest.raises(ValueError, match="salvage exploded"):
+        run([(1, ["aaa_Latn", BAD]), (2, ["eee_Latn"])], staging=staging)
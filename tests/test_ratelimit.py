@@ -0,0 +1,136 @@
+"""
+Rate limiter and pooled session.
+
+The buckets run on a fake clock (sleeping advances it instantly), so the
+pacing assertions are exact and nothing depends on wall-clock time. The
+session tests send every request through orchestrator.fetch on one
+HttpSession rerouted to a MockServer, so the counts below are what a real
+endpoint would see.
+"""
+import asyncio
+import json
+
+import pytest
+
+from extractor.mock_server import MockServer
+from extractor.orchestrator import HttpSession, fetch, set_http_cache
+from extractor.ratelimit import LIMITER, TokenBucket
+
+HOST = "mock.example.org"
+
+
+class FakeClock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += max(1e-6, seconds)  # a real timer never wakes up before it was asked to
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(LIMITER, "clock", fake)
+    monkeypatch.setattr(LIMITER, "sleep", fake.sleep)
+    monkeypatch.setattr(LIMITER, "defaults", dict(LIMITER.defaults))
+    LIMITER.reset()
+    yield fake
+    LIMITER.reset()
+
+
+def bucket(clock, rate, **kw):
+    return TokenBucket(rate, clock=clock, sleep=clock.sleep, **kw)
+
+
+def test_bucket_spends_burst_then_paces_at_rate():
+    clock = FakeClock()
+    b = bucket(clock, 10.0, burst=2)
+
+    async def take(n):
+        await asyncio.gather(*(b.acquire() for _ in range(n)))
+    asyncio.run(take(12))
+    assert clock.now - 100.0 == pytest.approx(1.0)  # 2 free, then 10 at 10/s
+    assert b.stats()["requests"] == 12
+
+
+def test_penalize_halves_once_per_second_and_blocks_for_retry_after():
+    clock = FakeClock()
+    b = bucket(clock, 8.0, burst=8)
+    b.penalize(retry_after=2.5)
+    b.penalize()  # same second: no second halving
+    assert b.rate == 4.0 and b.throttled == 2
+    asyncio.run(b.acquire())
+    assert clock.now == pytest.approx(102.5)
+    clock.now += 1.0
+    b.penalize()
+    assert b.rate == 2.0
+    for _ in range(10):
+        b.penalize()
+        clock.now += 1.0
+    assert b.rate == b.min_rate == 0.4
+
+
+def test_reward_raises_rate_per_second_of_successes_up_to_ceiling():
+    b = bucket(FakeClock(), 10.0, max_rate=12.0)
+    for _ in range(9):
+        b.reward()
+    assert b.rate == 10.0
+    b.reward()
+    assert b.rate == pytest.approx(11.0)
+    for _ in range(100):
+        b.reward()
+    assert b.rate == 12.0
+
+
+def handler(method, url, body):
+    return 200, {"Content-Type": "application/json"}, json.dumps({"url": url}).encode()
+
+
+async def fetch_all(n, *, rate, burst, max_rate=None, max_connections=4, retries=3, **faults):
+    """Fetch n distinct URLs concurrently; returns (results, server stats, session stats, limiter stats)"""
+    set_http_cache(None)
+    LIMITER.configure(HOST, rate, burst=burst, max_rate=max_rate or rate * 4)
+    async with MockServer(handler=handler, seed=1, **faults) as server:
+        session = await HttpSession(max_connections=max_connections, endpoint=server.url).open()
+        try:
+            results = await asyncio.gather(*(
+                fetch(session.client, f"https://{HOST}/item/{i}.json", cache=False, retries=retries)
+                for i in range(n)
+            ))
+        finally:
+            await session.aclose()
+        return results, server.stats(), session.stats(), LIMITER.stats()[HOST]
+
+
+def test_pooled_session_reuses_connections(clock):
+    results, served, session, limiter = asyncio.run(fetch_all(40, rate=500, burst=500))
+    assert [r["url"] for r in results] == [f"https://{HOST}/item/{i}.json" for i in range(40)]
+    assert served["requests"] == session["requests"] == limiter["requests"] == 40
+    assert served["connections"] == session["connections"] <= 4
+    assert session["reuse_ratio"] >= 0.9
+
+
+def test_retry_after_is_honored_and_every_request_completes(clock):
+    results, served, session, limiter = asyncio.run(
+        fetch_all(30, rate=200, burst=200, retries=20, p429=0.3, retry_after=0.05))
+    assert len(results) == 30
+    throttled = served["injected"]["429"]
+    assert throttled > 0
+    assert limiter["throttled"] == throttled
+    assert served["requests"] == session["requests"] == 30 + throttled
+    assert served["statuses"][200] == 30
+    assert clock.now - 100.0 >= 0.05  # at least one Retry-After wait
+    assert limiter["rate"] < 200  # backed off
+
+
+def test_rate_adapts_upward_on_sustained_success(clock):
+    n, rate = 120, 30.0
+    _, served, _, limiter = asyncio.run(fetch_all(n, rate=rate, burst=1, max_rate=300))
+    assert served["requests"] == n
+    assert limiter["rate"] > rate * 1.2
+    # a fixed bucket at the starting rate needs (n - burst) / rate seconds
+    assert clock.now - 100.0 < (n - 1) / rate
@@ -0,0 +1,46 @@
+"""Language.raw reads single records from languages.json on demand"""
+import json
+
+import pytest
+
+from finder.core import LanguageFinder, _json_record_offsets
+
+RECORDS = {
+    "hin_Deva": {"iso_639_3": "hin", "english_name": {"value": "Hindi", "source": "iso"},
+                 "autonym": {"value": "हिन्दी"}, "primary_countries": ["IN"]},
+    "bho_Deva": {"iso_639_3": "bho", "english_name": {"value": "Bhojpuri"}, "note": "a \"quoted\" }, value"},
+    "yor_Latn": {"iso_639_3": "yor", "english_name": {"value": "Yorùbá"}, "regions": []},
+}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_offsets_cover_exactly_each_record(indent):
+    blob = json.dumps(RECORDS, ensure_ascii=False, indent=indent).encode("utf-8")
+    offsets = _json_record_offsets(blob)
+    assert list(offsets) == list(RECORDS)
+    for code, (start, end) in offsets.items():
+        assert json.loads(blob[start:end]) == RECORDS[code]
+
+
+def test_raw_reads_one_record_and_follows_file_changes(tmp_path):
+    path = tmp_path / "languages.json"
+    path.write_text(json.dumps(RECORDS, ensure_ascii=False, indent=2), encoding="utf-8")
+    finder = LanguageFinder(data_path=path, fast_start=False)
+    assert finder.get("yor_Latn").raw == RECORDS["yor_Latn"]
+    assert finder.get("hin_Deva").raw == RECORDS["hin_Deva"]
+    # only byte spans are kept, not parsed records
+    assert all(isinstance(span, tuple) for span in finder._raw_offsets.values())
+
+    changed = dict(RECORDS, hin_Deva={**RECORDS["hin_Deva"], "speaker_count": 1})
+    path.write_text(json.dumps(changed, ensure_ascii=False), encoding="utf-8")
+    assert finder.get("hin_Deva").raw["speaker_count"] == 1
+
+
+def test_raw_without_a_data_file_says_so(tmp_path):
+    path = tmp_path / "languages.json"
+    path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    snap = LanguageFinder(data_path=path, fast_start=False).compile_snapshot(tmp_path / "s.bin")
+    finder = LanguageFinder(snapshot=snap)
+    finder.data_path = None
+    with pytest.raises(FileNotFoundError, match="data_path"):
+        finder.get("hin_Deva").raw
@@ -0,0 +1,64 @@
+"""
+Related languages: the incremental index the build keeps current batch by
+batch ends up exactly where one full pass over the final records does.
+"""
+import copy
+import random
+
+from extractor.related import RelatedIndex, compute_related
+
+FAMILIES = ["Indo-European", "Niger-Congo", "Austronesian", None]
+SCRIPTS = ["Latin", "Devanagari"]
+COUNTRIES = ["IN", "NP", "KE", "TZ", "ID", "PH", "NG"]
+
+
+def value(v):
+    return {"value": v, "source": "test"}
+
+
+def make_records(n, seed):
+    rng = random.Random(seed)
+    return {
+        f"l{i:03d}_{rng.choice('LD')}": {
+            "language_family": value(rng.choice(FAMILIES)),
+            "script_name": value(rng.choice(SCRIPTS)),
+            "speaker_count": value(rng.randrange(0, 10**6)),
+            "primary_countries": rng.sample(COUNTRIES, rng.randrange(0, 3)),
+            "related_languages": ["stale"],
+        }
+        for i in range(n)
+    }
+
+
+def test_ranked_by_speakers_within_family_script_and_country():
+    recs = {
+        "a": {"language_family": value("F"), "script_name": value("S"), "speaker_count": value(10),
+              "primary_countries": ["IN"]},
+        "b": {"language_family": value("F"), "script_name": value("S"), "speaker_count": value(30),
+              "primary_countries": ["IN", "NP"]},
+        "c": {"language_family": value("F"), "script_name": value("S"), "speaker_count": value(20),
+              "primary_countries": ["NP"]},
+        "d": {"language_family": value("F"), "script_name": value("T"), "speaker_count": value(99),
+              "primary_countries": ["IN"]},
+        "e": {"language_family": value(None), "primary_countries": ["IN"]},
+    }
+    assert compute_related(recs) == {"a": ["b"], "b": ["c", "a"], "c": ["b"], "d": [], "e": []}
+
+
+def test_incremental_batches_match_a_full_pass():
+    existing = make_records(150, seed=1)
+    batches = [make_records(40, seed=s) for s in (2, 3, 4)]
+    for b, batch in enumerate(batches):  # new codes, plus a few rewrites of old ones
+        for code in list(batch)[:10]:
+            batch[f"b{b}{code}"] = batch.pop(code)
+
+    index = RelatedIndex(existing)
+    index.apply(existing)
+    for batch in batches:
+        existing.update(batch)
+        index.add(batch)
+        index.apply(existing)
+
+    expected = compute_related(copy.deepcopy(existing))
+    assert {code: rec["related_languages"] for code, rec in existing.items()} == expected
+    assert any(expected.values())
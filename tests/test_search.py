@@ -0,0 +1,39 @@
+"""Name search over the full ISO 639-3 name set"""
+import pytest
+
+from finder.core import LanguageFinder
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Bhojpri", "Bhojpuri"),
+    ("Hindee", "Hindi"),
+    ("Swahli", "Swahili"),
+    ("Yoruva", "Yoruba"),
+    ("Gujrati", "Gujarati"),
+])
+def test_typos_resolve_to_the_intended_language(iso_finder, query, expected):
+    assert iso_finder.find(query, fuzzy=True).english_name == expected
+
+
+@pytest.mark.parametrize("query", ["Bhojpri", "Hindee", "Swahli", "Yoruva", "Gujrati"])
+def test_short_names_inside_a_misspelling_do_not_match(iso_finder, query):
+    # "Ho", "E", "Wa", "U" are all ISO names contained in these queries
+    assert iso_finder.find(query) is None
+
+
+def test_exact_and_substring_matches(iso_finder):
+    assert iso_finder.find("Hindi").iso_639_3 == "hin"
+    assert iso_finder.find("Bhoj").english_name == "Bhojpuri"
+    assert iso_finder.get("hin_Latn").iso_639_3 == "hin"
+
+
+def test_find_is_exact_unless_fuzzy_is_requested(iso_finder):
+    assert iso_finder.find("Bhojpri") is None
+    assert iso_finder.find("Bhojpri", fuzzy=True) is not None
+
+
+def test_typo_and_substring_indices_are_built_on_first_use(iso_languages_path):
+    finder = LanguageFinder(data_path=iso_languages_path, fast_start=False)
+    assert finder._spell is None and finder._ngrams == {}
+    finder.find("Bhojpri", fuzzy=True)
+    assert finder._spell is not None and "by_name" in finder._ngrams
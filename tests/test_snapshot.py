@@ -0,0 +1,78 @@
+"""Binary snapshot: round trip, parity with the in-memory finder, rejection of bad files"""
+import json
+import os
+
+import pytest
+
+from finder.core import LanguageFinder
+from finder.snapshot import Snapshot, SnapshotError
+
+RECORDS = {
+    "hin_Deva": {"iso_639_3": "hin", "script_code": "Deva", "english_name": {"value": "Hindi"},
+                 "autonym": {"value": "हिन्दी"}, "primary_countries": ["IN", "NP"],
+                 "speaker_count": {"value": 341000000}, "resource_level": {"value": "high"},
+                 "regions": ["Uttar Pradesh", "Bihar"], "related_languages": ["bho_Deva"],
+                 "coordinates": {"lat": 25.0, "lon": 77.0}},
+    "bho_Deva": {"iso_639_3": "bho", "script_code": "Deva", "english_name": {"value": "Bhojpuri"},
+                 "primary_countries": ["IN"], "speaker_count": {"value": 52000000},
+                 "regions": ["Bihar"], "related_languages": ["hin_Deva"]},
+    "yor_Latn": {"iso_639_3": "yor", "script_code": "Latn", "english_name": {"value": "Yoruba"},
+                 "autonym": {"value": "Yorùbá"}, "primary_countries": ["NG"]},
+}
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "languages.json"
+    path.write_text(json.dumps(RECORDS, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def snapshot_path(data_path, tmp_path):
+    return LanguageFinder(data_path=data_path, fast_start=False).compile_snapshot(tmp_path / "languages.snap")
+
+
+def test_round_trip_matches_the_in_memory_finder(data_path, snapshot_path):
+    memory = LanguageFinder(data_path=data_path, fast_start=False)
+    mapped = LanguageFinder(snapshot=snapshot_path)
+    Snapshot(snapshot_path, verify=True)
+    assert mapped.index_source == "snapshot"
+    for code in RECORDS:
+        assert mapped.get(code).to_dict() == memory.get(code).to_dict()
+    for kwargs in ({"name": "Bhoj"}, {"country": "IN"}, {"region": "Bihar"}, {"script": "Deva"},
+                   {"min_speakers": 100_000_000}, {"country": "IN", "sort_by": "speakers"}):
+        assert [l.code for l in mapped.search(**kwargs)] == [l.code for l in memory.search(**kwargs)]
+    assert mapped.get("hin_Deva").raw == RECORDS["hin_Deva"]
+
+
+def test_snapshot_of_another_data_version_is_rejected(data_path, snapshot_path):
+    data_path.write_text(json.dumps({**RECORDS, "xyz_Latn": {"iso_639_3": "xyz"}}), encoding="utf-8")
+    with pytest.raises(SnapshotError, match="different version"):
+        LanguageFinder(data_path=data_path, snapshot=snapshot_path)
+
+
+def test_touched_but_unchanged_data_is_accepted(data_path, snapshot_path):
+    st = data_path.stat()
+    os.utime(data_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert LanguageFinder(data_path=data_path, snapshot=snapshot_path).get("yor_Latn") is not None
+
+
+@pytest.mark.parametrize("damage", [
+    lambda b: b[:-16],                 # truncated
+    lambda b: b + bytes(8),            # padded
+    lambda b: b[:40],                  # header only
+    lambda b: b"NOTASNAP" + b[8:],     # wrong magic
+])
+def test_damaged_snapshots_are_rejected_on_open(snapshot_path, damage):
+    snapshot_path.write_bytes(damage(snapshot_path.read_bytes()))
+    with pytest.raises(SnapshotError):
+        LanguageFinder(snapshot=snapshot_path)
+
+
+def test_checksum_catches_flipped_bytes(snapshot_path):
+    blob = bytearray(snapshot_path.read_bytes())
+    blob[-20] ^= 0xFF
+    snapshot_path.write_bytes(bytes(blob))
+    with pytest.raises(SnapshotError, match="checksum"):
+        Snapshot(snapshot_path, verify=True)